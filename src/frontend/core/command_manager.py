@@ -1,13 +1,26 @@
 """
 Command Manager - implements undo/redo pattern for circuit operations
 """
-from typing import List, Dict, Any
-from dataclasses import dataclass
+from typing import List, Dict, Any, ClassVar, Deque, Tuple, Type, Optional, IO
+from collections import deque
+from dataclasses import dataclass, make_dataclass
 from enum import Enum
+import contextlib
+import keyword
+import logging
+import mmap
+import pickle
+import tempfile
 
+logger = logging.getLogger(__name__)
 
-class CommandType(Enum):
-    """Types of commands that can be undone/redone"""
+
+class CommandType(str, Enum):
+    """Types of commands that can be undone/redone
+
+    Members are plain strings, so they compare equal to their value and
+    format directly without going through the ``.value`` descriptor.
+    """
     ADD_COMPONENT = "add_component"
     DELETE_COMPONENT = "delete_component"
     MOVE_COMPONENT = "move_component"
@@ -18,14 +31,28 @@ class CommandType(Enum):
     ROTATE_COMPONENT = "rotate_component"
     GROUP_COMPONENTS = "group_components"
     UNGROUP_COMPONENTS = "ungroup_components"
+    MACRO = "macro"
+    
+    __str__ = str.__str__
 
 
 @dataclass
 class Command:
     """Base command class for undo/redo"""
+    __slots__ = ("cmd_type", "data")
+    
     cmd_type: CommandType
     data: Dict[str, Any]
     
+    @classmethod
+    def create(cls, cmd_type: CommandType, **fields) -> "Command":
+        """Create the specialized command class for cmd_type"""
+        try:
+            command_class = _COMMAND_CLASSES[cmd_type]
+        except KeyError:
+            raise ValueError(f"No command class registered for {cmd_type!r}") from None
+        return command_class(**fields)
+    
     def execute(self):
         """Execute the command"""
         pass
@@ -39,68 +66,336 @@ class Command:
         self.execute()
 
 
+# Payload fields carried by each command type. Payloads hold primitives
+# only: DELETE_COMPONENT keeps the component's to_dict() spec rather than
+# the live object, so history never pins deleted canvas items in memory.
+COMMAND_FIELDS: Dict[CommandType, Tuple[str, ...]] = {
+    CommandType.ADD_COMPONENT: ("component_id", "comp_type", "name", "x", "y"),
+    CommandType.DELETE_COMPONENT: ("component_id", "spec"),
+    CommandType.MOVE_COMPONENT: ("component_id", "old_pos", "new_pos"),
+    CommandType.ADD_WIRE: ("wire_id", "from_node", "to_node"),
+    CommandType.DELETE_WIRE: ("wire_id", "from_node", "to_node"),
+    CommandType.EDIT_PROPERTY: ("component_id", "key", "old_value", "new_value"),
+    CommandType.DUPLICATE_COMPONENT: ("component_id", "source_id"),
+    CommandType.ROTATE_COMPONENT: ("component_id", "degrees"),
+    CommandType.GROUP_COMPONENTS: ("group_id", "component_ids"),
+    CommandType.UNGROUP_COMPONENTS: ("group_id", "component_ids"),
+}
+
+
+def _payload_as_dict(self) -> Dict[str, Any]:
+    """Expose slot fields as the generic data dict"""
+    return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _reduce_command(self):
+    """Pickle specialized commands by their constructor arguments"""
+    return type(self), tuple(getattr(self, name) for name in self.__slots__)
+
+
+def _make_command_class(cmd_type: CommandType,
+                        fields: Optional[Tuple[str, ...]] = None) -> Type[Command]:
+    """Generate a slotted Command dataclass with one attribute per field
+
+    cmd_type becomes a class constant and data a view over the slots, so
+    instances carry only their payload. The base cmd_type/data slots are
+    inherited but left unset. fields defaults to COMMAND_FIELDS[cmd_type].
+    """
+    if fields is None:
+        fields = COMMAND_FIELDS[cmd_type]
+    for name in fields:
+        if not name.isidentifier() or keyword.iskeyword(name):
+            raise ValueError(f"Invalid field name {name!r} for {cmd_type.name} command")
+    class_name = "".join(part.title() for part in cmd_type.name.split("_")) + "Command"
+    return make_dataclass(
+        class_name,
+        [("cmd_type", ClassVar[CommandType]), ("data", ClassVar[Dict[str, Any]])]
+        + [(name, Any) for name in fields],
+        bases=(Command,),
+        namespace={
+            "__slots__": fields,
+            "__module__": __name__,
+            "__doc__": f"{cmd_type} command",
+            "cmd_type": cmd_type,
+            "data": property(_payload_as_dict),
+            "__reduce__": _reduce_command,
+        },
+    )
+
+
+# Bound by name so spilled commands can be unpickled
+AddComponentCommand = _make_command_class(CommandType.ADD_COMPONENT)
+DeleteComponentCommand = _make_command_class(CommandType.DELETE_COMPONENT)
+MoveComponentCommand = _make_command_class(CommandType.MOVE_COMPONENT)
+AddWireCommand = _make_command_class(CommandType.ADD_WIRE)
+DeleteWireCommand = _make_command_class(CommandType.DELETE_WIRE)
+EditPropertyCommand = _make_command_class(CommandType.EDIT_PROPERTY)
+DuplicateComponentCommand = _make_command_class(CommandType.DUPLICATE_COMPONENT)
+RotateComponentCommand = _make_command_class(CommandType.ROTATE_COMPONENT)
+GroupComponentsCommand = _make_command_class(CommandType.GROUP_COMPONENTS)
+UngroupComponentsCommand = _make_command_class(CommandType.UNGROUP_COMPONENTS)
+
+
+class MacroCommand(Command):
+    """Several commands undone and redone as a single history entry"""
+    __slots__ = ("commands",)
+    cmd_type = CommandType.MACRO
+    
+    def __init__(self, commands: List[Command]):
+        self.commands = commands
+    
+    @property
+    def data(self) -> Dict[str, Any]:
+        """Summary payload for the grouped commands"""
+        return {"count": len(self.commands)}
+    
+    def execute(self):
+        """Execute the commands in order"""
+        for command in self.commands:
+            command.execute()
+    
+    def undo(self):
+        """Undo the commands in reverse order"""
+        for command in reversed(self.commands):
+            command.undo()
+    
+    def redo(self):
+        """Redo the commands in order"""
+        for command in self.commands:
+            command.redo()
+
+
+_COMMAND_CLASSES: Dict[CommandType, Type[Command]] = {
+    command_class.cmd_type: command_class
+    for command_class in (
+        AddComponentCommand, DeleteComponentCommand, MoveComponentCommand,
+        AddWireCommand, DeleteWireCommand, EditPropertyCommand,
+        DuplicateComponentCommand, RotateComponentCommand,
+        GroupComponentsCommand, UngroupComponentsCommand, MacroCommand,
+    )
+}
+
+
+@dataclass
+class SpillRef:
+    """Batch of the oldest undo commands pickled to the spill file"""
+    start: int
+    end: int
+    count: int
+    newest_type: str  # cmd_type of the last command, for get_undo_description
+    skip: int = 0  # Leading commands evicted by the undo limit
+
+
 class CommandManager:
-    """Manages undo/redo stack"""
+    """Manages undo/redo stack
+    
+    With spill_to_disk enabled (off by default), the oldest half of the
+    undo history is pickled to a temporary file once the in-memory stack
+    reaches half of max_undo_stack, and paged back in when undo reaches
+    it. Call close() to release the file.
+    """
+    __slots__ = (
+        "undo_stack", "redo_stack", "max_undo_stack", "_is_recording",
+        "execute_command", "spill_to_disk", "_spilled", "_spill_file",
+        "_macro_stack",
+    )
     
-    def __init__(self, max_undo_stack: int = 100):
-        self.undo_stack: List[Command] = []
+    def __init__(self, max_undo_stack: int = 100, spill_to_disk: bool = False):
+        # Bounded deque evicts the oldest entry in O(1) once the limit is hit
+        self.undo_stack: Deque[Command] = deque(maxlen=max_undo_stack)
         self.redo_stack: List[Command] = []
         self.max_undo_stack = max_undo_stack
+        # Commands collected by open begin_macro() calls, innermost last
+        self._macro_stack: List[List[Command]] = []
+        # execute_command is bound per instance and swapped when recording
+        # is toggled, so the hot path never tests the flag
         self.is_recording = True
+        
+        # Spilled batches, oldest first
+        self.spill_to_disk = spill_to_disk and max_undo_stack >= 4
+        self._spilled: List[SpillRef] = []
+        self._spill_file: Optional[IO[bytes]] = None
     
-    def execute_command(self, command: Command) -> bool:
-        """Execute a command and add to undo stack"""
-        if not self.is_recording:
+    @property
+    def is_recording(self) -> bool:
+        """Whether executed commands are recorded"""
+        return self._is_recording
+    
+    @is_recording.setter
+    def is_recording(self, value: bool):
+        self._is_recording = value
+        self._bind_execute()
+    
+    def _bind_execute(self):
+        """Point execute_command at the implementation for the current state"""
+        if not self._is_recording:
+            self.execute_command = self._ignore_command
+        elif self._macro_stack:
+            self.execute_command = self._collect_command
+        else:
+            self.execute_command = self._record_command
+    
+    @contextlib.contextmanager
+    def recording_disabled(self):
+        """Ignore executed commands for the duration of a bulk operation"""
+        previous = self.is_recording
+        self.is_recording = False
+        try:
+            yield self
+        finally:
+            self.is_recording = previous
+    
+    def begin_macro(self):
+        """Start collecting executed commands into one undo entry"""
+        self._macro_stack.append([])
+        self._bind_execute()
+    
+    def end_macro(self) -> bool:
+        """Finish the innermost macro and record it as a single command"""
+        if not self._macro_stack:
+            return False
+        
+        commands = self._macro_stack.pop()
+        self._bind_execute()
+        if not commands:
             return False
         
+        macro = commands[0] if len(commands) == 1 else MacroCommand(commands)
+        if self._macro_stack:
+            # Nested macro becomes one step of its parent
+            self._macro_stack[-1].append(macro)
+        else:
+            self._push_undo(macro)
+            if self.redo_stack:
+                self.redo_stack.clear()
+        return True
+    
+    def _collect_command(self, command: Command) -> bool:
+        """execute_command while a macro is open"""
         try:
             command.execute()
-            self.undo_stack.append(command)
-            
-            # Limit undo stack size
-            if len(self.undo_stack) > self.max_undo_stack:
-                self.undo_stack.pop(0)
+        except Exception:
+            logger.exception("Command execution failed")
+            return False
+        self._macro_stack[-1].append(command)
+        return True
+    
+    def _ignore_command(self, command: Command) -> bool:
+        """execute_command while recording is disabled"""
+        return False
+    
+    def _record_command(self, command: Command) -> bool:
+        """Execute a command and add to undo stack"""
+        try:
+            command.execute()
+            self._push_undo(command)
             
-            # Clear redo stack when new command executed
-            self.redo_stack.clear()
+            # Clear redo stack when new command executed (usually already empty)
+            if self.redo_stack:
+                self.redo_stack.clear()
             return True
-        except Exception as e:
-            print(f"Command execution failed: {e}")
+        except Exception:
+            logger.exception("Command execution failed")
             return False
     
     def undo(self) -> bool:
         """Undo last command"""
-        if not self.undo_stack:
+        if not self._load_spilled():
             return False
         
+        # Peek first so a failed undo leaves the stack untouched
+        command = self.undo_stack[-1]
         try:
-            command = self.undo_stack.pop()
             command.undo()
-            self.redo_stack.append(command)
-            return True
-        except Exception as e:
-            print(f"Undo failed: {e}")
-            self.undo_stack.append(command)  # Restore on error
+        except Exception:
+            logger.exception("Undo failed")
             return False
+        
+        self.undo_stack.pop()
+        self.redo_stack.append(command)
+        return True
     
     def redo(self) -> bool:
         """Redo last undone command"""
         if not self.redo_stack:
             return False
         
+        command = self.redo_stack[-1]
         try:
-            command = self.redo_stack.pop()
             command.redo()
-            self.undo_stack.append(command)
+        except Exception:
+            logger.exception("Redo failed")
+            return False
+        
+        self.redo_stack.pop()
+        self._push_undo(command)
+        return True
+    
+    def _push_undo(self, command: Command):
+        """Append to the undo stack, spilling and evicting old history"""
+        self.undo_stack.append(command)
+        
+        # Keep the total depth (memory + disk) within max_undo_stack
+        if self._spilled and self.undo_depth() > self.max_undo_stack:
+            oldest = self._spilled[0]
+            oldest.skip += 1
+            if oldest.skip >= oldest.count:
+                self._spilled.pop(0)
+        
+        self._spill_if_needed()
+    
+    def _spill_if_needed(self):
+        """Pickle the oldest half of the in-memory undo stack to disk"""
+        if not self.spill_to_disk or len(self.undo_stack) <= self.max_undo_stack // 2:
+            return
+        
+        count = len(self.undo_stack) // 2
+        batch = [self.undo_stack[i] for i in range(count)]
+        try:
+            payload = pickle.dumps(batch, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Commands holding live objects stay in memory; stop retrying
+            # so every later push doesn't pay for another failed pickle
+            logger.debug("Undo history not picklable, keeping it in memory", exc_info=True)
+            self.spill_to_disk = False
+            return
+        
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile(suffix=".undo")
+        fh = self._spill_file
+        start = fh.seek(0, 2)
+        fh.write(payload)
+        self._spilled.append(SpillRef(start, start + len(payload), count, str(batch[-1].cmd_type)))
+        for _ in range(count):
+            self.undo_stack.popleft()
+    
+    def _load_spilled(self) -> bool:
+        """Page the newest spilled batch back in when memory runs dry"""
+        if self.undo_stack:
             return True
-        except Exception as e:
-            print(f"Redo failed: {e}")
-            self.redo_stack.append(command)  # Restore on error
+        if not self._spilled:
             return False
+        
+        ref = self._spilled.pop()
+        fh = self._spill_file
+        fh.flush()
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            batch = pickle.loads(mm[ref.start:ref.end])
+        self.undo_stack.extend(batch[ref.skip:])
+        
+        if not self._spilled:
+            # Nothing left on disk, reclaim the space
+            fh.seek(0)
+            fh.truncate()
+        return bool(self.undo_stack)
+    
+    def undo_depth(self) -> int:
+        """Number of undoable commands, including spilled ones"""
+        return len(self.undo_stack) + sum(ref.count - ref.skip for ref in self._spilled)
     
     def can_undo(self) -> bool:
         """Check if undo is available"""
-        return len(self.undo_stack) > 0
+        return len(self.undo_stack) > 0 or bool(self._spilled)
     
     def can_redo(self) -> bool:
         """Check if redo is available"""
@@ -110,15 +405,31 @@ class CommandManager:
         """Clear undo/redo stacks"""
         self.undo_stack.clear()
         self.redo_stack.clear()
+        self.close()
+    
+    def close(self):
+        """Drop spilled history and release the spill file"""
+        self._spilled.clear()
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+    
+    def __del__(self):
+        # __init__ may have failed before the spill slots were set
+        if getattr(self, "_spill_file", None) is not None:
+            self._spill_file.close()
     
     def get_undo_description(self) -> str:
         """Get description of what will be undone"""
         if self.undo_stack:
-            return f"Undo: {self.undo_stack[-1].cmd_type.value}"
+            return f"Undo: {self.undo_stack[-1].cmd_type}"
+        if self._spilled:
+            # Read from the batch index so a query never pages history in
+            return f"Undo: {self._spilled[-1].newest_type}"
         return "Undo"
     
     def get_redo_description(self) -> str:
         """Get description of what will be redone"""
         if self.redo_stack:
-            return f"Redo: {self.redo_stack[-1].cmd_type.value}"
+            return f"Redo: {self.redo_stack[-1].cmd_type}"
         return "Redo"
@@ -0,0 +1,86 @@
+"""
+Numeric kernels for canvas hit testing
+
+Compiled with numba when it is installed; otherwise equivalent NumPy
+implementations are used.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _nearest_node_numpy(xs: np.ndarray, ys: np.ndarray, qx: float, qy: float, tol2: float) -> int:
+    """Index of the closest point with squared distance below tol2, or -1"""
+    if len(xs) == 0:
+        return -1
+    dx = xs - qx
+    dy = ys - qy
+    d2 = dx*dx + dy*dy
+    i = int(d2.argmin())
+    return i if d2[i] < tol2 else -1
+
+
+def _points_in_rect_numpy(xs: np.ndarray, ys: np.ndarray,
+                          x0: float, y0: float, x1: float, y1: float,
+                          out: np.ndarray) -> int:
+    """Write indices of points inside [x0, x1] x [y0, y1] into out, return count"""
+    hits = np.flatnonzero((xs >= x0) & (xs <= x1) & (ys >= y0) & (ys <= y1))
+    out[:len(hits)] = hits
+    return len(hits)
+
+
+def _boxes_in_rect_numpy(lefts: np.ndarray, tops: np.ndarray, rights: np.ndarray, bottoms: np.ndarray,
+                         x0: float, y0: float, x1: float, y1: float,
+                         out: np.ndarray) -> int:
+    """Write indices of boxes overlapping [x0, x1] x [y0, y1] into out, return count"""
+    hits = np.flatnonzero((rights >= x0) & (lefts <= x1) & (bottoms >= y0) & (tops <= y1))
+    out[:len(hits)] = hits
+    return len(hits)
+
+
+def _nearest_node_loop(xs, ys, qx, qy, tol2):
+    best = -1
+    best_d2 = tol2
+    for i in range(xs.shape[0]):
+        dx = xs[i] - qx
+        if dx*dx >= best_d2:
+            continue
+        dy = ys[i] - qy
+        d2 = dx*dx + dy*dy
+        if d2 < best_d2:
+            best = i
+            best_d2 = d2
+    return best
+
+
+def _points_in_rect_loop(xs, ys, x0, y0, x1, y1, out):
+    count = 0
+    for i in range(xs.shape[0]):
+        if x0 <= xs[i] <= x1 and y0 <= ys[i] <= y1:
+            out[count] = i
+            count += 1
+    return count
+
+
+def _boxes_in_rect_loop(lefts, tops, rights, bottoms, x0, y0, x1, y1, out):
+    count = 0
+    for i in range(lefts.shape[0]):
+        if rights[i] >= x0 and lefts[i] <= x1 and bottoms[i] >= y0 and tops[i] <= y1:
+            out[count] = i
+            count += 1
+    return count
+
+
+# No fastmath: freed slots are stored as +inf and must compare as such
+if HAS_NUMBA:
+    nearest_node = njit(cache=True)(_nearest_node_loop)
+    points_in_rect = njit(cache=True)(_points_in_rect_loop)
+    boxes_in_rect = njit(cache=True)(_boxes_in_rect_loop)
+else:
+    nearest_node = _nearest_node_numpy
+    points_in_rect = _points_in_rect_numpy
+    boxes_in_rect = _boxes_in_rect_numpy
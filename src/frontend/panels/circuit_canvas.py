@@ -1,17 +1,48 @@
 """
 Circuit canvas - main drawing area for circuits
 """
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+from collections import deque
 from dataclasses import dataclass, field
 from enum import Enum
-import copy
+from functools import lru_cache
+from pathlib import Path
+import json
 
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QMenu
-from PySide6.QtCore import Qt, QPoint, QSize, QRect, Signal, QPointF
-from PySide6.QtGui import QPainter, QPen, QColor, QBrush, QFont, QPolygon, QAction
+from PySide6.QtCore import Qt, QPoint, QSize, QRect, Signal, QPointF, QTimer, QLine
+from PySide6.QtGui import (QPainter, QPen, QColor, QBrush, QFont, QPolygon, QAction, QPixmap, QPainterPath,
+                           QTransform, QStaticText)
 import math
+import time
+import numpy as np
 
 from frontend.ui.properties_dialog import PropertiesDialog
+from frontend.panels import _canvas_kernels as kernels
+
+
+_LIBRARY_DIR = Path(__file__).parent.parent.parent / "data" / "libraries"
+
+
+@lru_cache(maxsize=None)
+def _load_library_index(lib_file: str) -> Dict[Tuple[str, str], Tuple[int, str]]:
+    """Parse a library file once and index its components by lowercased name and id
+    
+    Each key maps to (position in the file, properties as JSON text) of the
+    first component with that name/id, so callers can still prefer the
+    earliest match and decode a private copy of the properties.
+    """
+    index: Dict[Tuple[str, str], Tuple[int, str]] = {}
+    try:
+        with open(_LIBRARY_DIR / lib_file, 'r') as f:
+            lib_data = json.load(f)
+        for pos, comp in enumerate(lib_data.get("components", [])):
+            entry = (pos, json.dumps(comp.get("properties", {})))
+            index.setdefault(("name", comp.get("name", "").lower()), entry)
+            index.setdefault(("id", comp.get("id", "").lower()), entry)
+    except:
+        pass
+    return index
 
 
 class CanvasMode(Enum):
@@ -35,9 +66,15 @@ class Node:
         if self.connections is None:
             self.connections = []
     
+    def distance_sq_to(self, x: float, y: float) -> float:
+        """Squared distance to point; compare against tolerance squared"""
+        dx = self.x - x
+        dy = self.y - y
+        return dx*dx + dy*dy
+    
     def distance_to(self, x: float, y: float) -> float:
         """Calculate distance to point"""
-        return math.sqrt((self.x - x) ** 2 + (self.y - y) ** 2)
+        return math.sqrt(self.distance_sq_to(x, y))
 
 
 @dataclass
@@ -48,6 +85,264 @@ class Wire:
     wire_id: str
 
 
+# Port layouts as offsets from the component center, given (width, height)
+
+def _single_port_offsets(w: float, h: float) -> List[Tuple[float, float]]:
+    """Ground, oscilloscope, test equipment: single bottom port"""
+    return [(0.0, h/2)]
+
+
+def _transistor_port_offsets(w: float, h: float) -> List[Tuple[float, float]]:
+    """BJT/MOSFET/JFET/IGBT/TRIAC/SCR/thyristor"""
+    return [
+        (0.0, -h/2 + 10),         # Gate/Base/Control (top)
+        (w/2 - 5, 0.0),           # Drain/Collector (right)
+        (0.0, h/2 - 10),          # Source/Emitter (bottom)
+    ]
+
+
+def _opamp_port_offsets(w: float, h: float) -> List[Tuple[float, float]]:
+    """Op-amps and comparators"""
+    return [
+        (-w/2 + 5, -8.0),         # Non-inverting input (left, upper)
+        (-w/2 + 5, 8.0),          # Inverting input (left, lower)
+        (w/2 - 5, 0.0),           # Output (right)
+    ]
+
+
+def _two_port_offsets(w: float, h: float) -> List[Tuple[float, float]]:
+    """Everything else: left and right"""
+    return [(-w/2, 0.0), (w/2, 0.0)]
+
+
+@lru_cache(maxsize=None)
+def _port_layout(comp_type: str, name: str) -> Callable[[float, float], List[Tuple[float, float]]]:
+    """Resolve the port layout for a component type/name once"""
+    comp_type_lower = comp_type.lower()
+    comp_name_lower = name.lower()
+    
+    # 1-port components: Ground, Oscilloscope, Test Equipment
+    if ("ground" in comp_type_lower or "ground" in comp_name_lower or
+        "oscilloscope" in comp_name_lower or "scope" in comp_name_lower or
+        "multimeter" in comp_name_lower or "ammeter" in comp_name_lower or 
+        "voltmeter" in comp_name_lower or "wattmeter" in comp_name_lower or
+        "ohmmeter" in comp_name_lower or "function generator" in comp_name_lower):
+        return _single_port_offsets
+    
+    # 3-port components: Transistors (BJT), MOSFETs, JFETs, IGBTs, TRIACs, SCRs, Thyristors
+    if any(x in comp_name_lower for x in ["bjt", "mosfet", "jfet", "igbt", "triac", "scr", "thyristor", "transistor"]):
+        return _transistor_port_offsets
+    
+    # 3-port components: Op-Amps, Comparators
+    if any(x in comp_name_lower for x in ["op-amp", "opamp", "comparator"]):
+        return _opamp_port_offsets
+    
+    # 2-port components: Everything else by default
+    return _two_port_offsets
+
+
+# Symbol drawers as (name substrings, CircuitCanvas method, call style), in
+# match order: the first rule with a substring in the lowercased name wins,
+# so specific names come before the shorter patterns they contain.
+# Call styles: "scaled" (selected, scale), "plain" (selected),
+# "named" (selected, name) and "name_first" (name, selected)
+_SYMBOL_RULES = (
+    (("variable resistor",), "_draw_variable_resistor", "plain"),
+    (("resistor", "thermistor"), "_draw_resistor", "scaled"),
+    (("capacitor",), "_draw_capacitor", "scaled"),
+    (("inductor",), "_draw_inductor", "scaled"),
+    (("photo diode",), "_draw_photo_sensor", "plain"),
+    (("diode", "zener", "schottky"), "_draw_diode", "scaled"),
+    (("battery",), "_draw_battery", "scaled"),
+    (("contactor",), "_draw_contactor", "plain"),
+    (("triac",), "_draw_triac", "plain"),
+    (("varactor",), "_draw_varistor", "plain"),
+    (("motor", "stepper"), "_draw_motor", "scaled"),
+    (("ac",), "_draw_ac_source", "scaled"),
+    (("voltage divider",), "_draw_voltage_divider", "plain"),
+    (("dc source", "voltage"), "_draw_dc_source", "scaled"),
+    (("current source",), "_draw_current_source", "scaled"),
+    (("ground",), "_draw_ground", "scaled"),
+    (("switch",), "_draw_switch", "scaled"),
+    (("relay",), "_draw_relay", "scaled"),
+    (("transformer",), "_draw_transformer", "scaled"),
+    (("function generator", "fgen"), "_draw_function_generator", "plain"),
+    (("generator",), "_draw_generator", "scaled"),
+    (("ammeter",), "_draw_ammeter", "scaled"),
+    (("voltmeter",), "_draw_voltmeter", "plain"),
+    (("wattmeter",), "_draw_wattmeter", "plain"),
+    (("ohmmeter",), "_draw_ohmmeter", "plain"),
+    (("scope",), "_draw_oscilloscope", "plain"),
+    (("multimeter", "dmm"), "_draw_multimeter", "plain"),
+    (("spectrum analyzer",), "_draw_spectrum_analyzer", "plain"),
+    (("logic analyzer",), "_draw_logic_analyzer", "plain"),
+    (("lcr",), "_draw_lcr_meter", "plain"),
+    (("thyristor",), "_draw_thyristor", "plain"),
+    (("bjt",), "_draw_bjt", "plain"),
+    (("mosfet",), "_draw_mosfet", "plain"),
+    (("led",), "_draw_led", "plain"),
+    (("op-amp", "opamp"), "_draw_opamp", "plain"),
+    (("demultiplexer", "demux"), "_draw_demultiplexer", "plain"),
+    (("multiplexer", "mux"), "_draw_multiplexer", "plain"),
+    (("potentiometer",), "_draw_potentiometer", "plain"),
+    (("fuse",), "_draw_fuse", "plain"),
+    (("circuit breaker",), "_draw_circuit_breaker", "plain"),
+    (("rectifier",), "_draw_rectifier", "plain"),
+    (("filter",), "_draw_filter", "plain"),
+    (("connector", "plug", "socket", "wire"), "_draw_connector", "name_first"),
+    (("push button",), "_draw_push_button", "plain"),
+    (("sensor",), "_draw_photo_sensor", "plain"),
+    (("terminal", "bus bar"), "_draw_terminal_block", "plain"),
+    (("logic",), "_draw_logic_gate", "named"),
+    (("electromagnet",), "_draw_solenoid", "plain"),
+    (("ic", "timer", "741", "processor", "ram", "rom", "dsp", "fpga"), "_draw_ic_dip", "named"),
+    (("gate",), "_draw_logic_gate", "named"),
+    (("antenna",), "_draw_antenna", "plain"),
+    (("crystal", "oscillator"), "_draw_crystal", "plain"),
+    (("display", "7-segment", "lcd"), "_draw_display", "named"),
+    (("solenoid",), "_draw_solenoid", "plain"),
+    (("buzzer", "speaker"), "_draw_speaker", "plain"),
+    (("varistor",), "_draw_varistor", "plain"),
+    (("jfet",), "_draw_jfet", "plain"),
+    (("igbt",), "_draw_igbt", "plain"),
+    (("comparator",), "_draw_comparator", "plain"),
+)
+
+
+def _check_symbol_rules(rules):
+    """Reject rules that can never match because an earlier pattern they contain always wins"""
+    seen = []
+    for substrings, method, style in rules:
+        for sub in substrings:
+            for earlier, target in seen:
+                if earlier in sub and target != (method, style):
+                    raise ValueError(f"symbol rule {sub!r} is shadowed by earlier rule {earlier!r}")
+        seen.extend((sub, (method, style)) for sub in substrings)
+
+
+_check_symbol_rules(_SYMBOL_RULES)
+
+
+@lru_cache(maxsize=None)
+def _symbol_drawer(name: str) -> Tuple[str, str]:
+    """Resolve the symbol drawer and its call style for a component name once"""
+    comp_name_lower = name.lower()
+    for substrings, method, style in _SYMBOL_RULES:
+        if any(sub in comp_name_lower for sub in substrings):
+            return method, style
+    return "_draw_generic_component", "name_first"
+
+
+def _polyline_path(points) -> QPainterPath:
+    """Open path through points, for symbols stroked with a single drawPath"""
+    path = QPainterPath()
+    path.moveTo(*points[0])
+    for point in points[1:]:
+        path.lineTo(*point)
+    return path
+
+
+@lru_cache(maxsize=None)
+def _pen(color: str, width: float = 1) -> QPen:
+    """Shared symbol pen; QPainter.setPen copies it, so it is never mutated"""
+    return QPen(QColor(color), width)
+
+
+@lru_cache(maxsize=None)
+def _brush(color: str) -> QBrush:
+    """Shared solid symbol brush"""
+    return QBrush(QColor(color))
+
+
+@lru_cache(maxsize=None)
+def _font(size: int, bold: bool = False) -> QFont:
+    """Shared symbol label font"""
+    return QFont("Arial", size, QFont.Bold if bold else QFont.Normal)
+
+
+# Resistor zigzag with both leads, centered on the origin
+_ZIGZAG_PATH = _polyline_path([
+    (-30, 0), (-25, 0), (-18, -6), (-12, 6), (-6, -6),
+    (0, 6), (6, -6), (12, 6), (22, 0), (30, 0),
+])
+
+
+def _inductor_path() -> QPainterPath:
+    """Inductor leads and five half-turn coil loops, centered on the origin"""
+    path = _polyline_path([(-30, 0), (-22, 0)])
+    for i in range(5):
+        path.arcMoveTo(-20 + i*8, -6, 8, 12, 0)
+        path.arcTo(-20 + i*8, -6, 8, 12, 0, 180)
+    path.moveTo(22, 0)
+    path.lineTo(30, 0)
+    return path
+
+
+def _transformer_path() -> QPainterPath:
+    """Transformer leads and its two three-turn windings, centered on the origin"""
+    path = _polyline_path([(-30, 0), (-20, 0)])
+    path.moveTo(20, 0)
+    path.lineTo(30, 0)
+    for i in range(3):
+        path.addEllipse(-22, -8 + i*8, 8, 8)
+        path.addEllipse(14, -8 + i*8, 8, 8)
+    return path
+
+
+def _dip_pins_path() -> QPainterPath:
+    """Four pin stubs on each side of a 40x40 DIP body, centered on the origin"""
+    path = QPainterPath()
+    for i in range(4):
+        path.moveTo(-20, -16 + i*8)
+        path.lineTo(-24, -16 + i*8)
+        path.moveTo(20, -16 + i*8)
+        path.lineTo(24, -16 + i*8)
+    return path
+
+
+def _voltage_divider_path() -> QPainterPath:
+    """Divider rails with the zigzag on the top rail, centered on the origin"""
+    path = _polyline_path([
+        (-30, -8), (-15, -8), (-8, -3), (-1, -8), (6, -3), (13, -8), (15, -8), (30, -8),
+    ])
+    path.moveTo(-30, 8)
+    path.lineTo(-15, 8)
+    path.lineTo(-15, -8)
+    path.moveTo(15, 8)
+    path.lineTo(30, 8)
+    return path
+
+
+_INDUCTOR_PATH = _inductor_path()
+_TRANSFORMER_PATH = _transformer_path()
+_DIP_PINS_PATH = _dip_pins_path()
+_VOLTAGE_DIVIDER_PATH = _voltage_divider_path()
+
+
+def _polygon(points: List[Tuple[int, int]]) -> QPolygon:
+    """Integer polygon around the origin, placed with translated(x, y)"""
+    return QPolygon([QPoint(px, py) for px, py in points])
+
+
+# Filled outlines shared by the symbol drawers
+_THYRISTOR_TRIANGLE = _polygon([(-8, -8), (-8, 8), (8, 0)])
+_DIODE_TRIANGLE = _polygon([(-12, -10), (-12, 10), (10, 0)])  # LED, photodiode
+_BUFFER_TRIANGLE = _polygon([(-15, -12), (-15, 12), (15, 0)])  # NOT gate
+_SPEAKER_CONE = _polygon([(-12, -12), (-12, 12), (0, 0)])
+_COMPARATOR_TRIANGLE = _polygon([(-15, -14), (-15, 14), (15, 0)])
+_OPAMP_TRIANGLE = _polygon([(-12, -14), (12, 0), (-12, 14)])
+_MUX_TRAPEZOID = _polygon([(-16, -12), (16, -12), (8, 12), (-8, 12)])
+_DEMUX_TRAPEZOID = _polygon([(-8, -12), (8, -12), (16, 12), (-16, 12)])
+
+
+# Exact rotations for quarter turns (no cos/sin rounding error)
+_QUARTER_TURNS = {
+    90: lambda dx, dy: (-dy, dx),
+    180: lambda dx, dy: (-dx, -dy),
+    270: lambda dx, dy: (dy, -dx),
+}
+
+
 @dataclass
 class CanvasComponent:
     """Component on canvas"""
@@ -68,6 +363,20 @@ class CanvasComponent:
     base_width: float = 60
     base_height: float = 40
     
+    # Port layout resolved from type/name at construction, and the offsets
+    # from the center it produced, keyed by the geometry they depend on
+    _port_layout: Optional[Callable] = field(
+        default=None, init=False, repr=False, compare=False)
+    _port_offsets: Optional[List[Tuple[float, float]]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _port_offsets_key: Optional[Tuple] = field(
+        default=None, init=False, repr=False, compare=False)
+    # Symbol drawer resolved from the name at construction (see _SYMBOL_RULES)
+    _symbol: Optional[Tuple[str, str]] = field(
+        default=None, init=False, repr=False, compare=False)
+    # Lowercased name for substring checks, computed once (names never change)
+    _kind: str = field(default="", init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         if self.params is None:
             self.params = {}
@@ -79,6 +388,33 @@ class CanvasComponent:
             self.base_height = self.height
         # Normalize rotation to 0-360
         self.rotation = self.rotation % 360
+        self._port_layout = _port_layout(self.comp_type, self.name)
+        self._symbol = _symbol_drawer(self.name)
+        self._kind = self.name.lower() if self.name else ""
+    
+    def to_dict(self) -> Dict:
+        """Serialize to primitives (used by undo history instead of live objects)"""
+        return {
+            "x": self.x, "y": self.y,
+            "comp_id": self.comp_id, "comp_type": self.comp_type, "name": self.name,
+            "width": self.width, "height": self.height,
+            "params": dict(self.params), "properties": dict(self.properties),
+            "rotation": self.rotation, "group_id": self.group_id,
+            "base_width": self.base_width, "base_height": self.base_height,
+        }
+    
+    @classmethod
+    def from_dict(cls, spec: Dict) -> "CanvasComponent":
+        """Rebuild a component from to_dict() output"""
+        spec = dict(spec)
+        spec["params"] = dict(spec.get("params") or {})
+        spec["properties"] = dict(spec.get("properties") or {})
+        comp = cls(**spec)
+        # __post_init__ reads a 60x40 base as unset and copies width/height over it
+        if "base_width" in spec:
+            comp.base_width = spec["base_width"]
+            comp.base_height = spec["base_height"]
+        return comp
     
     def contains_point(self, x: float, y: float) -> bool:
         """Check if point is inside component (bounding box)"""
@@ -87,71 +423,96 @@ class CanvasComponent:
     
     def get_ports(self) -> List[Tuple[float, float]]:
         """Get port positions based on component type and rotation"""
-        import math
-        
-        left = self.x - self.width/2
-        right = self.x + self.width/2
-        top = self.y - self.height/2
-        bottom = self.y + self.height/2
-        
-        # Determine number of ports based on component type
-        comp_type_lower = self.comp_type.lower()
-        comp_name_lower = self.name.lower()
-        
-        # 1-port components: Ground, Oscilloscope, Test Equipment
-        if ("ground" in comp_type_lower or "ground" in comp_name_lower or
-            "oscilloscope" in comp_name_lower or "scope" in comp_name_lower or
-            "multimeter" in comp_name_lower or "ammeter" in comp_name_lower or 
-            "voltmeter" in comp_name_lower or "wattmeter" in comp_name_lower or
-            "ohmmeter" in comp_name_lower or "function generator" in comp_name_lower):
-            base_ports = [(self.x, bottom)]  # Single bottom port
-        
-        # 3-port components: Transistors (BJT), MOSFETs, JFETs, IGBTs, TRIACs, SCRs, Thyristors
-        elif any(x in comp_name_lower for x in ["bjt", "mosfet", "jfet", "igbt", "triac", "scr", "thyristor", "transistor"]):
-            # 3 ports: Base/Gate at top, Collector/Drain at right, Emitter/Source at bottom
-            base_ports = [
-                (self.x, top + 10),       # Gate/Base/Control (top)
-                (right - 5, self.y),      # Drain/Collector (right)
-                (self.x, bottom - 10),    # Source/Emitter (bottom)
-            ]
-        
-        # 3-port components: Op-Amps, Comparators
-        elif any(x in comp_name_lower for x in ["op-amp", "opamp", "comparator"]):
-            # 3 ports: Inverting in, Non-inverting in, Output
-            base_ports = [
-                (left + 5, self.y - 8),   # Non-inverting input (left, upper)
-                (left + 5, self.y + 8),   # Inverting input (left, lower)
-                (right - 5, self.y),      # Output (right)
-            ]
-        
-        # 2-port components: Everything else by default
-        else:
-            base_ports = [
-                (left, self.y),      # Left
-                (right, self.y),     # Right
-            ]
+        key = (self.width, self.height, self.rotation)
+        if self._port_offsets_key != key:
+            self._port_offsets = self._compute_port_offsets()
+            self._port_offsets_key = key
+        x, y = self.x, self.y
+        return [(x + dx, y + dy) for dx, dy in self._port_offsets]
+    
+    def _compute_port_offsets(self) -> List[Tuple[float, float]]:
+        """Port positions relative to the component center"""
+        base_ports = self._port_layout(self.width, self.height)
         
         # Apply rotation to ports
         if self.rotation == 0:
             return base_ports
         
+        quarter_turn = _QUARTER_TURNS.get(self.rotation)
+        if quarter_turn is not None:
+            return [quarter_turn(dx, dy) for dx, dy in base_ports]
+        
         # Rotate ports around component center
-        rotated_ports = []
         rad = math.radians(self.rotation)
         cos_a = math.cos(rad)
         sin_a = math.sin(rad)
-        
-        for px, py in base_ports:
-            # Translate to origin
-            dx = px - self.x
-            dy = py - self.y
-            # Rotate
-            new_dx = dx * cos_a - dy * sin_a
-            new_dy = dx * sin_a + dy * cos_a
-            # Translate back
-            rotated_ports.append((self.x + new_dx, self.y + new_dy))
-        
-        return rotated_ports
+        return [(dx * cos_a - dy * sin_a, dx * sin_a + dy * cos_a) for dx, dy in base_ports]
+
+
+class _SlotArrays:
+    """Parallel float arrays (structure of arrays) addressed by a dense slot per id
+    
+    Freed slots are reused and hold +inf, so they never match a range or
+    distance test.
+    """
+    
+    def __init__(self, *columns: str, capacity: int = 64):
+        self.columns = {name: np.full(capacity, np.inf) for name in columns}
+        self.slot: Dict[str, int] = {}
+        self.ids: List[Optional[str]] = []
+        self._free: List[int] = []
+    
+    def __len__(self) -> int:
+        return len(self.slot)
+    
+    def set(self, item_id: str, **values: float):
+        """Write values for item_id, allocating a slot on first use"""
+        slot = self.slot.get(item_id)
+        if slot is None:
+            slot = self._alloc(item_id)
+        for name, value in values.items():
+            self.columns[name][slot] = value
+    
+    def discard(self, item_id: str):
+        slot = self.slot.pop(item_id, None)
+        if slot is not None:
+            for column in self.columns.values():
+                column[slot] = np.inf
+            self.ids[slot] = None
+            self._free.append(slot)
+    
+    def clear(self):
+        for column in self.columns.values():
+            column.fill(np.inf)
+        self.slot.clear()
+        self.ids.clear()
+        self._free.clear()
+    
+    def view(self, name: str) -> np.ndarray:
+        """Column trimmed to the slots handed out so far"""
+        return self.columns[name][:len(self.ids)]
+    
+    def ids_where(self, mask: np.ndarray) -> List[str]:
+        """IDs of the slots selected by a boolean mask over the views"""
+        ids = self.ids
+        return [ids[i] for i in np.flatnonzero(mask)]
+    
+    def _alloc(self, item_id: str) -> int:
+        """Reserve a slot, growing the arrays by doubling"""
+        if self._free:
+            slot = self._free.pop()
+            self.ids[slot] = item_id
+        else:
+            slot = len(self.ids)
+            for name, column in self.columns.items():
+                if slot == len(column):
+                    self.columns[name] = np.concatenate((column, np.full(len(column), np.inf)))
+            self.ids.append(item_id)
+        self.slot[item_id] = slot
+        return slot
+
+
+_MISSING = object()  # Undo spec of an item that did not exist at that point
 
 
 class CircuitCanvas(QWidget):
@@ -164,6 +525,21 @@ class CircuitCanvas(QWidget):
     undo_redo_changed = Signal(bool, bool)  # can_undo, can_redo - for toolbar updates
     clipboard_changed = Signal(bool)  # has_content
     
+    # Paint resources shared by every canvas, built once instead of per stroke
+    _BACKGROUND_COLOR = QColor("#f5f5f5")
+    _GRID_PEN = QPen(QColor("#e0e0e0"), 1)
+    _PREVIEW_PEN = QPen(QColor("#ff9800"), 3, Qt.DashLine)
+    _HIGHLIGHT_PEN = QPen(QColor("#ff9800"), 2)
+    _HIGHLIGHT_BRUSH = QBrush(QColor("#ffff00"))
+    _NODE_PEN = QPen(QColor("#000000"), 1)
+    _NODE_BRUSH = QBrush(QColor("#0066cc"))
+    _MARQUEE_PEN = QPen(QColor("#0066cc"), 2, Qt.DashLine)
+    _MARQUEE_BRUSH = QBrush(QColor(0, 102, 204, 30))  # Semi-transparent blue
+    _LABEL_PEN = QPen(QColor("#ff6600"))
+    
+    _FRAME_INTERVAL_MS = 16  # Queued repaints are flushed at most once per frame (~60 FPS)
+    _SYMBOL_CACHE_LIMIT = 512  # Rendered symbols kept before the cache is reset
+    
     def __init__(self):
         super().__init__()
         self.setStyleSheet("background-color: #f5f5f5;")
@@ -178,6 +554,12 @@ class CircuitCanvas(QWidget):
         self.pan_x = 0
         self.pan_y = 0
         self.wire_width = 2  # Width of drawn wires
+        self._wire_pen = QPen(QColor("#000000"), self.wire_width)  # Black wire with adjustable width
+        self._label_font = QFont("Arial", 8, QFont.Bold)
+        # Rendered symbols keyed by everything that changes their pixels
+        self._symbol_cache: Dict[Tuple, QPixmap] = {}
+        self._symbol_cache_dpr = 1.0
+        self._name_labels: Dict[str, QStaticText] = {}  # Laid-out selection labels
 
         # Circuit elements
         self.components: Dict[str, CanvasComponent] = {}
@@ -208,11 +590,38 @@ class CircuitCanvas(QWidget):
         
         # Node to component mapping for better tracking
         self.node_to_component: Dict[str, str] = {}  # node_id -> comp_id
-        
-        # Undo/Redo system
-        self.undo_stack: List[Dict] = []  # History of states
-        self.redo_stack: List[Dict] = []
+        self._comp_to_nodes: Dict[str, List[str]] = {}  # comp_id -> node_ids in port order
+        self._node_to_wires: Dict[str, Set[str]] = {}  # node_id -> ids of wires ending there
+        
+        # Spatial hash for hit testing: cell -> ids whose position/bbox touches it
+        self._cell_size = max(self.grid_size, 32)
+        self._node_buckets: Dict[Tuple[int, int], Set[str]] = {}
+        self._node_cells: Dict[str, Tuple[int, int]] = {}
+        self._comp_buckets: Dict[Tuple[int, int], Set[str]] = {}
+        self._comp_cells: Dict[str, List[Tuple[int, int]]] = {}
+        
+        # Node positions and component geometry mirrored into parallel
+        # arrays for vectorized searches and alignment
+        self._node_arrays = _SlotArrays("x", "y")
+        self._comp_arrays = _SlotArrays("x", "y", "w", "h", "seq")
+        self._comp_seq = 0  # Insertion counter; keeps draw order stable across slot reuse
+        self._wire_arrays = _SlotArrays("ax", "ay", "bx", "by", "left", "top", "right", "bottom")
+        self._wire_lines: Dict[str, QLine] = {}  # Drawn segment per wire, refreshed with the arrays
+        
+        # High-frequency input (mouse move, wheel, key repeat) accumulates its
+        # dirty area here and is flushed as one update() per frame
+        self._repaint_pending = False
+        self._pending_rect = QRect()
+        self._last_flush = 0.0  # time.monotonic() of the last flush
+        
+        # Undo/Redo system: each level maps the (kind, id) of every item
+        # changed since its save_state() to the item's spec before the change
+        # (_MISSING if it did not exist yet), so a level costs what it touched
+        self.undo_stack: Deque[Dict] = deque()
+        self.redo_stack: Deque[Dict] = deque()
         self.max_undo_levels = 50
+        self._journal: Optional[Dict] = None  # Level that changes are recorded into
+        self._specs: Dict[Tuple[str, str], object] = {}  # Latest spec of every item
         
         # Clipboard for cut/copy/paste
         
@@ -253,8 +662,8 @@ class CircuitCanvas(QWidget):
             
             # Snap to grid if enabled
             if self.snap_to_grid:
-                x = round(x / self.grid_size) * self.grid_size
-                y = round(y / self.grid_size) * self.grid_size
+                x = self._snap(x)
+                y = self._snap(y)
             
             # Add component
             self.add_component(comp_type, comp_name, x, y)
@@ -263,6 +672,21 @@ class CircuitCanvas(QWidget):
         else:
             event.ignore()
         
+    @property
+    def grid_size(self) -> int:
+        """Grid spacing in pixels"""
+        return self._grid_size
+    
+    @grid_size.setter
+    def grid_size(self, size: int):
+        self._grid_size = size
+        self._inv_grid = 1.0 / size  # Snapping multiplies instead of dividing
+        self._grid_pixmap = None  # Rebuilt at the new spacing on next paint
+    
+    def _snap(self, v: float) -> float:
+        """Round a coordinate to the nearest grid line"""
+        return round(v * self._inv_grid) * self._grid_size
+    
     def set_mode(self, mode: CanvasMode):
         """Set canvas operation mode"""
         self.mode = mode
@@ -311,6 +735,7 @@ class CircuitCanvas(QWidget):
             width=width, height=height,
             properties=properties
         )
+        self._index_component(comp_id)
         # Add nodes for component
         self._add_component_nodes(comp_id)
         
@@ -323,9 +748,6 @@ class CircuitCanvas(QWidget):
     
     def _load_library_properties(self, comp_type: str, comp_name: str) -> Dict:
         """Load component properties from library files"""
-        import json
-        from pathlib import Path
-        
         # Map component types to library files
         library_map = {
             "Resistor": "resistors.json",
@@ -342,40 +764,43 @@ class CircuitCanvas(QWidget):
         if not lib_file:
             return {}
         
-        lib_path = Path(__file__).parent.parent.parent / "data" / "libraries" / lib_file
-        
-        try:
-            with open(lib_path, 'r') as f:
-                lib_data = json.load(f)
-                
-            # Find the component in the library
-            for comp in lib_data.get("components", []):
-                if comp.get("name", "").lower() == comp_name.lower() or \
-                   comp.get("id", "").lower() == comp_type.lower():
-                    return comp.get("properties", {})
-        except:
-            pass
-        
-        return {}
+        # Find the component in the (cached) library, earliest match first
+        index = _load_library_index(lib_file)
+        matches = [
+            entry for entry in (index.get(("name", comp_name.lower())), index.get(("id", comp_type.lower())))
+            if entry is not None
+        ]
+        if not matches:
+            return {}
+        # Decode a fresh copy so edits to one component never leak into the cache
+        return json.loads(min(matches, key=lambda entry: entry[0])[1])
     
     def _add_component_nodes(self, comp_id: str):
         """Add connection nodes for component"""
         comp = self.components[comp_id]
         # Remove old nodes for this component first
-        nodes_to_remove = [nid for nid, cid in self.node_to_component.items() if cid == comp_id]
+        nodes_to_remove = self._comp_to_nodes.pop(comp_id, [])
         for nid in nodes_to_remove:
             if nid in self.nodes:
                 del self.nodes[nid]
             if nid in self.node_to_component:
                 del self.node_to_component[nid]
+            self._unindex_node(nid)
         
         # Add new nodes based on current port configuration
         ports = comp.get_ports()
-        for i, (px, py) in enumerate(ports):
-            node_id = f"node_{self.node_counter}"
-            self.nodes[node_id] = Node(px, py, node_id)
-            self.node_to_component[node_id] = comp_id  # Track which component owns this node
-            self.node_counter += 1
+        first = self.node_counter
+        new_nodes = {
+            f"node_{first + i}": Node(px, py, f"node_{first + i}")
+            for i, (px, py) in enumerate(ports)
+        }
+        self.node_counter += len(new_nodes)
+        self.nodes.update(new_nodes)
+        self.node_to_component.update(dict.fromkeys(new_nodes, comp_id))  # Track which component owns these nodes
+        self._comp_to_nodes[comp_id] = list(new_nodes)
+        for node_id in new_nodes:
+            self._index_node(node_id)
+        self._track("comp", comp_id)
     
     def add_wire(self, from_node: str, to_node: str):
         """Add wire between nodes with undo support"""
@@ -383,6 +808,9 @@ class CircuitCanvas(QWidget):
             self.save_state()  # Save for undo
             wire_id = f"wire_{self.wire_counter}"
             self.wires[wire_id] = Wire(from_node, to_node, wire_id)
+            self._node_to_wires.setdefault(from_node, set()).add(wire_id)
+            self._node_to_wires.setdefault(to_node, set()).add(wire_id)
+            self._index_wire(wire_id)
             self.wire_counter += 1
             self.circuit_changed.emit()
             self.update()
@@ -396,26 +824,194 @@ class CircuitCanvas(QWidget):
             self._add_component_nodes(comp_id)
         self.update()
     
+    # ============== SPATIAL INDEX ==============
+    
+    def _cell_of(self, x: float, y: float) -> Tuple[int, int]:
+        """Spatial hash cell containing a point"""
+        return (int(x // self._cell_size), int(y // self._cell_size))
+    
+    def _index_node(self, node_id: str):
+        """Insert or re-bucket a node after it was created or moved"""
+        self._track("node", node_id)
+        node = self.nodes[node_id]
+        self._node_arrays.set(node_id, x=node.x, y=node.y)
+        for wire_id in self._node_to_wires.get(node_id, ()):
+            self._index_wire(wire_id)
+        
+        cell = self._cell_of(node.x, node.y)
+        old_cell = self._node_cells.get(node_id)
+        if old_cell == cell:
+            return
+        if old_cell is not None:
+            self._node_buckets[old_cell].discard(node_id)
+        self._node_buckets.setdefault(cell, set()).add(node_id)
+        self._node_cells[node_id] = cell
+    
+    def _unindex_node(self, node_id: str):
+        """Remove a node from the spatial index"""
+        self._track("node", node_id)
+        cell = self._node_cells.pop(node_id, None)
+        if cell is not None:
+            self._node_buckets[cell].discard(node_id)
+        self._node_arrays.discard(node_id)
+    
+    def _index_wire(self, wire_id: str):
+        """Store a wire's endpoints and bounding box after it was added or an end moved"""
+        self._track("wire", wire_id)
+        wire = self.wires.get(wire_id)
+        n1 = self.nodes.get(wire.from_node) if wire else None
+        n2 = self.nodes.get(wire.to_node) if wire else None
+        if n1 is None or n2 is None:
+            self._wire_arrays.discard(wire_id)
+            self._wire_lines.pop(wire_id, None)
+            return
+        self._wire_arrays.set(
+            wire_id, ax=n1.x, ay=n1.y, bx=n2.x, by=n2.y,
+            left=min(n1.x, n2.x), top=min(n1.y, n2.y),
+            right=max(n1.x, n2.x), bottom=max(n1.y, n2.y),
+        )
+        self._wire_lines[wire_id] = QLine(int(n1.x), int(n1.y), int(n2.x), int(n2.y))
+    
+    def _index_component(self, comp_id: str):
+        """Insert or re-bucket a component into every cell its bbox overlaps"""
+        self._track("comp", comp_id)
+        comp = self.components[comp_id]
+        if comp_id not in self._comp_arrays.slot:
+            self._comp_arrays.set(comp_id, seq=self._comp_seq)
+            self._comp_seq += 1
+        self._comp_arrays.set(comp_id, x=comp.x, y=comp.y, w=comp.width, h=comp.height)
+        cx0, cy0 = self._cell_of(comp.x - comp.width/2, comp.y - comp.height/2)
+        cx1, cy1 = self._cell_of(comp.x + comp.width/2, comp.y + comp.height/2)
+        cells = [(cx, cy) for cx in range(cx0, cx1 + 1) for cy in range(cy0, cy1 + 1)]
+        old_cells = self._comp_cells.get(comp_id)
+        if old_cells == cells:
+            return
+        if old_cells:
+            for cell in old_cells:
+                self._comp_buckets[cell].discard(comp_id)
+        for cell in cells:
+            self._comp_buckets.setdefault(cell, set()).add(comp_id)
+        self._comp_cells[comp_id] = cells
+    
+    def _unindex_component(self, comp_id: str):
+        """Remove a component from the spatial index"""
+        self._track("comp", comp_id)
+        self._comp_arrays.discard(comp_id)
+        for cell in self._comp_cells.pop(comp_id, ()):
+            self._comp_buckets[cell].discard(comp_id)
+    
+    def _rebuild_spatial_index(self):
+        """Re-index everything after the element dicts were replaced wholesale"""
+        self._node_buckets.clear()
+        self._node_cells.clear()
+        self._comp_buckets.clear()
+        self._comp_cells.clear()
+        self._node_arrays.clear()
+        self._comp_arrays.clear()
+        self._wire_arrays.clear()
+        self._wire_lines.clear()
+        self._comp_to_nodes.clear()
+        for node_id, comp_id in self.node_to_component.items():
+            self._comp_to_nodes.setdefault(comp_id, []).append(node_id)
+        self._node_to_wires.clear()
+        for wire_id, wire in self.wires.items():
+            self._node_to_wires.setdefault(wire.from_node, set()).add(wire_id)
+            self._node_to_wires.setdefault(wire.to_node, set()).add(wire_id)
+        for node_id in self.nodes:
+            self._index_node(node_id)
+        for comp_id in self.components:
+            self._index_component(comp_id)
+        for wire_id in self.wires:
+            self._index_wire(wire_id)
+        
+        # Items replaced away are recorded as removed
+        live = {"comp": self.components, "node": self.nodes, "wire": self.wires}
+        for kind, item_id in [key for key in self._specs if key[1] not in live[key[0]]]:
+            self._track(kind, item_id)
+    
     def get_node_at(self, x: float, y: float, tolerance: float = 15) -> Optional[str]:
         """Get node ID at position with improved snap detection"""
         closest_node = None
-        closest_distance = tolerance
-        
-        # Find the closest node within tolerance
-        for node_id, node in self.nodes.items():
-            distance = node.distance_to(x, y)
-            if distance < closest_distance:
-                closest_node = node_id
-                closest_distance = distance
+        closest_d2 = tolerance*tolerance
+        
+        # Only the 3x3 cells around the point can hold a node within tolerance
+        # (tolerance <= cell size); otherwise search every node at once
+        if tolerance > self._cell_size:
+            return self._nearest_node_vectorized(x, y, tolerance)
+        
+        cx, cy = self._cell_of(x, y)
+        nodes = self.nodes
+        for i in (-1, 0, 1):
+            for j in (-1, 0, 1):
+                for node_id in self._node_buckets.get((cx + i, cy + j), ()):
+                    node = nodes[node_id]
+                    # Cheap single-axis rejection before the full squared distance
+                    dx = node.x - x
+                    if dx*dx >= closest_d2:
+                        continue
+                    dy = node.y - y
+                    d2 = dx*dx + dy*dy
+                    if d2 < closest_d2:
+                        closest_node = node_id
+                        closest_d2 = d2
         
         return closest_node
     
+    def _nearest_node_vectorized(self, x: float, y: float, tolerance: float) -> Optional[str]:
+        """Closest node within tolerance using the SoA position arrays"""
+        arrays = self._node_arrays
+        if not arrays:
+            return None
+        i = kernels.nearest_node(arrays.view("x"), arrays.view("y"), x, y, tolerance*tolerance)
+        return arrays.ids[i] if i >= 0 else None
+    
     def get_component_at(self, x: float, y: float) -> Optional[str]:
         """Get component ID at position"""
-        for comp_id, comp in self.components.items():
-            if comp.contains_point(x, y):
-                return comp_id
-        return None
+        components = self.components
+        hits = []
+        for comp_id in self._comp_buckets.get(self._cell_of(x, y), ()):
+            comp = components[comp_id]
+            # Reject on x before evaluating the full bounding box
+            if abs(comp.x - x) > comp.width/2:
+                continue
+            if abs(comp.y - y) <= comp.height/2:
+                hits.append(comp_id)
+        
+        if len(hits) > 1:
+            # Overlap: buckets are unordered, so resolve to the earliest
+            # placed component like a scan over self.components would
+            return next(comp_id for comp_id in components if comp_id in hits)
+        return hits[0] if hits else None
+    
+    def get_component_nodes(self, comp_id: str) -> List[str]:
+        """IDs of the nodes owned by a component, in port order"""
+        return list(self._comp_to_nodes.get(comp_id, ()))
+    
+    def get_wire_at(self, x: float, y: float, tolerance: float = 5) -> Optional[str]:
+        """Get the ID of the wire closest to position within tolerance"""
+        arrays = self._wire_arrays
+        if not arrays:
+            return None
+        
+        # Cheap bounding-box reject first; exact distance only for survivors
+        candidates = np.flatnonzero(
+            (arrays.view("left") - tolerance <= x) & (x <= arrays.view("right") + tolerance) &
+            (arrays.view("top") - tolerance <= y) & (y <= arrays.view("bottom") + tolerance)
+        )
+        if not len(candidates):
+            return None
+        
+        # Squared distance from the point to each candidate segment
+        cols = arrays.columns
+        ax, ay = cols["ax"][candidates], cols["ay"][candidates]
+        dx, dy = cols["bx"][candidates] - ax, cols["by"][candidates] - ay
+        len2 = dx*dx + dy*dy
+        t = np.clip(((x - ax)*dx + (y - ay)*dy) / np.where(len2 > 0, len2, 1.0), 0.0, 1.0)
+        px, py = ax + t*dx - x, ay + t*dy - y
+        d2 = px*px + py*py
+        
+        i = int(d2.argmin())
+        return arrays.ids[candidates[i]] if d2[i] <= tolerance*tolerance else None
     
     def select_component(self, comp_id: Optional[str]):
         """Select component"""
@@ -437,17 +1033,15 @@ class CircuitCanvas(QWidget):
             
             # Snap to grid if enabled
             if self.snap_to_grid:
-                new_x = round(new_x / self.grid_size) * self.grid_size
-                new_y = round(new_y / self.grid_size) * self.grid_size
+                new_x = self._snap(new_x)
+                new_y = self._snap(new_y)
             
             comp.x = new_x
             comp.y = new_y
+            self._index_component(comp_id)
             
             # Update associated nodes
-            for node_id, node in self.nodes.items():
-                if self._node_belongs_to_component(node_id, comp_id):
-                    node.x = new_x
-                    node.y = new_y
+            self._update_component_nodes(comp_id)
             
             self.circuit_changed.emit()
     
@@ -456,12 +1050,15 @@ class CircuitCanvas(QWidget):
         if comp_id in self.components:
             comp = self.components[comp_id]
             comp.rotation = (comp.rotation + degrees) % 360
+            self._track("comp", comp_id)
             self.circuit_changed.emit()
-            self.update()
+            # The paint extent is a square about the center, so it covers any rotation
+            self._request_repaint(self._component_paint_rect(comp))
     
     def set_wire_width(self, width: int):
         """Set the width of wires drawn"""
         self.wire_width = max(1, min(width, 10))  # Clamp between 1 and 10
+        self._wire_pen.setWidth(self.wire_width)
         self.update()
     
     def rotate_selected(self, degrees: float = 90):
@@ -477,41 +1074,32 @@ class CircuitCanvas(QWidget):
         if len(self.selected_components) < 2:
             return
         
-        comps = [self.components[cid] for cid in self.selected_components]
-        
-        if alignment == "left":
-            min_x = min(c.x for c in comps)
-            for comp in comps:
-                comp.x = min_x
-        
-        elif alignment == "center":
-            avg_x = sum(c.x for c in comps) / len(comps)
-            for comp in comps:
-                comp.x = avg_x
-        
-        elif alignment == "right":
-            max_x = max(c.x for c in comps)
-            for comp in comps:
-                comp.x = max_x
-        
-        elif alignment == "top":
-            min_y = min(c.y for c in comps)
-            for comp in comps:
-                comp.y = min_y
-        
-        elif alignment == "middle":
-            avg_y = sum(c.y for c in comps) / len(comps)
-            for comp in comps:
-                comp.y = avg_y
-        
-        elif alignment == "bottom":
-            max_y = max(c.y for c in comps)
-            for comp in comps:
-                comp.y = max_y
-        
-        # Update node positions
-        for comp_id in self.selected_components:
-            self._update_component_nodes(comp_id)
+        comp_ids = self.selected_components
+        slots = [self._comp_arrays.slot[cid] for cid in comp_ids]
+        xs = self._comp_arrays.columns["x"][slots]
+        ys = self._comp_arrays.columns["y"][slots]
+        
+        # Aligned coordinates and per-component offsets, computed in one pass
+        new_xs, new_ys = xs, ys
+        if alignment in ("left", "center", "right"):
+            new_xs = np.full_like(xs, {"left": xs.min, "center": xs.mean, "right": xs.max}[alignment]())
+        elif alignment in ("top", "middle", "bottom"):
+            new_ys = np.full_like(ys, {"top": ys.min, "middle": ys.mean, "bottom": ys.max}[alignment]())
+        dxs = new_xs - xs
+        dys = new_ys - ys
+        
+        # Alignment is a pure translation, so nodes shift by the same offset
+        # as their component and ports need not be recomputed
+        for comp_id, x, y, dx, dy in zip(comp_ids, new_xs.tolist(), new_ys.tolist(), dxs.tolist(), dys.tolist()):
+            comp = self.components[comp_id]
+            comp.x = x
+            comp.y = y
+            self._index_component(comp_id)
+            for node_id in self._comp_to_nodes.get(comp_id, ()):
+                node = self.nodes[node_id]
+                node.x += dx
+                node.y += dy
+                self._index_node(node_id)
         
         self.circuit_changed.emit()
         self.update()
@@ -519,13 +1107,12 @@ class CircuitCanvas(QWidget):
     def _update_component_nodes(self, comp_id: str):
         """Update node positions after component move/align"""
         comp = self.components[comp_id]
-        ports = comp.get_ports()
-        node_idx = 0
-        for node_id, associated_comp_id in list(self.node_to_component.items()):
-            if associated_comp_id == comp_id and node_idx < len(ports):
-                self.nodes[node_id].x = ports[node_idx][0]
-                self.nodes[node_id].y = ports[node_idx][1]
-                node_idx += 1
+        for node_id, (px, py) in zip(self._comp_to_nodes.get(comp_id, ()), comp.get_ports()):
+            node = self.nodes.get(node_id)
+            if node is not None:
+                node.x = px
+                node.y = py
+                self._index_node(node_id)
     
     def group_components(self, comp_ids: List[str]) -> Optional[str]:
         """Group components together"""
@@ -543,6 +1130,7 @@ class CircuitCanvas(QWidget):
         # Assign group ID to components
         for comp_id in comp_ids:
             self.components[comp_id].group_id = group_id
+            self._track("comp", comp_id)
         
         return group_id
     
@@ -553,6 +1141,7 @@ class CircuitCanvas(QWidget):
             for comp_id in comp_ids:
                 if comp_id in self.components:
                     self.components[comp_id].group_id = None
+                    self._track("comp", comp_id)
             del self.groups[group_id]
             self.circuit_changed.emit()
     
@@ -582,13 +1171,7 @@ class CircuitCanvas(QWidget):
     
     def _node_belongs_to_component(self, node_id: str, comp_id: str) -> bool:
         """Check if node belongs to component"""
-        node = self.nodes[node_id]
-        comp = self.components[comp_id]
-        ports = comp.get_ports()
-        for px, py in ports:
-            if abs(node.x - px) < 1 and abs(node.y - py) < 1:
-                return True
-        return False
+        return self.node_to_component.get(node_id) == comp_id
     
     def clear_canvas(self):
         """Clear all components and wires"""
@@ -596,6 +1179,8 @@ class CircuitCanvas(QWidget):
         self.nodes.clear()
         self.wires.clear()
         self.node_to_component.clear()
+        self._comp_to_nodes.clear()
+        self._rebuild_spatial_index()
         self.selected_component = None
         self.update()
     
@@ -645,8 +1230,8 @@ class CircuitCanvas(QWidget):
         
         elif self.mode == CanvasMode.PLACE_COMPONENT:
             if self.preview_component:
-                x_snap = round(x / self.grid_size) * self.grid_size if self.snap_to_grid else x
-                y_snap = round(y / self.grid_size) * self.grid_size if self.snap_to_grid else y
+                x_snap = self._snap(x) if self.snap_to_grid else x
+                y_snap = self._snap(y) if self.snap_to_grid else y
                 self.add_component(
                     self.preview_component.comp_type,
                     self.preview_component.name,
@@ -715,37 +1300,40 @@ class CircuitCanvas(QWidget):
             if dialog.exec() == PropertiesDialog.Accepted:
                 # Update component properties
                 comp.params = dialog.get_properties()
+                self._track("comp", comp.comp_id)
                 self.circuit_changed.emit()
                 self.update()
     
     def _on_cut(self, comp_id: str):
         """Handle cut action"""
         if comp_id in self.components:
-            self.clipboard["components"] = [self.components[comp_id]]
-            del self.components[comp_id]
-            self.circuit_changed.emit()
-            self.update()
+            self.clipboard["components"] = [self.components[comp_id].to_dict()]
+            self._on_delete(comp_id)
     
     def _on_copy(self, comp_id: str):
         """Handle copy action"""
         if comp_id in self.components:
-            self.clipboard["components"] = [self.components[comp_id]]
+            self.clipboard["components"] = [self.components[comp_id].to_dict()]
     
     def _on_paste(self):
         """Handle paste action"""
         if self.clipboard["components"]:
-            for comp in self.clipboard["components"]:
+            dirty = QRect()
+            for spec in self.clipboard["components"]:
                 new_comp = CanvasComponent(
-                    x=comp.x + 20, y=comp.y + 20,
+                    x=spec["x"] + 20, y=spec["y"] + 20,
                     comp_id=f"comp_{len(self.components)}",
-                    comp_type=comp.comp_type,
-                    name=comp.name,
-                    params=comp.params.copy() if comp.params else {}
+                    comp_type=spec["comp_type"],
+                    name=spec["name"],
+                    params=dict(spec["params"])
                 )
                 self.components[new_comp.comp_id] = new_comp
+                self._index_component(new_comp.comp_id)
                 self._add_component_nodes(new_comp.comp_id)
+                dirty = dirty.united(self._component_paint_rect(new_comp))
+            # One notification and one repaint for the whole batch
             self.circuit_changed.emit()
-            self.update()
+            self.update(dirty)
     
     def _on_resize(self, comp_id: str, scale: float):
         """Handle resize action - scale from base dimensions"""
@@ -754,68 +1342,87 @@ class CircuitCanvas(QWidget):
             # Scale from base dimensions to avoid cumulative scaling
             comp.width = comp.base_width * scale
             comp.height = comp.base_height * scale
+            self._index_component(comp_id)
             self._update_component_nodes(comp_id)
             self.circuit_changed.emit()
             self.update()
     
     def _on_delete(self, comp_id: str):
         """Handle delete action"""
-        if comp_id in self.components:
-            # Get associated nodes
-            nodes_to_delete = [nid for nid, cid in self.node_to_component.items() if cid == comp_id]
-            
-            # Remove wires connected to these nodes
-            wires_to_delete = []
-            for wire in self.wires:
-                if wire[0] in nodes_to_delete or wire[1] in nodes_to_delete:
-                    wires_to_delete.append(wire)
-            
-            for wire in wires_to_delete:
-                if wire in self.wires:
-                    self.wires.remove(wire)
-            
-            # Remove nodes
-            for node_id in nodes_to_delete:
-                if node_id in self.nodes:
-                    del self.nodes[node_id]
-                if node_id in self.node_to_component:
-                    del self.node_to_component[node_id]
-            
-            # Remove component
+        self.delete_components([comp_id])
+    
+    def delete_components(self, comp_ids: List[str]):
+        """Delete components with their nodes and wires, notifying and repainting once"""
+        dirty = QRect()
+        for comp_id in comp_ids:
             if comp_id in self.components:
-                del self.components[comp_id]
-            
-            if self.selected_component == comp_id:
-                self.selected_component = None
-            
+                dirty = dirty.united(self._remove_component(comp_id))
+        
+        if not dirty.isNull():
             self.circuit_changed.emit()
-            self.update()
+            self._request_repaint(dirty)
+    
+    def _remove_component(self, comp_id: str) -> QRect:
+        """Remove a component, its nodes and attached wires; return the area they covered"""
+        # Area to clear: the symbol plus every wire about to be removed
+        dirty = self._component_dirty_rect(comp_id)
+        
+        # Get associated nodes
+        nodes_to_delete = self._comp_to_nodes.pop(comp_id, [])
+        
+        # Remove wires connected to these nodes
+        wires_to_delete = set().union(*(self._node_to_wires.get(n, ()) for n in nodes_to_delete))
+        for wire_id in wires_to_delete:
+            wire = self.wires.pop(wire_id)
+            self._track("wire", wire_id)
+            self._wire_arrays.discard(wire_id)
+            self._wire_lines.pop(wire_id, None)
+            for node_id in (wire.from_node, wire.to_node):
+                attached = self._node_to_wires.get(node_id)
+                if attached is not None:
+                    attached.discard(wire_id)
+        
+        # Remove nodes
+        for node_id in nodes_to_delete:
+            if node_id in self.nodes:
+                del self.nodes[node_id]
+            if node_id in self.node_to_component:
+                del self.node_to_component[node_id]
+            self._node_to_wires.pop(node_id, None)
+            self._unindex_node(node_id)
+        
+        # Remove component
+        del self.components[comp_id]
+        self._unindex_component(comp_id)
+        
+        if self.selected_component == comp_id:
+            self.selected_component = None
+        
+        return dirty
     
     def mouseMoveEvent(self, event):
         """Handle mouse move - smooth component dragging and marquee selection"""
         pos = event.pos()
         
         if self.mode == CanvasMode.MARQUEE and self.marquee_mode and self.marquee_start:
-            # Draw marquee selection box
+            # Draw marquee selection box, repainting old and new box only
+            dirty = self.marquee_rect or QRect()
             self.marquee_rect = QRect(self.marquee_start, pos).normalized()
-            self.update()
+            self._request_repaint(dirty.united(self.marquee_rect).adjusted(-2, -2, 2, 2))
         
         elif self.mode == CanvasMode.PLACE_COMPONENT and self.preview_component:
+            dirty = self._component_paint_rect(self.preview_component)
             self.preview_component.x = pos.x()
             self.preview_component.y = pos.y()
-            self.update()
+            self._request_repaint(dirty.united(self._component_paint_rect(self.preview_component)))
         
         elif self.dragging_from_node and self.wire_mode_start_node:
             # Show preview line from start node to current cursor position (dragging from blue dot)
-            start_node = self.nodes[self.wire_mode_start_node]
-            self.wire_preview = ((start_node.x, start_node.y), (pos.x(), pos.y()))
-            self.update()
+            self._set_wire_preview(pos)
         
         elif self.mode == CanvasMode.DRAW_WIRE and self.wire_mode_start_node:
             # Show preview line from start node to current cursor position
-            start_node = self.nodes[self.wire_mode_start_node]
-            self.wire_preview = ((start_node.x, start_node.y), (pos.x(), pos.y()))
-            self.update()
+            self._set_wire_preview(pos)
         
         elif self.dragging and self.selected_component:
             # Calculate delta movement
@@ -824,39 +1431,128 @@ class CircuitCanvas(QWidget):
             
             # Move the component smoothly
             comp = self.components.get(self.selected_component)
+            dirty = QRect()
             if comp:
+                dirty = self._component_dirty_rect(self.selected_component)
                 new_x = comp.x + delta_x
                 new_y = comp.y + delta_y
                 
                 # Snap to grid if enabled
                 if self.snap_to_grid:
-                    new_x = round(new_x / self.grid_size) * self.grid_size
-                    new_y = round(new_y / self.grid_size) * self.grid_size
+                    new_x = self._snap(new_x)
+                    new_y = self._snap(new_y)
                 
                 comp.x = new_x
                 comp.y = new_y
+                self._index_component(self.selected_component)
                 
                 # Update nodes position
                 self._update_component_nodes(self.selected_component)
+                dirty = dirty.united(self._component_dirty_rect(self.selected_component))
             
             # Update drag start for next movement
             self.drag_start = pos
-            self.update()
+            self._request_repaint(dirty)
+    
+    def _set_wire_preview(self, pos: QPoint):
+        """Move the wire preview end to pos, repainting old and new segment"""
+        dirty = self._wire_preview_rect()
+        start_node = self.nodes[self.wire_mode_start_node]
+        self.wire_preview = ((start_node.x, start_node.y), (pos.x(), pos.y()))
+        self._request_repaint(dirty.united(self._wire_preview_rect()))
+    
+    def _request_repaint(self, rect: Optional[QRect] = None):
+        """Queue rect (default: whole canvas) for the next coalesced repaint"""
+        self._pending_rect = self._pending_rect.united(rect if rect is not None else self.rect())
+        if not self._repaint_pending:
+            self._repaint_pending = True
+            # Flush on the next event loop pass, or once the current frame is over
+            elapsed_ms = (time.monotonic() - self._last_flush) * 1000
+            QTimer.singleShot(max(0, int(self._FRAME_INTERVAL_MS - elapsed_ms)), self._flush_repaint)
+    
+    def _flush_repaint(self):
+        """Issue a single update() for everything queued since the last flush"""
+        rect = self._pending_rect
+        self._repaint_pending = False
+        self._pending_rect = QRect()
+        self._last_flush = time.monotonic()
+        if not rect.isEmpty():
+            self.update(rect)
+    
+    @staticmethod
+    def _segment_rect(x1: float, y1: float, x2: float, y2: float, pad: int) -> QRect:
+        """Bounding rect of a line segment grown by pad on every side"""
+        return QRect(
+            QPoint(int(min(x1, x2)) - pad, int(min(y1, y2)) - pad),
+            QPoint(int(max(x1, x2)) + pad, int(max(y1, y2)) + pad),
+        )
+    
+    def _wire_preview_rect(self) -> QRect:
+        """Area covered by the dashed preview line and its end marker"""
+        if not self.wire_preview:
+            return QRect()
+        (x1, y1), (x2, y2) = self.wire_preview
+        return self._segment_rect(x1, y1, x2, y2, 8)
+    
+    def _wire_rect(self, wire: Wire) -> QRect:
+        """Area covered by a wire at the current width"""
+        n1 = self.nodes.get(wire.from_node)
+        n2 = self.nodes.get(wire.to_node)
+        if n1 is None or n2 is None:
+            return QRect()
+        return self._segment_rect(n1.x, n1.y, n2.x, n2.y, self.wire_width + 1)
+    
+    def _component_paint_rect(self, comp: CanvasComponent) -> QRect:
+        """Conservative area a component can paint: rotated symbol, ports and name label"""
+        half = int(max(comp.width, comp.height) / 2) + 45
+        return QRect(int(comp.x) - half, int(comp.y) - half, 2*half, 2*half)
+    
+    def _component_dirty_rect(self, comp_id: str) -> QRect:
+        """Area covering a component together with the wires attached to it"""
+        rect = self._component_paint_rect(self.components[comp_id])
+        for node_id in self._comp_to_nodes.get(comp_id, ()):
+            for wire_id in self._node_to_wires.get(node_id, ()):
+                rect = rect.united(self._wire_rect(self.wires[wire_id]))
+        return rect
     
     def mouseReleaseEvent(self, event):
         """Handle mouse release"""
         if self.mode == CanvasMode.MARQUEE and self.marquee_mode and self.marquee_rect:
-            # Select all components within marquee rect
-            for comp_id, comp in self.components.items():
-                if self.marquee_rect.contains(int(comp.x), int(comp.y)):
-                    if event.modifiers() & Qt.ControlModifier:
-                        self.select_multi(comp_id, toggle=False)
-                    else:
-                        self.select_component(comp_id)
+            # Select all components whose center lies within the marquee rect
+            rect = self.marquee_rect
+            arrays = self._comp_arrays
+            hits = np.empty(len(arrays.ids), dtype=np.int64)
+            count = kernels.points_in_rect(
+                np.trunc(arrays.view("x")), np.trunc(arrays.view("y")),
+                rect.left(), rect.top(), rect.right(), rect.bottom(), hits,
+            )
+            # Slots are reused, so restore placement order before selecting
+            slots = hits[:count]
+            slots = slots[np.argsort(arrays.view("seq")[slots], kind="stable")]
+            hit_ids = [arrays.ids[i] for i in slots]
+            
+            # Apply the selection in bulk; Ctrl extends the current selection
+            dirty = rect.adjusted(-2, -2, 2, 2)
+            if not (event.modifiers() & Qt.ControlModifier):
+                for comp_id in self.selected_components:
+                    if comp_id in self.components:
+                        self.components[comp_id].selected = False
+                self.selected_components = []
+            selected = set(self.selected_components)
+            for comp_id in hit_ids:
+                comp = self.components[comp_id]
+                comp.selected = True
+                dirty = dirty.united(self._component_paint_rect(comp))
+                if comp_id not in selected:
+                    self.selected_components.append(comp_id)
+            if hit_ids:
+                self.selected_component = hit_ids[-1]
+                self.component_selected.emit(hit_ids[-1])
+            
             self.marquee_mode = False
             self.marquee_start = None
             self.marquee_rect = None
-            self.update()
+            self.update(dirty)
         
         # Check if releasing after dragging from a node
         if self.dragging_from_node and self.wire_mode_start_node:
@@ -885,7 +1581,7 @@ class CircuitCanvas(QWidget):
             return
         
         comp = self.components[comp_id]
-        comp_name_lower = comp.name.lower() if comp.name else ""
+        comp_name_lower = comp._kind
         
         # Handle oscilloscope double-click
         if "oscilloscope" in comp_name_lower or "scope" in comp_name_lower:
@@ -894,6 +1590,7 @@ class CircuitCanvas(QWidget):
             if dialog.exec() == OscilloscopeDialog.Accepted:
                 settings = dialog.get_settings()
                 comp.params = settings
+                self._track("comp", comp.comp_id)
                 self.circuit_changed.emit()
                 self.update()
         
@@ -903,6 +1600,7 @@ class CircuitCanvas(QWidget):
             dialog = OscilloscopeDialog(self, comp.name, comp.params or {})
             if dialog.exec() == OscilloscopeDialog.Accepted:
                 comp.params = dialog.get_settings()
+                self._track("comp", comp.comp_id)
                 self.circuit_changed.emit()
                 self.update()
     
@@ -912,21 +1610,16 @@ class CircuitCanvas(QWidget):
         zoom_factor = 1.1 if delta > 0 else 0.9
         self.zoom_level *= zoom_factor
         self.zoom_level = max(0.1, min(self.zoom_level, 5.0))
-        self.update()
+        self._request_repaint()
     
     def keyPressEvent(self, event):
         """Handle key press"""
         if event.key() == Qt.Key_Delete:
             if self.selected_component and self.selected_component not in self.selected_components:
-                comp_id = self.selected_component
-                del self.components[comp_id]
-                self.selected_component = None
-                self.circuit_changed.emit()
+                self._on_delete(self.selected_component)
             elif self.selected_components:
-                for comp_id in self.selected_components:
-                    del self.components[comp_id]
+                self.delete_components(self.selected_components)
                 self.selected_components = []
-            self.update()
         
         elif event.key() == Qt.Key_Escape:
             self.set_mode(CanvasMode.SELECT)
@@ -950,26 +1643,28 @@ class CircuitCanvas(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
         
-        # Fill background
-        painter.fillRect(self.rect(), QColor("#f5f5f5"))
+        # Only the invalidated area needs repainting; skip items outside it
+        dirty = event.rect()
+        cull = dirty != self.rect()
         
-        # Draw grid
+        # Fill background and draw grid
         if self.show_grid:
-            self._draw_grid(painter)
+            self._draw_grid(painter, dirty)
+        else:
+            painter.fillRect(dirty, self._BACKGROUND_COLOR)
         
         # Draw wires
-        for wire in self.wires.values():
-            self._draw_wire(painter, wire)
+        self._draw_wires(painter, self._wires_in_rect(dirty) if cull else self.wires)
         
         # Draw wire preview (while drawing new wire) with enhanced styling
         if self.wire_preview:
             (x1, y1), (x2, y2) = self.wire_preview
             # Dashed orange line for preview
-            painter.setPen(QPen(QColor("#ff9800"), 3, Qt.DashLine))
+            painter.setPen(self._PREVIEW_PEN)
             painter.drawLine(int(x1), int(y1), int(x2), int(y2))
             # Add circle at end point
-            painter.setPen(QPen(QColor("#ff9800"), 2))
-            painter.setBrush(QBrush(QColor("#ffff00")))
+            painter.setPen(self._HIGHLIGHT_PEN)
+            painter.setBrush(self._HIGHLIGHT_BRUSH)
             painter.drawEllipse(int(x2-5), int(y2-5), 10, 10)
         
         # Draw preview component
@@ -977,35 +1672,141 @@ class CircuitCanvas(QWidget):
             self._draw_component(painter, self.preview_component, preview=True)
         
         # Draw components
-        for comp in self.components.values():
-            self._draw_component(painter, comp)
+        comp_ids = self._components_in_rect(dirty) if cull else self.components
+        for comp_id in comp_ids:
+            self._draw_component(painter, self.components[comp_id])
         
         # Draw nodes
-        for node in self.nodes.values():
-            self._draw_node(painter, node)
+        self._draw_nodes(painter, self._nodes_in_rect(dirty) if cull else self.nodes)
         
         # Draw marquee selection box
         if self.marquee_rect and self.marquee_mode:
-            painter.setPen(QPen(QColor("#0066cc"), 2, Qt.DashLine))
-            painter.setBrush(QBrush(QColor(0, 102, 204, 30)))  # Semi-transparent blue
+            painter.setPen(self._MARQUEE_PEN)
+            painter.setBrush(self._MARQUEE_BRUSH)
             painter.drawRect(self.marquee_rect)
     
-    def _draw_grid(self, painter: QPainter):
-        """Draw grid background"""
-        painter.setPen(QPen(QColor("#e0e0e0"), 1))
-        
-        for x in range(0, self.width(), self.grid_size):
-            painter.drawLine(x, 0, x, self.height())
-        
-        for y in range(0, self.height(), self.grid_size):
-            painter.drawLine(0, y, self.width(), y)
+    def _wires_in_rect(self, rect: QRect) -> List[str]:
+        """Wires whose pen-inflated bounding box touches rect"""
+        arrays = self._wire_arrays
+        pad = self.wire_width + 1
+        hits = np.empty(len(arrays.ids), dtype=np.int64)
+        count = kernels.boxes_in_rect(
+            arrays.view("left"), arrays.view("top"), arrays.view("right"), arrays.view("bottom"),
+            rect.left() - pad, rect.top() - pad, rect.right() + pad, rect.bottom() + pad, hits,
+        )
+        return [arrays.ids[i] for i in hits[:count]]
+    
+    def _components_in_rect(self, rect: QRect) -> List[str]:
+        """Components whose paint area touches rect, in placement (draw) order"""
+        arrays = self._comp_arrays
+        xs, ys = arrays.view("x"), arrays.view("y")
+        # Same conservative extent as _component_paint_rect; freed slots
+        # (inf - inf) come out NaN and fail every comparison
+        half = np.maximum(arrays.view("w"), arrays.view("h")) / 2 + 45
+        with np.errstate(invalid="ignore"):
+            mask = ((xs + half >= rect.left()) & (xs - half <= rect.right()) &
+                    (ys + half >= rect.top()) & (ys - half <= rect.bottom()))
+        slots = np.flatnonzero(mask)
+        slots = slots[np.argsort(arrays.view("seq")[slots], kind="stable")]
+        return [arrays.ids[i] for i in slots]
+    
+    def _nodes_in_rect(self, rect: QRect) -> List[str]:
+        """Nodes whose marker (at most 12px across) touches rect"""
+        arrays = self._node_arrays
+        xs, ys = arrays.view("x"), arrays.view("y")
+        return arrays.ids_where(
+            (xs + 7 >= rect.left()) & (xs - 7 <= rect.right()) &
+            (ys + 7 >= rect.top()) & (ys - 7 <= rect.bottom())
+        )
+    
+    def _draw_grid(self, painter: QPainter, rect: QRect):
+        """Draw background and grid over rect by tiling a single grid cell"""
+        g = self.grid_size
+        dpr = self.devicePixelRatioF()
+        if self._grid_pixmap is None or self._grid_pixmap.devicePixelRatio() != dpr:
+            self._grid_pixmap = self._build_grid_pixmap(g, dpr)
+        # Offset keeps tiles anchored to the widget origin, not to rect
+        painter.drawTiledPixmap(rect, self._grid_pixmap, QPoint(rect.left() % g, rect.top() % g))
+    
+    def _build_grid_pixmap(self, g: int, dpr: float) -> QPixmap:
+        """One grid cell: background with the grid line along its top and left edge"""
+        pixmap = QPixmap(int(g * dpr), int(g * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(self._BACKGROUND_COLOR)
+        tile = QPainter(pixmap)
+        tile.setPen(self._GRID_PEN)
+        tile.drawLine(0, 0, g - 1, 0)
+        tile.drawLine(0, 0, 0, g - 1)
+        tile.end()
+        return pixmap
     
     def _draw_component(self, painter: QPainter, comp: CanvasComponent, preview: bool = False):
         """Draw component symbol with rotation support and dynamic sizing"""
-        painter.save()
-        
         x, y = int(comp.x), int(comp.y)
         
+        # Symbols are rendered once per look and blitted afterwards
+        half = int(max(comp.width, comp.height) / 2) + 45
+        painter.drawPixmap(x - half, y - half, self._symbol_pixmap(comp, half))
+        
+        # Draw component name label (always visible when selected or on hover).
+        # Pen and font are left set afterwards: every later layer sets its own,
+        # so only a rotated label needs the transform saved and restored.
+        if comp.selected:
+            rotated = comp.rotation != 0
+            if rotated:
+                painter.save()
+                painter.translate(x, y)
+                painter.rotate(comp.rotation)
+                painter.translate(-x, -y)
+            painter.setFont(self._label_font)
+            painter.setPen(self._LABEL_PEN)
+            # Display name above component, centered in the 80x15 box at (x-40, y-35)
+            # and clipped to it like drawText, so it stays inside the paint extent
+            label = self._name_label(comp.name)
+            size = label.size()
+            overflow = size.width() > 80 or size.height() > 15
+            if overflow and not rotated:
+                painter.save()
+            if overflow:
+                painter.setClipRect(x - 40, y - 35, 80, 15, Qt.IntersectClip)
+            painter.drawStaticText(QPointF(x - size.width()/2, y - 35 + (15 - size.height())/2), label)
+            if rotated or overflow:
+                painter.restore()
+    
+    def _name_label(self, name: str) -> QStaticText:
+        """Selection label for name, laid out once and replayed on later paints"""
+        label = self._name_labels.get(name)
+        if label is None:
+            label = QStaticText(name)
+            label.setTextFormat(Qt.PlainText)
+            label.prepare(QTransform(), self._label_font)
+            self._name_labels[name] = label
+        return label
+    
+    def _symbol_pixmap(self, comp: CanvasComponent, half: int) -> QPixmap:
+        """Cached rendering of a component symbol centered in a 2*half square"""
+        dpr = self.devicePixelRatioF()
+        if dpr != self._symbol_cache_dpr:
+            self._symbol_cache.clear()
+            self._symbol_cache_dpr = dpr
+        
+        key = (comp.name, comp.selected, comp.rotation, comp.width, comp.height)
+        pixmap = self._symbol_cache.get(key)
+        if pixmap is None:
+            if len(self._symbol_cache) >= self._SYMBOL_CACHE_LIMIT:
+                self._symbol_cache.clear()
+            pixmap = QPixmap(int(2 * half * dpr), int(2 * half * dpr))
+            pixmap.setDevicePixelRatio(dpr)
+            pixmap.fill(Qt.transparent)
+            symbol = QPainter(pixmap)
+            symbol.setRenderHint(QPainter.Antialiasing)
+            self._draw_symbol(symbol, comp, half, half)
+            symbol.end()
+            self._symbol_cache[key] = pixmap
+        return pixmap
+    
+    def _draw_symbol(self, painter: QPainter, comp: CanvasComponent, x: int, y: int):
+        """Draw the symbol for comp centered at (x, y), rotated and scaled"""
         # Apply rotation
         if comp.rotation != 0:
             painter.translate(x, y)
@@ -1018,166 +1819,41 @@ class CircuitCanvas(QWidget):
         scale_y = comp.height / 40.0
         scale = (scale_x + scale_y) / 2.0  # Average scale
         
-        # Select symbol based on component name (case-insensitive)
-        comp_name_lower = comp.name.lower()
-        
-        if "resistor" in comp_name_lower:
-            self._draw_resistor(painter, x, y, comp.selected, scale)
-        elif "capacitor" in comp_name_lower:
-            self._draw_capacitor(painter, x, y, comp.selected, scale)
-        elif "inductor" in comp_name_lower:
-            self._draw_inductor(painter, x, y, comp.selected, scale)
-        elif "diode" in comp_name_lower:
-            self._draw_diode(painter, x, y, comp.selected, scale)
-        elif "battery" in comp_name_lower:
-            self._draw_battery(painter, x, y, comp.selected, scale)
-        elif "ac source" in comp_name_lower or "ac" in comp_name_lower:
-            self._draw_ac_source(painter, x, y, comp.selected, scale)
-        elif "dc source" in comp_name_lower or "voltage" in comp_name_lower:
-            self._draw_dc_source(painter, x, y, comp.selected, scale)
-        elif "current source" in comp_name_lower:
-            self._draw_current_source(painter, x, y, comp.selected, scale)
-        elif "ground" in comp_name_lower:
-            self._draw_ground(painter, x, y, comp.selected, scale)
-        elif "switch" in comp_name_lower:
-            self._draw_switch(painter, x, y, comp.selected, scale)
-        elif "relay" in comp_name_lower:
-            self._draw_relay(painter, x, y, comp.selected, scale)
-        elif "transformer" in comp_name_lower:
-            self._draw_transformer(painter, x, y, comp.selected, scale)
-        elif "motor" in comp_name_lower:
-            self._draw_motor(painter, x, y, comp.selected, scale)
-        elif "generator" in comp_name_lower:
-            self._draw_generator(painter, x, y, comp.selected, scale)
-        elif "ammeter" in comp_name_lower:
-            self._draw_ammeter(painter, x, y, comp.selected, scale)
-        elif "voltmeter" in comp_name_lower:
-            self._draw_voltmeter(painter, x, y, comp.selected)
-        elif "wattmeter" in comp_name_lower:
-            self._draw_wattmeter(painter, x, y, comp.selected)
-        elif "ohmmeter" in comp_name_lower:
-            self._draw_ohmmeter(painter, x, y, comp.selected)
-        elif "oscilloscope" in comp_name_lower or "scope" in comp_name_lower:
-            self._draw_oscilloscope(painter, x, y, comp.selected)
-        elif "function generator" in comp_name_lower or "fgen" in comp_name_lower:
-            self._draw_function_generator(painter, x, y, comp.selected)
-        elif "multimeter" in comp_name_lower or "dmm" in comp_name_lower:
-            self._draw_multimeter(painter, x, y, comp.selected)
-        elif "spectrum analyzer" in comp_name_lower:
-            self._draw_spectrum_analyzer(painter, x, y, comp.selected)
-        elif "logic analyzer" in comp_name_lower:
-            self._draw_logic_analyzer(painter, x, y, comp.selected)
-        elif "lcr meter" in comp_name_lower or "lcr" in comp_name_lower:
-            self._draw_lcr_meter(painter, x, y, comp.selected)
-        elif "thyristor" in comp_name_lower:
-            self._draw_thyristor(painter, x, y, comp.selected)
-        elif "bjt" in comp_name_lower:
-            self._draw_bjt(painter, x, y, comp.selected)
-        elif "mosfet" in comp_name_lower:
-            self._draw_mosfet(painter, x, y, comp.selected)
-        elif "led" in comp_name_lower:
-            self._draw_led(painter, x, y, comp.selected)
-        elif "op-amp" in comp_name_lower or "opamp" in comp_name_lower:
-            self._draw_opamp(painter, x, y, comp.selected)
-        elif "multiplexer" in comp_name_lower or "mux" in comp_name_lower:
-            self._draw_multiplexer(painter, x, y, comp.selected)
-        elif "demultiplexer" in comp_name_lower or "demux" in comp_name_lower:
-            self._draw_demultiplexer(painter, x, y, comp.selected)
-        elif "variable resistor" in comp_name_lower:
-            self._draw_variable_resistor(painter, x, y, comp.selected)
-        elif "potentiometer" in comp_name_lower:
-            self._draw_potentiometer(painter, x, y, comp.selected)
-        elif "fuse" in comp_name_lower:
-            self._draw_fuse(painter, x, y, comp.selected)
-        elif "circuit breaker" in comp_name_lower:
-            self._draw_circuit_breaker(painter, x, y, comp.selected)
-        elif "rectifier" in comp_name_lower:
-            self._draw_rectifier(painter, x, y, comp.selected)
-        elif "filter" in comp_name_lower:
-            self._draw_filter(painter, x, y, comp.selected)
-        elif "multimeter" in comp_name_lower:
-            self._draw_multimeter(painter, x, y, comp.selected)
-        elif "voltage divider" in comp_name_lower:
-            self._draw_voltage_divider(painter, x, y, comp.selected)
-        elif "connector" in comp_name_lower or "plug" in comp_name_lower or "socket" in comp_name_lower or "wire" in comp_name_lower:
-            self._draw_connector(painter, x, y, comp.name, comp.selected)
-        elif "contactor" in comp_name_lower:
-            self._draw_contactor(painter, x, y, comp.selected)
-        elif "push button" in comp_name_lower:
-            self._draw_push_button(painter, x, y, comp.selected)
-        elif "zener" in comp_name_lower or "schottky" in comp_name_lower:
-            self._draw_diode(painter, x, y, comp.selected)  # Similar to diode
-        elif "stepper" in comp_name_lower:
-            self._draw_motor(painter, x, y, comp.selected)  # Similar to motor
-        elif "ac motor" in comp_name_lower:
-            self._draw_motor(painter, x, y, comp.selected)
-        elif "dc motor" in comp_name_lower:
-            self._draw_motor(painter, x, y, comp.selected)
-        elif "thermistor" in comp_name_lower:
-            self._draw_resistor(painter, x, y, comp.selected)  # Similar to resistor
-        elif "sensor" in comp_name_lower or "photo diode" in comp_name_lower:
-            self._draw_photo_sensor(painter, x, y, comp.selected)
-        elif "terminal" in comp_name_lower or "bus bar" in comp_name_lower:
-            self._draw_terminal_block(painter, x, y, comp.selected)
-        elif "ic" in comp_name_lower or "op-amp" in comp_name_lower or "timer" in comp_name_lower or "741" in comp_name_lower or "microcontroller" in comp_name_lower or "processor" in comp_name_lower or "ram" in comp_name_lower or "rom" in comp_name_lower or "dsp" in comp_name_lower or "fpga" in comp_name_lower:
-            self._draw_ic_dip(painter, x, y, comp.selected, comp.name)
-        elif "gate" in comp_name_lower or "logic" in comp_name_lower:
-            self._draw_logic_gate(painter, x, y, comp.selected, comp.name)
-        elif "antenna" in comp_name_lower:
-            self._draw_antenna(painter, x, y, comp.selected)
-        elif "crystal" in comp_name_lower or "oscillator" in comp_name_lower:
-            self._draw_crystal(painter, x, y, comp.selected)
-        elif "display" in comp_name_lower or "7-segment" in comp_name_lower or "lcd" in comp_name_lower:
-            self._draw_display(painter, x, y, comp.selected, comp.name)
-        elif "solenoid" in comp_name_lower or "electromagnet" in comp_name_lower:
-            self._draw_solenoid(painter, x, y, comp.selected)
-        elif "buzzer" in comp_name_lower or "speaker" in comp_name_lower:
-            self._draw_speaker(painter, x, y, comp.selected)
-        elif "varistor" in comp_name_lower or "varactor" in comp_name_lower:
-            self._draw_varistor(painter, x, y, comp.selected)
-        elif "jfet" in comp_name_lower:
-            self._draw_jfet(painter, x, y, comp.selected)
-        elif "igbt" in comp_name_lower:
-            self._draw_igbt(painter, x, y, comp.selected)
-        elif "triac" in comp_name_lower:
-            self._draw_triac(painter, x, y, comp.selected)
-        elif "comparator" in comp_name_lower:
-            self._draw_comparator(painter, x, y, comp.selected)
+        draw_name, style = comp._symbol
+        draw = getattr(self, draw_name)
+        if style == "scaled":
+            draw(painter, x, y, comp.selected, scale)
+        elif style == "plain":
+            draw(painter, x, y, comp.selected)
+        elif style == "named":
+            draw(painter, x, y, comp.selected, comp.name)
         else:
-            self._draw_generic_component(painter, x, y, comp.name, comp.selected)
-        
-        # Draw component name label (always visible when selected or on hover)
-        if comp.selected:
-            painter.setFont(QFont("Arial", 8, QFont.Bold))
-            painter.setPen(QPen(QColor("#ff6600")))
-            # Display name above component
-            name_text = f"{comp.name}"
-            painter.drawText(int(x-40), int(y-35), 80, 15, Qt.AlignCenter, name_text)
-        
-        painter.restore()
+            draw(painter, x, y, comp.name, comp.selected)
+    
+    def _draw_symbol_path(self, painter, path, x, y, scale=1.0):
+        """Stroke a symbol path built around the origin, centered at (x, y)"""
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPath(QTransform(scale, 0, 0, scale, x, y).map(path))
+    
+    def _draw_leads(self, painter, x, y, inner=15, outer=30):
+        """Draw the two horizontal lead wires of a two-terminal symbol"""
+        painter.drawLines([QLine(x-outer, y, x-inner, y), QLine(x+inner, y, x+outer, y)])
     
     def _draw_resistor(self, painter, x, y, selected, scale=1.0):
         """Draw resistor symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         # Scale the dimensions
         s = scale * 1.0
-        points = [
-            (x - 25*s, y), (x - 18*s, y - 6*s), (x - 12*s, y + 6*s), (x - 6*s, y - 6*s),
-            (x, y + 6*s), (x + 6*s, y - 6*s), (x + 12*s, y + 6*s), (x + 22*s, y)
-        ]
-        for i in range(len(points)-1):
-            painter.drawLine(int(points[i][0]), int(points[i][1]), int(points[i+1][0]), int(points[i+1][1]))
-        painter.drawLine(int(x - 30*s), int(y), int(x - 25*s), int(y))
-        painter.drawLine(int(x + 22*s), int(y), int(x + 30*s), int(y))
-        painter.setFont(QFont("Arial", max(5, int(7*scale))))
-        painter.setPen(QPen(QColor("#000000")))
+        self._draw_symbol_path(painter, _ZIGZAG_PATH, x, y, s)
+        painter.setFont(_font(max(5, int(7*scale))))
+        painter.setPen(_pen("#000000"))
         painter.drawText(int(x - 10*s), int(y + 12*s), int(20*s), int(10*s), Qt.AlignCenter, "R")
     
     def _draw_capacitor(self, painter, x, y, selected, scale=1.0):
         """Draw capacitor symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         s = scale * 1.0
         # Left wire
         painter.drawLine(int(x - 30*s), int(y), int(x - 15*s), int(y))
@@ -1187,44 +1863,40 @@ class CircuitCanvas(QWidget):
         painter.drawLine(int(x - 15*s), int(y - 12*s), int(x - 15*s), int(y + 12*s))
         painter.drawLine(int(x + 15*s), int(y - 12*s), int(x + 15*s), int(y + 12*s))
         # Label
-        painter.setFont(QFont("Arial", max(5, int(8*scale))))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(max(5, int(8*scale))))
+        painter.setPen(_pen("#000000"))
         painter.drawText(int(x - 8*s), int(y + 15*s), int(16*s), int(10*s), Qt.AlignCenter, "C")
     
     def _draw_inductor(self, painter, x, y, selected, scale=1.0):
         """Draw inductor symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         s = scale * 1.0
-        painter.drawLine(int(x - 30*s), int(y), int(x - 22*s), int(y))
-        painter.drawLine(int(x + 22*s), int(y), int(x + 30*s), int(y))
-        # Draw coil loops
-        for i in range(5):
-            painter.drawArc(int(x - 20*s + i*8*s), int(y - 6*s), int(8*s), int(12*s), 0, 180*16)
+        self._draw_symbol_path(painter, _INDUCTOR_PATH, x, y, s)
         # Label
-        painter.setFont(QFont("Arial", max(5, int(8*scale))))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(max(5, int(8*scale))))
+        painter.setPen(_pen("#000000"))
         painter.drawText(int(x - 6*s), int(y + 15*s), int(12*s), int(10*s), Qt.AlignCenter, "L")
     
     def _draw_diode(self, painter, x, y, selected, scale=1.0):
         """Draw diode symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#cc0000")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#ffcccc")))
+        color = "#ff9800" if selected else "#cc0000"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#ffcccc"))
         s = scale * 1.0
         painter.drawLine(int(x - 30*s), int(y), int(x - 15*s), int(y))
         painter.drawLine(int(x + 15*s), int(y), int(x + 30*s), int(y))
         tri = QPolygon([QPoint(int(x - 12*s), int(y - 10*s)), QPoint(int(x - 12*s), int(y + 10*s)), QPoint(int(x + 10*s), int(y))])
         painter.drawPolygon(tri)
         painter.drawLine(int(x + 10*s), int(y - 12*s), int(x + 10*s), int(y + 12*s))
-        painter.setFont(QFont("Arial", max(5, int(7*scale))))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(max(5, int(7*scale))))
+        painter.setPen(_pen("#000000"))
         painter.drawText(int(x - 8*s), int(y + 12*s), int(16*s), int(10*s), Qt.AlignCenter, "D")
     
     def _draw_battery(self, painter, x, y, selected, scale=1.0):
         """Draw battery symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#000000")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#000000"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         s = scale * 1.0
         painter.drawLine(int(x - 30*s), int(y), int(x - 18*s), int(y))
         painter.drawLine(int(x + 18*s), int(y), int(x + 30*s), int(y))
@@ -1232,54 +1904,54 @@ class CircuitCanvas(QWidget):
         painter.drawLine(int(x + 10*s), int(y - 12*s), int(x + 10*s), int(y + 12*s))
         # Negative terminal (short line)
         painter.drawLine(int(x - 8*s), int(y - 8*s), int(x - 8*s), int(y + 8*s))
-        painter.setFont(QFont("Arial", max(5, int(7*scale))))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(max(5, int(7*scale))))
+        painter.setPen(_pen("#000000"))
         painter.drawText(int(x - 8*s), int(y + 12*s), int(16*s), int(10*s), Qt.AlignCenter, "B")
     
     def _draw_ac_source(self, painter, x, y, selected, scale=1.0):
         """Draw AC source symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#0066cc")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#e3f2fd")))
+        color = "#ff9800" if selected else "#0066cc"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#e3f2fd"))
         s = scale * 1.0
         painter.drawLine(int(x - 30*s), int(y), int(x - 18*s), int(y))
         painter.drawLine(int(x + 18*s), int(y), int(x + 30*s), int(y))
         painter.drawEllipse(int(x - 14*s), int(y - 14*s), int(28*s), int(28*s))
-        painter.setFont(QFont("Arial", max(5, int(10*scale)), QFont.Bold))
-        painter.setPen(QPen(QColor("#0066cc")))
+        painter.setFont(_font(max(5, int(10*scale)), bold=True))
+        painter.setPen(_pen("#0066cc"))
         painter.drawText(int(x - 8*s), int(y - 8*s), int(16*s), int(16*s), Qt.AlignCenter, "~")
     
     def _draw_dc_source(self, painter, x, y, selected, scale=1.0):
         """Draw DC source symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#0066cc")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#e3f2fd")))
+        color = "#ff9800" if selected else "#0066cc"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#e3f2fd"))
         s = scale * 1.0
         painter.drawLine(int(x - 30*s), int(y), int(x - 18*s), int(y))
         painter.drawLine(int(x + 18*s), int(y), int(x + 30*s), int(y))
         painter.drawEllipse(int(x - 14*s), int(y - 14*s), int(28*s), int(28*s))
-        painter.setFont(QFont("Arial", max(5, int(10*scale)), QFont.Bold))
-        painter.setPen(QPen(QColor("#0066cc")))
+        painter.setFont(_font(max(5, int(10*scale)), bold=True))
+        painter.setPen(_pen("#0066cc"))
         painter.drawText(int(x - 6*s), int(y - 6*s), int(12*s), int(12*s), Qt.AlignCenter, "+")
         painter.drawText(int(x - 6*s), int(y + 2*s), int(12*s), int(12*s), Qt.AlignCenter, "-")
     
     def _draw_current_source(self, painter, x, y, selected, scale=1.0):
         """Draw current source symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#009900")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#e3ffe3")))
+        color = "#ff9800" if selected else "#009900"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#e3ffe3"))
         s = scale * 1.0
         painter.drawLine(int(x - 30*s), int(y), int(x - 18*s), int(y))
         painter.drawLine(int(x + 18*s), int(y), int(x + 30*s), int(y))
         painter.drawEllipse(int(x - 14*s), int(y - 14*s), int(28*s), int(28*s))
-        painter.setFont(QFont("Arial", max(5, int(10*scale)), QFont.Bold))
-        painter.setPen(QPen(QColor("#009900")))
+        painter.setFont(_font(max(5, int(10*scale)), bold=True))
+        painter.setPen(_pen("#009900"))
         painter.drawText(int(x - 4*s), int(y - 6*s), int(8*s), int(12*s), Qt.AlignCenter, "I")
     
     def _draw_ground(self, painter, x, y, selected, scale=1.0):
         """Draw ground symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         s = scale * 1.0
         # Top vertical line (connection point)
         painter.drawLine(int(x), int(y - 15*s), int(x), int(y - 2*s))
@@ -1289,13 +1961,13 @@ class CircuitCanvas(QWidget):
         painter.drawLine(int(x - 6*s), int(y + 10*s), int(x + 6*s), int(y + 10*s))
         # Draw connection node indicator at top
         if selected:
-            painter.setBrush(QBrush(QColor("#ff9800")))
+            painter.setBrush(_brush("#ff9800"))
             painter.drawEllipse(QPointF(x, y - 15*s), 3*s, 3*s)
     
     def _draw_switch(self, painter, x, y, selected, scale=1.0):
         """Draw switch symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         s = scale * 1.0
         painter.drawLine(int(x - 30*s), int(y), int(x - 15*s), int(y))
         painter.drawLine(int(x + 15*s), int(y), int(x + 30*s), int(y))
@@ -1304,8 +1976,8 @@ class CircuitCanvas(QWidget):
     
     def _draw_relay(self, painter, x, y, selected, scale=1.0):
         """Draw relay symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         s = scale * 1.0
         painter.drawRect(int(x - 18*s), int(y - 12*s), int(36*s), int(24*s))
         painter.drawLine(int(x - 30*s), int(y), int(x - 18*s), int(y))
@@ -1314,207 +1986,203 @@ class CircuitCanvas(QWidget):
     
     def _draw_transformer(self, painter, x, y, selected, scale=1.0):
         """Draw transformer symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         s = scale * 1.0
-        painter.drawLine(int(x - 30*s), int(y), int(x - 20*s), int(y))
-        painter.drawLine(int(x + 20*s), int(y), int(x + 30*s), int(y))
-        for i in range(3):
-            painter.drawArc(int(x - 22*s), int(y - 8*s + i*8*s), int(8*s), int(8*s), 0, 360*16)
-            painter.drawArc(int(x + 14*s), int(y - 8*s + i*8*s), int(8*s), int(8*s), 0, 360*16)
+        self._draw_symbol_path(painter, _TRANSFORMER_PATH, x, y, s)
     
     def _draw_motor(self, painter, x, y, selected, scale=1.0):
         """Draw motor symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#009999")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#ccffff")))
+        color = "#ff9800" if selected else "#009999"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#ccffff"))
         s = scale * 1.0
         painter.drawLine(int(x - 30*s), int(y), int(x - 18*s), int(y))
         painter.drawLine(int(x + 18*s), int(y), int(x + 30*s), int(y))
         painter.drawEllipse(int(x - 14*s), int(y - 14*s), int(28*s), int(28*s))
-        painter.setFont(QFont("Arial", max(5, int(12*scale)), QFont.Bold))
-        painter.setPen(QPen(color))
+        painter.setFont(_font(max(5, int(12*scale)), bold=True))
+        painter.setPen(_pen(color))
         painter.drawText(int(x - 6*s), int(y - 8*s), int(12*s), int(16*s), Qt.AlignCenter, "M")
     
     def _draw_generator(self, painter, x, y, selected, scale=1.0):
         """Draw generator symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#669900")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#ffffcc")))
+        color = "#ff9800" if selected else "#669900"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#ffffcc"))
         s = scale * 1.0
         painter.drawLine(int(x - 30*s), int(y), int(x - 18*s), int(y))
         painter.drawLine(int(x + 18*s), int(y), int(x + 30*s), int(y))
         painter.drawEllipse(int(x - 14*s), int(y - 14*s), int(28*s), int(28*s))
-        painter.setFont(QFont("Arial", max(5, int(12*scale)), QFont.Bold))
-        painter.setPen(QPen(color))
+        painter.setFont(_font(max(5, int(12*scale)), bold=True))
+        painter.setPen(_pen(color))
         painter.drawText(int(x - 6*s), int(y - 8*s), int(12*s), int(16*s), Qt.AlignCenter, "G")
     
     def _draw_ammeter(self, painter, x, y, selected, scale=1.0):
         """Draw ammeter symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#f0f0f0")))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#f0f0f0"))
         s = scale * 1.0
         painter.drawLine(int(x - 30*s), int(y), int(x - 18*s), int(y))
         painter.drawLine(int(x + 18*s), int(y), int(x + 30*s), int(y))
         painter.drawEllipse(int(x - 14*s), int(y - 14*s), int(28*s), int(28*s))
-        painter.setFont(QFont("Arial", max(5, int(8*scale)), QFont.Bold))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(max(5, int(8*scale)), bold=True))
+        painter.setPen(_pen("#000000"))
         painter.drawText(int(x - 8*s), int(y - 6*s), int(16*s), int(12*s), Qt.AlignCenter, "A")
     
     def _draw_voltmeter(self, painter, x, y, selected, scale=1.0):
         """Draw voltmeter symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#f0f0f0")))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#f0f0f0"))
         s = scale * 1.0
         painter.drawLine(int(x - 30*s), int(y), int(x - 18*s), int(y))
         painter.drawLine(int(x + 18*s), int(y), int(x + 30*s), int(y))
         painter.drawEllipse(int(x - 14*s), int(y - 14*s), int(28*s), int(28*s))
-        painter.setFont(QFont("Arial", max(5, int(8*scale)), QFont.Bold))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(max(5, int(8*scale)), bold=True))
+        painter.setPen(_pen("#000000"))
         painter.drawText(int(x - 8*s), int(y - 6*s), int(16*s), int(12*s), Qt.AlignCenter, "V")
     
     def _draw_wattmeter(self, painter, x, y, selected, scale=1.0):
         """Draw wattmeter symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#f0f0f0")))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#f0f0f0"))
         s = scale * 1.0
         painter.drawLine(int(x - 30*s), int(y), int(x - 18*s), int(y))
         painter.drawLine(int(x + 18*s), int(y), int(x + 30*s), int(y))
         painter.drawEllipse(int(x - 14*s), int(y - 14*s), int(28*s), int(28*s))
-        painter.setFont(QFont("Arial", max(5, int(8*scale)), QFont.Bold))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(max(5, int(8*scale)), bold=True))
+        painter.setPen(_pen("#000000"))
         painter.drawText(int(x - 8*s), int(y - 6*s), int(16*s), int(12*s), Qt.AlignCenter, "W")
     
     def _draw_ohmmeter(self, painter, x, y, selected, scale=1.0):
         """Draw ohmmeter symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#f0f0f0")))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#f0f0f0"))
         s = scale * 1.0
         painter.drawLine(int(x - 30*s), int(y), int(x - 18*s), int(y))
         painter.drawLine(int(x + 18*s), int(y), int(x + 30*s), int(y))
         painter.drawEllipse(int(x - 14*s), int(y - 14*s), int(28*s), int(28*s))
-        painter.setFont(QFont("Arial", max(5, int(7*scale)), QFont.Bold))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(max(5, int(7*scale)), bold=True))
+        painter.setPen(_pen("#000000"))
         painter.drawText(int(x - 8*s), int(y - 6*s), int(16*s), int(12*s), Qt.AlignCenter, "Ω")
     
     def _draw_oscilloscope(self, painter, x, y, selected, scale=1.0):
         """Draw oscilloscope symbol with scaling"""
-        color = QColor("#ff9800") if selected else QColor("#1a4d7a")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#e8f4f8")))
+        color = "#ff9800" if selected else "#1a4d7a"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#e8f4f8"))
         s = scale * 1.0
         # Main cabinet outline
         painter.drawRect(int(x - 28*s), int(y - 20*s), int(56*s), int(40*s))
         # Display screen
-        painter.setPen(QPen(QColor("#000000"), 1))
-        painter.setBrush(QBrush(QColor("#1a1a1a")))
+        painter.setPen(_pen("#000000", 1))
+        painter.setBrush(_brush("#1a1a1a"))
         painter.drawRect(int(x - 24*s), int(y - 16*s), int(48*s), int(24*s))
         # Grid lines on screen
-        painter.setPen(QPen(QColor("#00aa00"), 0.5))
+        painter.setPen(_pen("#00aa00", 0.5))
         grid_spacing = 6*s
         for i in range(8):
             painter.drawLine(int(x - 24*s + i*grid_spacing), int(y - 16*s), int(x - 24*s + i*grid_spacing), int(y + 8*s))
         for j in range(4):
             painter.drawLine(int(x - 24*s), int(y - 16*s + j*grid_spacing), int(x + 24*s), int(y - 16*s + j*grid_spacing))
         # Label
-        painter.setFont(QFont("Arial", max(5, int(7*scale)), QFont.Bold))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(max(5, int(7*scale)), bold=True))
+        painter.setPen(_pen("#000000"))
         painter.drawText(int(x - 22*s), int(y + 12*s), int(44*s), int(10*s), Qt.AlignCenter, "SCOPE")
     
     def _draw_function_generator(self, painter, x, y, selected):
         """Draw function generator symbol"""
-        color = QColor("#ff9800") if selected else QColor("#cc6600")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#ffe8cc")))
+        color = "#ff9800" if selected else "#cc6600"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#ffe8cc"))
         
         # Cabinet
         painter.drawRect(x-28, y-16, 56, 32)
         
         # Display area
-        painter.setPen(QPen(QColor("#000000"), 1))
-        painter.setBrush(QBrush(QColor("#f5f5f5")))
+        painter.setPen(_pen("#000000", 1))
+        painter.setBrush(_brush("#f5f5f5"))
         painter.drawRect(x-24, y-12, 36, 12)
         
         # Waveform representation
-        painter.setPen(QPen(QColor("#0066cc"), 1.5))
+        painter.setPen(_pen("#0066cc", 1.5))
         points = [QPoint(x-20, y-6), QPoint(x-14, y-9), QPoint(x-8, y-3), 
                  QPoint(x-2, y-10), QPoint(x+4, y-4)]
         painter.drawPolyline(QPolygon(points))
         
         # Label
-        painter.setFont(QFont("Arial", 7, QFont.Bold))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(7, bold=True))
+        painter.setPen(_pen("#000000"))
         painter.drawText(x-22, y+4, 44, 10, Qt.AlignCenter, "FGEN")
     
     def _draw_multimeter(self, painter, x, y, selected):
         """Draw digital multimeter symbol"""
-        color = QColor("#ff9800") if selected else QColor("#663300")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#ffe8cc")))
+        color = "#ff9800" if selected else "#663300"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#ffe8cc"))
         
         # Cabinet
         painter.drawRect(x-26, y-18, 52, 36)
         
         # Display screen (digital)
-        painter.setPen(QPen(QColor("#000000"), 1))
-        painter.setBrush(QBrush(QColor("#ccffcc")))
+        painter.setPen(_pen("#000000", 1))
+        painter.setBrush(_brush("#ccffcc"))
         painter.drawRect(x-22, y-14, 44, 12)
         
         # Label
-        painter.setFont(QFont("Arial", 6, QFont.Bold))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(6, bold=True))
+        painter.setPen(_pen("#000000"))
         painter.drawText(x-18, y-11, 36, 8, Qt.AlignCenter, "0.000 V")
         
         # Meter label
-        painter.setFont(QFont("Arial", 7, QFont.Bold))
+        painter.setFont(_font(7, bold=True))
         painter.drawText(x-20, y+4, 40, 10, Qt.AlignCenter, "DMM")
     
     def _draw_spectrum_analyzer(self, painter, x, y, selected):
         """Draw spectrum analyzer symbol"""
-        color = QColor("#ff9800") if selected else QColor("#993333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#ffeeee")))
+        color = "#ff9800" if selected else "#993333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#ffeeee"))
         
         # Cabinet
         painter.drawRect(x-28, y-20, 56, 40)
         
         # Display screen
-        painter.setPen(QPen(QColor("#000000"), 1))
-        painter.setBrush(QBrush(QColor("#1a1a1a")))
+        painter.setPen(_pen("#000000", 1))
+        painter.setBrush(_brush("#1a1a1a"))
         painter.drawRect(x-24, y-16, 48, 24)
         
         # Frequency spectrum representation
-        painter.setPen(QPen(QColor("#ff3300"), 1.5))
+        painter.setPen(_pen("#ff3300", 1.5))
         spectrum = [(x-16, y+2), (x-12, y-4), (x-8, y-8), (x-4, y-2), 
                    (x, y-6), (x+4, y-1), (x+8, y-5), (x+12, y+1), (x+16, y-3)]
         for px, py in spectrum:
             painter.drawLine(px, py, px, y+8)
         
         # Label
-        painter.setFont(QFont("Arial", 7, QFont.Bold))
-        painter.setPen(QPen(QColor("#ffffff")))
+        painter.setFont(_font(7, bold=True))
+        painter.setPen(_pen("#ffffff"))
         painter.drawText(x-20, y+12, 40, 10, Qt.AlignCenter, "SA")
     
     def _draw_logic_analyzer(self, painter, x, y, selected):
         """Draw logic analyzer symbol"""
-        color = QColor("#ff9800") if selected else QColor("#0066cc")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#cce5ff")))
+        color = "#ff9800" if selected else "#0066cc"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#cce5ff"))
         
         # Cabinet
         painter.drawRect(x-26, y-18, 52, 36)
         
         # Display screen
-        painter.setPen(QPen(QColor("#000000"), 1))
-        painter.setBrush(QBrush(QColor("#1a1a1a")))
+        painter.setPen(_pen("#000000", 1))
+        painter.setBrush(_brush("#1a1a1a"))
         painter.drawRect(x-22, y-14, 44, 20)
         
         # Digital signal lines
-        painter.setPen(QPen(QColor("#00ff00"), 1.5))
+        painter.setPen(_pen("#00ff00", 1.5))
         painter.drawLine(x-18, y-8, x-10, y-8)
         painter.drawLine(x-10, y-8, x-10, y-2)
         painter.drawLine(x-10, y-2, x+2, y-2)
@@ -1522,37 +2190,37 @@ class CircuitCanvas(QWidget):
         painter.drawLine(x+2, y+4, x+10, y+4)
         
         # Label
-        painter.setFont(QFont("Arial", 7, QFont.Bold))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(7, bold=True))
+        painter.setPen(_pen("#000000"))
         painter.drawText(x-20, y+8, 40, 10, Qt.AlignCenter, "LA")
     
     def _draw_lcr_meter(self, painter, x, y, selected):
         """Draw LCR meter symbol"""
-        color = QColor("#ff9800") if selected else QColor("#663366")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#f5ccff")))
+        color = "#ff9800" if selected else "#663366"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#f5ccff"))
         
         # Cabinet
         painter.drawRect(x-26, y-18, 52, 36)
         
         # Display screen
-        painter.setPen(QPen(QColor("#000000"), 1))
-        painter.setBrush(QBrush(QColor("#ffffcc")))
+        painter.setPen(_pen("#000000", 1))
+        painter.setBrush(_brush("#ffffcc"))
         painter.drawRect(x-22, y-14, 44, 12)
         
         # Display text
-        painter.setFont(QFont("Arial", 6, QFont.Bold))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(6, bold=True))
+        painter.setPen(_pen("#000000"))
         painter.drawText(x-18, y-11, 36, 8, Qt.AlignCenter, "100 μH")
         
         # Label
-        painter.setFont(QFont("Arial", 7, QFont.Bold))
+        painter.setFont(_font(7, bold=True))
         painter.drawText(x-20, y+4, 40, 10, Qt.AlignCenter, "LCR")
     
     def _draw_bjt(self, painter, x, y, selected):
         """Draw BJT symbol"""
-        color = QColor("#ff9800") if selected else QColor("#cc0066")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#cc0066"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         painter.drawLine(x-30, y-10, x-10, y-10)  # Collector
         painter.drawLine(x-30, y, x-20, y)  # Base
         painter.drawLine(x-30, y+10, x-10, y+10)  # Emitter
@@ -1563,8 +2231,8 @@ class CircuitCanvas(QWidget):
     
     def _draw_mosfet(self, painter, x, y, selected):
         """Draw MOSFET symbol"""
-        color = QColor("#ff9800") if selected else QColor("#cc0066")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#cc0066"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         painter.drawLine(x-30, y-10, x-10, y-10)  # Drain
         painter.drawLine(x-30, y, x-20, y)  # Gate
         painter.drawLine(x-30, y+10, x-10, y+10)  # Source
@@ -1574,18 +2242,18 @@ class CircuitCanvas(QWidget):
     
     def _draw_thyristor(self, painter, x, y, selected):
         """Draw thyristor symbol"""
-        color = QColor("#ff9800") if selected else QColor("#990099")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#990099"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         painter.drawLine(x-30, y-10, x-10, y-10)
         painter.drawLine(x-30, y, x-20, y)
         painter.drawLine(x-30, y+10, x-10, y+10)
-        painter.drawPolygon(QPolygon([QPoint(x-8, y-8), QPoint(x-8, y+8), QPoint(x+8, y)]))
+        painter.drawPolygon(_THYRISTOR_TRIANGLE.translated(x, y))
         painter.drawLine(x+8, y-8, x+12, y-12)
     
     def _draw_contactor(self, painter, x, y, selected):
         """Draw contactor symbol (coil with contacts)"""
-        color = QColor("#ff9800") if selected else QColor("#0066cc")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#0066cc"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         # Coil representation
         painter.drawLine(x-30, y, x-15, y)
         painter.drawEllipse(x-12, y-10, 10, 10)
@@ -1594,10 +2262,9 @@ class CircuitCanvas(QWidget):
     
     def _draw_push_button(self, painter, x, y, selected):
         """Draw push button symbol"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.drawLine(x-30, y, x-15, y)
-        painter.drawLine(x+15, y, x+30, y)
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_leads(painter, x, y)
         # Button representation
         painter.drawEllipse(x-8, y-16, 16, 16)
         painter.drawRect(x-10, y+2, 20, 10)
@@ -1605,12 +2272,11 @@ class CircuitCanvas(QWidget):
     
     def _draw_photo_sensor(self, painter, x, y, selected):
         """Draw photo diode/sensor symbol"""
-        color = QColor("#ff9800") if selected else QColor("#ff0066")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.drawLine(x-30, y, x-15, y)
-        painter.drawLine(x+15, y, x+30, y)
+        color = "#ff9800" if selected else "#ff0066"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_leads(painter, x, y)
         # Triangle diode with light arrows
-        tri = QPolygon([QPoint(x-12, y-10), QPoint(x-12, y+10), QPoint(x+10, y)])
+        tri = _DIODE_TRIANGLE.translated(x, y)
         painter.drawPolygon(tri)
         painter.drawLine(x+10, y-12, x+10, y+12)
         # Light arrows
@@ -1621,9 +2287,9 @@ class CircuitCanvas(QWidget):
     
     def _draw_terminal_block(self, painter, x, y, selected):
         """Draw terminal block/bus bar symbol"""
-        color = QColor("#ff9800") if selected else QColor("#666666")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#cccccc")))
+        color = "#ff9800" if selected else "#666666"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#cccccc"))
         painter.drawLine(x-30, y, x-20, y)
         painter.drawRect(x-15, y-12, 30, 24)
         painter.drawLine(x-8, y-8, x-8, y+8)
@@ -1632,26 +2298,24 @@ class CircuitCanvas(QWidget):
     
     def _draw_ic_dip(self, painter, x, y, selected, comp_name):
         """Draw DIP IC package (8, 14, 16, 28, 40 pin)"""
-        color = QColor("#ff9800") if selected else QColor("#000080")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#e0e0e0")))
+        color = "#ff9800" if selected else "#000080"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#e0e0e0"))
         painter.drawRect(x-20, y-20, 40, 40)
         # Draw notch (pin 1 indicator)
         painter.drawLine(x-20, y-16, x-20, y-10)
         painter.drawEllipse(x-20, y-16, 4, 4)
         # Draw pin indicators
-        for i in range(4):
-            painter.drawLine(x-20, y-16+i*8, x-24, y-16+i*8)
-            painter.drawLine(x+20, y-16+i*8, x+24, y-16+i*8)
-        painter.setFont(QFont("Arial", 7, QFont.Bold))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.drawPath(_DIP_PINS_PATH.translated(x, y))
+        painter.setFont(_font(7, bold=True))
+        painter.setPen(_pen("#000000"))
         painter.drawText(x-15, y-5, 30, 10, Qt.AlignCenter, comp_name[:8])
     
     def _draw_logic_gate(self, painter, x, y, selected, comp_name):
         """Draw logic gate symbol"""
-        color = QColor("#ff9800") if selected else QColor("#0066cc")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#e3f2fd")))
+        color = "#ff9800" if selected else "#0066cc"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#e3f2fd"))
         gate_type = comp_name.lower()
         if "and" in gate_type:
             painter.drawRect(x-15, y-12, 20, 24)
@@ -1660,24 +2324,23 @@ class CircuitCanvas(QWidget):
             painter.drawArc(int(x-10), int(y-12), 10, 24, 270*16, 180*16)
             painter.drawRect(x+0, y-12, 15, 24)
         elif "not" in gate_type or "inverter" in gate_type:
-            tri = QPolygon([QPoint(x-15, y-12), QPoint(x-15, y+12), QPoint(x+15, y)])
+            tri = _BUFFER_TRIANGLE.translated(x, y)
             painter.drawPolygon(tri)
             painter.drawEllipse(x+14, y-3, 6, 6)
         else:
             painter.drawArc(int(x-15), int(y-12), 10, 24, 270*16, 180*16)
             painter.drawArc(int(x-10), int(y-12), 10, 24, 270*16, 180*16)
             painter.drawRect(x+0, y-12, 15, 24)
-        painter.setFont(QFont("Arial", 6, QFont.Bold))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(6, bold=True))
+        painter.setPen(_pen("#000000"))
         gate_label = comp_name.replace(" Gate", "").replace(" ", "")[:4]
         painter.drawText(x-8, y-4, 16, 8, Qt.AlignCenter, gate_label)
     
     def _draw_antenna(self, painter, x, y, selected):
         """Draw antenna symbol"""
-        color = QColor("#ff9800") if selected else QColor("#cc0000")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.drawLine(x-30, y, x-10, y)
-        painter.drawLine(x+10, y, x+30, y)
+        color = "#ff9800" if selected else "#cc0000"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_leads(painter, x, y, 10)
         painter.drawLine(x-5, y, x-5, y-15)
         painter.drawLine(x+0, y, x+0, y-20)
         painter.drawLine(x+5, y, x+5, y-15)
@@ -1685,10 +2348,9 @@ class CircuitCanvas(QWidget):
     
     def _draw_crystal(self, painter, x, y, selected):
         """Draw crystal oscillator symbol"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.drawLine(x-30, y, x-15, y)
-        painter.drawLine(x+15, y, x+30, y)
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_leads(painter, x, y)
         painter.drawRect(x-8, y-10, 4, 20)
         painter.drawRect(x+4, y-10, 4, 20)
         painter.drawLine(x-6, y-10, x+6, y-10)
@@ -1696,9 +2358,9 @@ class CircuitCanvas(QWidget):
     
     def _draw_display(self, painter, x, y, selected, comp_name):
         """Draw display symbol"""
-        color = QColor("#ff9800") if selected else QColor("#ffaa00")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#ffffcc")))
+        color = "#ff9800" if selected else "#ffaa00"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#ffffcc"))
         painter.drawRect(x-18, y-14, 36, 28)
         if "7-segment" in comp_name.lower():
             painter.drawLine(x-10, y-8, x+10, y-8)
@@ -1711,60 +2373,53 @@ class CircuitCanvas(QWidget):
     
     def _draw_solenoid(self, painter, x, y, selected):
         """Draw solenoid/electromagnet symbol"""
-        color = QColor("#ff9800") if selected else QColor("#0066cc")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.drawLine(x-30, y, x-15, y)
-        painter.drawLine(x+15, y, x+30, y)
+        color = "#ff9800" if selected else "#0066cc"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_leads(painter, x, y)
         for i in range(4):
             painter.drawEllipse(int(x-12+i*6), int(y-8), 6, 16)
     
     def _draw_speaker(self, painter, x, y, selected):
         """Draw speaker/buzzer symbol"""
-        color = QColor("#ff9800") if selected else QColor("#666666")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#cccccc")))
-        painter.drawLine(x-30, y, x-18, y)
-        painter.drawLine(x+18, y, x+30, y)
-        tri = QPolygon([QPoint(x-12, y-12), QPoint(x-12, y+12), QPoint(x, y)])
+        color = "#ff9800" if selected else "#666666"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#cccccc"))
+        self._draw_leads(painter, x, y, 18)
+        tri = _SPEAKER_CONE.translated(x, y)
         painter.drawPolygon(tri)
         painter.drawArc(int(x+2), int(y-16), 10, 10, 0, 90*16)
         painter.drawArc(int(x+2), int(y-22), 16, 16, 0, 90*16)
     
     def _draw_varistor(self, painter, x, y, selected):
         """Draw varistor/varactor symbol"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        points = [(x-25, y), (x-18, y-6), (x-12, y+6), (x-6, y-6), (x, y+6), (x+6, y-6), (x+12, y+6), (x+22, y)]
-        for i in range(len(points)-1):
-            painter.drawLine(points[i][0], points[i][1], points[i+1][0], points[i+1][1])
-        painter.drawLine(x-30, y, x-25, y)
-        painter.drawLine(x+22, y, x+30, y)
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_symbol_path(painter, _ZIGZAG_PATH, x, y)
         painter.drawLine(x+10, y+8, x+15, y+14)
         painter.drawLine(x+15, y+14, x+12, y+12)
         painter.drawLine(x+15, y+14, x+17, y+11)
     
     def _draw_jfet(self, painter, x, y, selected):
         """Draw JFET symbol"""
-        color = QColor("#ff9800") if selected else QColor("#0066cc")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#e3f2fd")))
+        color = "#ff9800" if selected else "#0066cc"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#e3f2fd"))
         painter.drawRect(x-5, y-12, 10, 24)
         painter.drawLine(x-10, y-6, x-5, y-6)
         painter.drawLine(x-10, y-6, x-12, y-8)
         painter.drawLine(x-10, y-6, x-12, y-4)
         painter.drawLine(x, y-16, x, y-20)
         painter.drawLine(x, y+16, x, y+20)
-        painter.setFont(QFont("Arial", 6))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(6))
+        painter.setPen(_pen("#000000"))
         painter.drawText(x+4, y-20, 10, 8, Qt.AlignLeft, "D")
         painter.drawText(x+4, y+18, 10, 8, Qt.AlignLeft, "S")
     
     def _draw_igbt(self, painter, x, y, selected):
         """Draw IGBT symbol"""
-        color = QColor("#ff9800") if selected else QColor("#0066cc")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.drawLine(x-30, y, x-15, y)
-        painter.drawLine(x+15, y, x+30, y)
+        color = "#ff9800" if selected else "#0066cc"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_leads(painter, x, y)
         painter.drawRect(x-5, y-12, 10, 24)
         painter.drawLine(x-8, y-8, x-5, y-8)
         painter.drawLine(x-8, y, x-5, y)
@@ -1772,46 +2427,44 @@ class CircuitCanvas(QWidget):
     
     def _draw_triac(self, painter, x, y, selected):
         """Draw TRIAC symbol"""
-        color = QColor("#ff9800") if selected else QColor("#cc6600")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.drawLine(x-30, y, x-12, y)
-        painter.drawLine(x+12, y, x+30, y)
+        color = "#ff9800" if selected else "#cc6600"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_leads(painter, x, y, 12)
         painter.drawRect(x-8, y-10, 8, 20)
         painter.drawRect(x, y-10, 8, 20)
         painter.drawLine(x-10, y+12, x-10, y+18)
     
     def _draw_comparator(self, painter, x, y, selected):
         """Draw comparator symbol"""
-        color = QColor("#ff9800") if selected else QColor("#0066cc")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#e3f2fd")))
-        tri = QPolygon([QPoint(x-15, y-14), QPoint(x-15, y+14), QPoint(x+15, y)])
+        color = "#ff9800" if selected else "#0066cc"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#e3f2fd"))
+        tri = _COMPARATOR_TRIANGLE.translated(x, y)
         painter.drawPolygon(tri)
         painter.drawLine(x-25, y-6, x-15, y-6)
         painter.drawLine(x-25, y+6, x-15, y+6)
         painter.drawLine(x+15, y, x+25, y)
-        painter.setFont(QFont("Arial", 6))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(6))
+        painter.setPen(_pen("#000000"))
         painter.drawText(x-20, y-10, 8, 6, Qt.AlignCenter, "+")
         painter.drawText(x-20, y+6, 8, 6, Qt.AlignCenter, "-")
     
     def _draw_generic_component(self, painter, x, y, name, selected):
         """Draw generic component"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1))
-        painter.setBrush(QBrush(QColor("#f9f9f9")))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1))
+        painter.setBrush(_brush("#f9f9f9"))
         painter.drawRoundedRect(x-22, y-16, 44, 32, 4, 4)
-        painter.setFont(QFont("Arial", 8))
-        painter.setPen(QPen(QColor("#000000")))
+        painter.setFont(_font(8))
+        painter.setPen(_pen("#000000"))
         painter.drawText(x-20, y-6, 40, 12, Qt.AlignCenter, name[:10])
     
     def _draw_led(self, painter, x, y, selected):
         """Draw LED symbol (diode with arrows)"""
-        color = QColor("#ff9800") if selected else QColor("#ff0000")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.drawLine(x-30, y, x-15, y)
-        painter.drawLine(x+15, y, x+30, y)
-        tri = QPolygon([QPoint(x-12, y-10), QPoint(x-12, y+10), QPoint(x+10, y)])
+        color = "#ff9800" if selected else "#ff0000"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_leads(painter, x, y)
+        tri = _DIODE_TRIANGLE.translated(x, y)
         painter.drawPolygon(tri)
         painter.drawLine(x+10, y-12, x+10, y+12)
         painter.drawLine(x+10, y-12, x+15, y-18)
@@ -1820,205 +2473,287 @@ class CircuitCanvas(QWidget):
     
     def _draw_variable_resistor(self, painter, x, y, selected):
         """Draw variable resistor symbol"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        points = [(x-25, y), (x-18, y-6), (x-12, y+6), (x-6, y-6), (x, y+6), (x+6, y-6), (x+12, y+6), (x+22, y)]
-        for i in range(len(points)-1):
-            painter.drawLine(points[i][0], points[i][1], points[i+1][0], points[i+1][1])
-        painter.drawLine(x-30, y, x-25, y)
-        painter.drawLine(x+22, y, x+30, y)
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_symbol_path(painter, _ZIGZAG_PATH, x, y)
         painter.drawLine(x+10, y-10, x+15, y-15)
     
     def _draw_potentiometer(self, painter, x, y, selected):
         """Draw potentiometer symbol"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        points = [(x-25, y), (x-18, y-6), (x-12, y+6), (x-6, y-6), (x, y+6), (x+6, y-6), (x+12, y+6), (x+22, y)]
-        for i in range(len(points)-1):
-            painter.drawLine(points[i][0], points[i][1], points[i+1][0], points[i+1][1])
-        painter.drawLine(x-30, y, x-25, y)
-        painter.drawLine(x+22, y, x+30, y)
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_symbol_path(painter, _ZIGZAG_PATH, x, y)
         painter.drawLine(x+0, y-10, x+5, y-15)
     
     def _draw_fuse(self, painter, x, y, selected):
         """Draw fuse symbol"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.drawLine(x-30, y, x-15, y)
-        painter.drawLine(x+15, y, x+30, y)
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_leads(painter, x, y)
         painter.drawRect(x-12, y-8, 24, 16)
         painter.drawLine(x-8, y-5, x+8, y+5)
     
     def _draw_circuit_breaker(self, painter, x, y, selected):
         """Draw circuit breaker symbol"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.drawLine(x-30, y, x-18, y)
-        painter.drawLine(x+18, y, x+30, y)
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_leads(painter, x, y, 18)
         painter.drawRect(x-14, y-10, 28, 20)
         painter.drawLine(x, y-10, x, y+10)
     
     def _draw_rectifier(self, painter, x, y, selected):
         """Draw rectifier symbol (bridge rectifier)"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         painter.drawRect(x-12, y-12, 24, 24)
         painter.drawLine(x-12, y, x+12, y)
         painter.drawLine(x, y-12, x, y+12)
     
     def _draw_filter(self, painter, x, y, selected):
         """Draw filter symbol"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.drawLine(x-30, y, x-15, y)
-        painter.drawLine(x+15, y, x+30, y)
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_leads(painter, x, y)
         painter.drawEllipse(x-14, y-10, 28, 20)
         painter.drawLine(x-8, y-6, x-8, y+6)
         painter.drawLine(x+8, y-6, x+8, y+6)
     
     def _draw_voltage_divider(self, painter, x, y, selected):
         """Draw voltage divider symbol"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.drawLine(x-30, y-8, x-15, y-8)
-        painter.drawLine(x-30, y+8, x-15, y+8)
-        painter.drawLine(x-15, y-8, x-15, y+8)
-        points = [(x-15, y-8), (x-8, y-3), (x-1, y-8), (x+6, y-3), (x+13, y-8), (x+15, y-8)]
-        for i in range(len(points)-1):
-            painter.drawLine(points[i][0], points[i][1], points[i+1][0], points[i+1][1])
-        painter.drawLine(x+15, y-8, x+30, y-8)
-        painter.drawLine(x+15, y+8, x+30, y+8)
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        self._draw_symbol_path(painter, _VOLTAGE_DIVIDER_PATH, x, y)
     
     def _draw_opamp(self, painter, x, y, selected):
         """Draw Op-Amp symbol (triangle)"""
-        color = QColor("#ff9800") if selected else QColor("#0066cc")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#e3f2fd")))
-        tri = QPolygon([QPoint(x-12, y-14), QPoint(x+12, y), QPoint(x-12, y+14)])
+        color = "#ff9800" if selected else "#0066cc"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#e3f2fd"))
+        tri = _OPAMP_TRIANGLE.translated(x, y)
         painter.drawPolygon(tri)
-        painter.setFont(QFont("Arial", 8))
-        painter.setPen(QPen(QColor("#0066cc")))
+        painter.setFont(_font(8))
+        painter.setPen(_pen("#0066cc"))
         painter.drawText(x-8, y-4, 16, 8, Qt.AlignCenter, "U")
     
     def _draw_multiplexer(self, painter, x, y, selected):
         """Draw Multiplexer (MUX) symbol"""
-        color = QColor("#ff9800") if selected else QColor("#0066cc")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#e3f2fd")))
+        color = "#ff9800" if selected else "#0066cc"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#e3f2fd"))
         # Draw trapezoid shape (wider at top, narrower at bottom)
-        mux = QPolygon([QPoint(x-16, y-12), QPoint(x+16, y-12), QPoint(x+8, y+12), QPoint(x-8, y+12)])
+        mux = _MUX_TRAPEZOID.translated(x, y)
         painter.drawPolygon(mux)
-        painter.setFont(QFont("Arial", 7, QFont.Bold))
-        painter.setPen(QPen(QColor("#0066cc")))
+        painter.setFont(_font(7, bold=True))
+        painter.setPen(_pen("#0066cc"))
         painter.drawText(x-10, y-5, 20, 10, Qt.AlignCenter, "MUX")
     
     def _draw_demultiplexer(self, painter, x, y, selected):
         """Draw Demultiplexer (DEMUX) symbol"""
-        color = QColor("#ff9800") if selected else QColor("#006600")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
-        painter.setBrush(QBrush(QColor("#e8f5e9")))
+        color = "#ff9800" if selected else "#006600"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
+        painter.setBrush(_brush("#e8f5e9"))
         # Draw trapezoid shape (narrower at top, wider at bottom)
-        demux = QPolygon([QPoint(x-8, y-12), QPoint(x+8, y-12), QPoint(x+16, y+12), QPoint(x-16, y+12)])
+        demux = _DEMUX_TRAPEZOID.translated(x, y)
         painter.drawPolygon(demux)
-        painter.setFont(QFont("Arial", 7, QFont.Bold))
-        painter.setPen(QPen(QColor("#006600")))
+        painter.setFont(_font(7, bold=True))
+        painter.setPen(_pen("#006600"))
         painter.drawText(x-14, y-5, 28, 10, Qt.AlignCenter, "DEMUX")
     
     def _draw_connector(self, painter, x, y, name, selected):
         """Draw connector/wire symbol"""
-        color = QColor("#ff9800") if selected else QColor("#333333")
-        painter.setPen(QPen(color, 2 if selected else 1.5))
+        color = "#ff9800" if selected else "#333333"
+        painter.setPen(_pen(color, 2 if selected else 1.5))
         painter.drawEllipse(x-14, y-6, 12, 12)
         painter.drawEllipse(x+2, y-6, 12, 12)
         painter.drawLine(x-8, y, x+8, y)
     
-    def _draw_wire(self, painter: QPainter, wire: Wire):
-        """Draw wire connection"""
-        if wire.from_node in self.nodes and wire.to_node in self.nodes:
-            n1 = self.nodes[wire.from_node]
-            n2 = self.nodes[wire.to_node]
-            painter.setPen(QPen(QColor("#000000"), self.wire_width))  # Black wire with adjustable width
-            painter.drawLine(int(n1.x), int(n1.y), int(n2.x), int(n2.y))
-    
-    def _draw_node(self, painter: QPainter, node: Node):
-        """Draw connection node with enhanced visibility"""
-        # Highlight node if it's the current wire start node
-        is_wire_start = hasattr(self, 'wire_mode_start_node') and node.node_id == self.wire_mode_start_node
-        
-        if is_wire_start:
-            # Highlight start node in yellow
-            painter.setPen(QPen(QColor("#ff9800"), 2))
-            painter.setBrush(QBrush(QColor("#ffff00")))
+    def _draw_wires(self, painter: QPainter, wire_ids):
+        """Draw wire connections with one pen setup and one batched call"""
+        wire_lines = self._wire_lines
+        lines = [wire_lines[wire_id] for wire_id in wire_ids if wire_id in wire_lines]
+        if lines:
+            painter.setPen(self._wire_pen)
+            painter.drawLines(lines)
+    
+    def _draw_nodes(self, painter: QPainter, node_ids):
+        """Draw connection nodes, sharing one pen/brush setup across all of them"""
+        nodes = self.nodes
+        start = self.wire_mode_start_node
+        
+        # Normal nodes in blue
+        painter.setPen(self._NODE_PEN)
+        painter.setBrush(self._NODE_BRUSH)
+        for node_id in node_ids:
+            if node_id != start:
+                node = nodes[node_id]
+                painter.drawEllipse(int(node.x - 4), int(node.y - 4), 8, 8)
+        
+        # Highlight the current wire start node in yellow, on top
+        if start in nodes:
+            node = nodes[start]
+            painter.setPen(self._HIGHLIGHT_PEN)
+            painter.setBrush(self._HIGHLIGHT_BRUSH)
             painter.drawEllipse(int(node.x - 6), int(node.y - 6), 12, 12)
-        else:
-            # Normal node in blue
-            painter.setPen(QPen(QColor("#000000"), 1))
-            painter.setBrush(QBrush(QColor("#0066cc")))
-            painter.drawEllipse(int(node.x - 4), int(node.y - 4), 8, 8)
 
     # ============== UNDO/REDO SYSTEM ==============
     
+    def _item_spec(self, key: Tuple[str, str]):
+        """Primitive spec of a history item as it is now, or _MISSING if it is gone"""
+        kind, item_id = key
+        if kind == "comp":
+            comp = self.components.get(item_id)
+            if comp is None:
+                return _MISSING
+            return comp.to_dict(), tuple(self._comp_to_nodes.get(item_id, ()))
+        if kind == "node":
+            node = self.nodes.get(item_id)
+            if node is None:
+                return _MISSING
+            return node.x, node.y, self.node_to_component.get(item_id)
+        wire = self.wires.get(item_id)
+        return _MISSING if wire is None else (wire.from_node, wire.to_node)
+    
+    def _track(self, kind: str, item_id: str):
+        """Record that an item was just added, changed or removed
+        
+        The open undo level keeps the spec the item had before its first
+        change, taken from _specs, which then moves on to the new spec.
+        """
+        key = (kind, item_id)
+        journal = self._journal
+        if journal is not None and key not in journal:
+            journal[key] = self._specs.get(key, _MISSING)
+        spec = self._item_spec(key)
+        if spec is _MISSING:
+            self._specs.pop(key, None)
+        else:
+            self._specs[key] = spec
+    
+    def _apply_level(self, level: Dict) -> Dict:
+        """Put every item of an undo level back to its spec; return the specs it replaced"""
+        replaced = {key: self._item_spec(key) for key in level}
+        
+        # Removals first, wires before the nodes and components they attach to
+        for kind in ("wire", "node", "comp"):
+            for (item_kind, item_id), spec in level.items():
+                if item_kind != kind or spec is not _MISSING:
+                    continue
+                if kind == "wire":
+                    wire = self.wires.pop(item_id, None)
+                    if wire is not None:
+                        for node_id in (wire.from_node, wire.to_node):
+                            self._node_to_wires.get(node_id, set()).discard(item_id)
+                    self._index_wire(item_id)
+                elif kind == "node":
+                    self.nodes.pop(item_id, None)
+                    self.node_to_component.pop(item_id, None)
+                    self._node_to_wires.pop(item_id, None)
+                    self._unindex_node(item_id)
+                else:
+                    self.components.pop(item_id, None)
+                    self._comp_to_nodes.pop(item_id, None)
+                    self._unindex_component(item_id)
+        
+        for kind in ("comp", "node", "wire"):
+            for (item_kind, item_id), spec in level.items():
+                if item_kind != kind or spec is _MISSING:
+                    continue
+                if kind == "comp":
+                    comp_spec, node_ids = spec
+                    self.components[item_id] = CanvasComponent.from_dict(comp_spec)
+                    self._comp_to_nodes[item_id] = list(node_ids)
+                    self._index_component(item_id)
+                elif kind == "node":
+                    x, y, comp_id = spec
+                    node = self.nodes.get(item_id)
+                    if node is None:
+                        self.nodes[item_id] = Node(x, y, item_id)
+                    else:
+                        node.x, node.y = x, y
+                    if comp_id is None:
+                        self.node_to_component.pop(item_id, None)
+                    else:
+                        self.node_to_component[item_id] = comp_id
+                    self._index_node(item_id)
+                else:
+                    old = self.wires.get(item_id)
+                    if old is not None:
+                        for node_id in (old.from_node, old.to_node):
+                            self._node_to_wires.get(node_id, set()).discard(item_id)
+                    from_node, to_node = spec
+                    self.wires[item_id] = Wire(from_node, to_node, item_id)
+                    self._node_to_wires.setdefault(from_node, set()).add(item_id)
+                    self._node_to_wires.setdefault(to_node, set()).add(item_id)
+                    self._index_wire(item_id)
+        return replaced
+    
     def save_state(self):
-        """Save current state to undo stack"""
-        state = {
-            "components": copy.deepcopy(self.components),
-            "wires": copy.deepcopy(self.wires),
-            "node_to_component": copy.deepcopy(self.node_to_component),
-        }
-        self.undo_stack.append(state)
+        """Start a new undo level; changes from here on are recorded into it"""
+        self._journal = {}
+        self.undo_stack.append(self._journal)
+        while len(self.undo_stack) > self.max_undo_levels:
+            self.undo_stack.popleft()
         self.redo_stack.clear()  # Clear redo when new action performed
         
-        # Limit undo levels to prevent memory issues
-        if len(self.undo_stack) > self.max_undo_levels:
-            self.undo_stack.pop(0)
-        
         self.undo_redo_changed.emit(len(self.undo_stack) > 0, len(self.redo_stack) > 0)
     
     def undo(self):
         """Undo last action"""
         if self.undo_stack:
-            # Save current state to redo
-            state = {
-                "components": copy.deepcopy(self.components),
-                "wires": copy.deepcopy(self.wires),
-                "node_to_component": copy.deepcopy(self.node_to_component),
-            }
-            self.redo_stack.append(state)
-            
-            # Restore from undo stack
-            prev_state = self.undo_stack.pop()
-            self.components = prev_state["components"]
-            self.wires = prev_state["wires"]
-            self.node_to_component = prev_state["node_to_component"]
-            self.selected_component = None
-            self.selected_components = []
-            
-            self.undo_redo_changed.emit(len(self.undo_stack) > 0, len(self.redo_stack) > 0)
-            self.circuit_changed.emit()
-            self.update()
+            # Items of the newest level go back; what they replace goes to redo
+            self._step_history(self.undo_stack, self.redo_stack)
     
     def redo(self):
         """Redo last undone action"""
         if self.redo_stack:
-            # Save current state to undo
-            state = {
-                "components": copy.deepcopy(self.components),
-                "wires": copy.deepcopy(self.wires),
-                "node_to_component": copy.deepcopy(self.node_to_component),
-            }
-            self.undo_stack.append(state)
-            
-            # Restore from redo stack
-            next_state = self.redo_stack.pop()
-            self.components = next_state["components"]
-            self.wires = next_state["wires"]
-            self.node_to_component = next_state["node_to_component"]
-            self.selected_component = None
-            self.selected_components = []
-            
-            self.undo_redo_changed.emit(len(self.undo_stack) > 0, len(self.redo_stack) > 0)
-            self.circuit_changed.emit()
-            self.update()
+            # Items of the undone level come back; what they replace goes to undo
+            self._step_history(self.redo_stack, self.undo_stack, self.max_undo_levels)
+    
+    def _step_history(self, source: Deque[Dict], dest: Deque[Dict], limit: Optional[int] = None):
+        """Apply the newest level of source, pushing its inverse onto dest"""
+        level = source.pop()
+        self._journal = None  # Only save_state() opens a level
+        
+        # Repaint what the level's items covered before and after, plus the
+        # selection highlight that stepping drops
+        dirty = self._history_area(level)
+        for comp_id in {*self.selected_components, self.selected_component}:
+            comp = self.components.get(comp_id)
+            if comp is not None:
+                comp.selected = False
+                dirty = dirty.united(self._component_paint_rect(comp))
+        self.selected_component = None
+        self.selected_components = []
+        
+        dest.append(self._apply_level(level))
+        if limit is not None:
+            while len(dest) > limit:
+                dest.popleft()
+        dirty = dirty.united(self._history_area(level))
+        
+        self.undo_redo_changed.emit(len(self.undo_stack) > 0, len(self.redo_stack) > 0)
+        self.circuit_changed.emit()
+        self.update(dirty)
+    
+    def _history_area(self, keys) -> QRect:
+        """Area the history items in keys currently paint, with attached wires"""
+        dirty = QRect()
+        for kind, item_id in keys:
+            if kind == "comp":
+                comp = self.components.get(item_id)
+                if comp is not None:
+                    dirty = dirty.united(self._component_paint_rect(comp))
+            elif kind == "node":
+                node = self.nodes.get(item_id)
+                if node is not None:
+                    dirty = dirty.united(QRect(int(node.x) - 7, int(node.y) - 7, 14, 14))
+                    for wire_id in self._node_to_wires.get(item_id, ()):
+                        dirty = dirty.united(self._wire_rect(self.wires[wire_id]))
+            else:
+                wire = self.wires.get(item_id)
+                if wire is not None:
+                    dirty = dirty.united(self._wire_rect(wire))
+        return dirty
     
     # ============== CLIPBOARD OPERATIONS ==============
     
@@ -2032,14 +2767,16 @@ class CircuitCanvas(QWidget):
     def copy(self, comp_id: str):
         """Copy component to clipboard"""
         if comp_id in self.components:
-            # Get component and its nodes
+            # Store primitive specs so later edits on the canvas can't alias the clipboard
             comp = self.components[comp_id]
-            comp_nodes = [nid for nid, cid in self.node_to_component.items() if cid == comp_id]
-            nodes_data = {nid: self.nodes[nid] for nid in comp_nodes if nid in self.nodes}
+            comp_nodes = self._comp_to_nodes.get(comp_id, [])
             
             self.clipboard = {
-                "components": [copy.deepcopy(comp)],
-                "nodes": [copy.deepcopy(n) for n in nodes_data.values()],
+                "components": [comp.to_dict()],
+                "nodes": [
+                    {"x": self.nodes[nid].x, "y": self.nodes[nid].y, "node_id": nid}
+                    for nid in comp_nodes if nid in self.nodes
+                ],
                 "wires": [],
             }
             self.clipboard_changed.emit(True)
@@ -2052,19 +2789,22 @@ class CircuitCanvas(QWidget):
         self.save_state()
         
         # Paste with offset to prevent exact overlap
-        for comp in self.clipboard["components"]:
+        dirty = QRect()
+        for spec in self.clipboard["components"]:
             new_comp_id = f"comp_{len(self.components)}"
-            new_comp = copy.deepcopy(comp)
+            new_comp = CanvasComponent.from_dict(spec)
             new_comp.comp_id = new_comp_id
             new_comp.x += offset_x
             new_comp.y += offset_y
-            new_comp.selected = False
             
             self.components[new_comp_id] = new_comp
+            self._index_component(new_comp_id)
             self._add_component_nodes(new_comp_id)
+            dirty = dirty.united(self._component_paint_rect(new_comp))
         
+        # One notification and one repaint for the whole batch
         self.circuit_changed.emit()
-        self.update()
+        self.update(dirty)
     
     def select_all(self):
         """Select all components on canvas"""
@@ -2075,12 +2815,15 @@ class CircuitCanvas(QWidget):
     
     def clear_selection(self):
         """Clear all selections"""
+        dirty = QRect()
         for comp_id in self.selected_components:
             if comp_id in self.components:
-                self.components[comp_id].selected = False
+                comp = self.components[comp_id]
+                comp.selected = False
+                dirty = dirty.united(self._component_paint_rect(comp))
         self.selected_component = None
         self.selected_components = []
-        self.update()
+        self.update(dirty)
     
     def duplicate_selected(self):
         """Duplicate selected component"""
@@ -2091,9 +2834,9 @@ class CircuitCanvas(QWidget):
     def _auto_fix_ground_components(self):
         """Auto-fix ground components that have wrong number of ports"""
         for comp_id, comp in self.components.items():
-            if "ground" in comp.name.lower():
+            if "ground" in comp._kind:
                 # Count current nodes for this component
-                current_node_count = sum(1 for nid, cid in self.node_to_component.items() if cid == comp_id)
+                current_node_count = len(self._comp_to_nodes.get(comp_id, ()))
                 
                 # Ground should have exactly 1 node
                 if current_node_count != 1:
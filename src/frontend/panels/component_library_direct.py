@@ -3,20 +3,77 @@ Backend-integrated component library panel
 Direct integration with backend services (no HTTP API)
 """
 
-from typing import Optional, Dict, List
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QTreeWidget, QTreeWidgetItem, QMessageBox
-from PySide6.QtCore import Qt, Signal, QMimeData, QTimer, QByteArray
+from typing import Callable, Optional, Dict, List, Set, Tuple
+from bisect import bisect_left
+from PySide6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLineEdit, QTreeWidget, QTreeWidgetItem, QMessageBox, QToolTip
+from PySide6.QtCore import Qt, Signal, QMimeData, QTimer, QByteArray, QEvent
 from PySide6.QtGui import QDrag
 import logging
+import re
 
 from frontend.backend_connector import get_backend_connector
 
 logger = logging.getLogger(__name__)
 
+# Separators between the words of a component name ("Op-Amp" -> "op", "amp")
+_WORD_SEPARATORS = re.compile(r"[\W_]+")
+
+# Static library used when the backend is unavailable: (category, id, name),
+# grouped by category in display order
+_FALLBACK_COMPONENTS = (
+    ("Passive Components", "resistor", "Resistor"),
+    ("Passive Components", "capacitor", "Capacitor"),
+    ("Passive Components", "inductor", "Inductor"),
+    ("Passive Components", "ground", "Ground"),
+    ("Power Sources", "dc_source", "DC Source"),
+    ("Power Sources", "ac_source", "AC Source"),
+    ("Power Sources", "battery", "Battery"),
+    ("Power Sources", "current_source", "Current Source"),
+    ("Semiconductors", "diode", "Diode"),
+    ("Semiconductors", "led", "LED"),
+    ("Semiconductors", "bjt", "BJT Transistor"),
+    ("Semiconductors", "mosfet", "MOSFET"),
+    ("Semiconductors", "scr", "SCR"),
+    ("Integrated Circuits", "opamp", "Op-Amp"),
+    ("Integrated Circuits", "timer_555", "555 Timer"),
+    ("Integrated Circuits", "comparator", "Comparator"),
+    ("Integrated Circuits", "multiplexer", "Multiplexer"),
+    ("Logic Gates", "and_gate", "AND Gate"),
+    ("Logic Gates", "or_gate", "OR Gate"),
+    ("Logic Gates", "not_gate", "NOT Gate"),
+    ("Logic Gates", "nand_gate", "NAND Gate"),
+    ("Measurement", "ammeter", "Ammeter"),
+    ("Measurement", "voltmeter", "Voltmeter"),
+    ("Measurement", "wattmeter", "Wattmeter"),
+    ("Test Equipment", "oscilloscope", "Oscilloscope"),
+    ("Test Equipment", "function_generator", "Function Generator"),
+    ("Test Equipment", "multimeter_digital", "Digital Multimeter"),
+    ("Test Equipment", "spectrum_analyzer", "Spectrum Analyzer"),
+    ("Test Equipment", "power_supply_bench", "Bench Power Supply"),
+    ("Test Equipment", "clamp_meter", "Clamp Meter"),
+    ("Test Equipment", "logic_analyzer", "Logic Analyzer"),
+    ("Test Equipment", "lcr_meter", "LCR Meter"),
+)
+
 
 class DraggableComponentTree(QTreeWidget):
     """Custom tree widget with proper drag-and-drop support for components"""
     
+    # Returns the tooltip for an item, or None; called only on hover
+    tooltip_provider: Optional[Callable[[QTreeWidgetItem], Optional[str]]] = None
+    
+    def viewportEvent(self, event):
+        """Resolve item tooltips when one is requested instead of storing them up front"""
+        if event.type() == QEvent.ToolTip and self.tooltip_provider is not None:
+            item = self.itemAt(event.pos())
+            tooltip = self.tooltip_provider(item) if item else None
+            if tooltip:
+                QToolTip.showText(event.globalPos(), tooltip, self.viewport())
+            else:
+                QToolTip.hideText()
+            return True
+        return super().viewportEvent(event)
+    
     def mousePressEvent(self, event):
         """Handle mouse press to start drag"""
         super().mousePressEvent(event)
@@ -33,7 +90,7 @@ class DraggableComponentTree(QTreeWidget):
         
         # Check if we've moved far enough to start drag
         distance = (event.position() - self.drag_start_position).manhattanLength()
-        if distance < 4:
+        if distance < QApplication.startDragDistance():
             return
         
         # Get the item under cursor
@@ -52,10 +109,10 @@ class DraggableComponentTree(QTreeWidget):
         if not comp_id or not comp_name:
             return
         
-        # Create mime data
+        # Create mime data from the payload encoded at load time
         mime = QMimeData()
-        mime.setData("component/type", comp_id.encode('utf-8'))
-        mime.setData("component/name", comp_name.encode('utf-8'))
+        mime.setData("component/type", item.data(0, Qt.UserRole + 3))
+        mime.setData("component/name", item.data(0, Qt.UserRole + 4))
         mime.setText(f"{comp_id}|{comp_name}")
         
         # Create drag
@@ -80,6 +137,10 @@ class BackendComponentLibraryPanel(QWidget):
     component_loaded = Signal(list)  # loaded components
     library_error = Signal(str)  # error message
     
+    _FILTER_DELAY_MS = 150  # Typing pause before the tree is filtered
+    _AUTO_EXPAND_LIMIT = 10  # Search results up to this size are shown expanded
+    _MIN_SUBSTRING_QUERY = 3  # Shorter queries only match the start of a word
+    
     def __init__(self):
         super().__init__()
         
@@ -91,6 +152,17 @@ class BackendComponentLibraryPanel(QWidget):
         
         self.component_cache: Dict[str, Dict] = {}
         self.category_items: Dict[str, QTreeWidgetItem] = {}
+        # (lowercased name, item, category name) per component, in tree order
+        self._search_index: List[Tuple[str, QTreeWidgetItem, str]] = []
+        self._word_index: List[Tuple[str, int]] = []  # Sorted (word, row) pairs for prefix search
+        self._shown_rows: Set[int] = set()  # Rows of _search_index currently not hidden
+        self._filter_text = ""  # Lowercased text the tree is currently filtered by
+        
+        # Keystrokes restart this timer; the tree is filtered once typing pauses
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(self._FILTER_DELAY_MS)
+        self._filter_timer.timeout.connect(self._apply_search)
         
         # Setup UI
         layout = QVBoxLayout()
@@ -111,12 +183,18 @@ class BackendComponentLibraryPanel(QWidget):
                 font-weight: bold;
             }
         """)
-        self.search_box.textChanged.connect(self._filter_components)
+        self.search_box.textChanged.connect(lambda _text: self._filter_timer.start())
         layout.addWidget(self.search_box)
         
         # Component tree (use custom draggable tree)
         self.tree = DraggableComponentTree()
         self.tree.setHeaderHidden(True)
+        # Every row has the same height (see the stylesheet), so the view can
+        # size rows without asking each one; expanding is instant
+        self.tree.setUniformRowHeights(True)
+        self.tree.setAnimated(False)
+        self.tree.setItemsExpandable(True)
+        self.tree.setExpandsOnDoubleClick(False)  # Double-click places a component
         self.tree.setStyleSheet("""
             QTreeWidget {
                 border: 1px solid #ddd;
@@ -135,6 +213,7 @@ class BackendComponentLibraryPanel(QWidget):
             }
         """)
         self.tree.itemDoubleClicked.connect(self._on_item_double_clicked)
+        self.tree.tooltip_provider = self._component_tooltip
         layout.addWidget(self.tree)
         
         # Register for library change notifications
@@ -162,8 +241,14 @@ class BackendComponentLibraryPanel(QWidget):
                 self._populate_fallback_components()
                 return
             
+            # Lay the tree out once after the bulk insert, not per item; an
+            # error below falls back to _populate_fallback_components, which
+            # re-enables updates itself
+            self.tree.setUpdatesEnabled(False)
             self.tree.clear()
             self.category_items.clear()
+            self._filter_text = ""
+            self._search_index.clear()
             self.component_cache.clear()
             
             total_components = 0
@@ -187,21 +272,22 @@ class BackendComponentLibraryPanel(QWidget):
                                 comp_item.setData(0, Qt.UserRole, "component")
                                 comp_item.setData(0, Qt.UserRole + 1, comp_id)
                                 comp_item.setData(0, Qt.UserRole + 2, comp_name)
+                                comp_item.setData(0, Qt.UserRole + 3, QByteArray(comp_id.encode('utf-8')))
+                                comp_item.setData(0, Qt.UserRole + 4, QByteArray(comp_name.encode('utf-8')))
                                 
-                                # Cache component
+                                # Cache component; its tooltip is looked up on hover
                                 self.component_cache[comp_id] = comp
                                 
-                                # Add tooltip
-                                description = comp.get('description', f'Component: {comp_name}')
-                                comp_item.setToolTip(0, description)
-                                
                                 cat_item.addChild(comp_item)
+                                self._search_index.append((comp_name.lower(), comp_item, category_name))
                                 total_components += 1
                 
                 except Exception as e:
                     logger.error(f"Error loading category {category_name}: {e}")
             
+            self._build_word_index()
             self.tree.expandAll()
+            self.tree.setUpdatesEnabled(True)
             logger.info(f"✓ Loaded {total_components} components from backend")
             self.component_loaded.emit(list(self.component_cache.values()))
         
@@ -214,70 +300,31 @@ class BackendComponentLibraryPanel(QWidget):
         """Fallback component library (static list)"""
         logger.info("Loading fallback component library...")
         
-        components_by_category = {
-            "Passive Components": [
-                ("resistor", "Resistor"),
-                ("capacitor", "Capacitor"),
-                ("inductor", "Inductor"),
-                ("ground", "Ground"),
-            ],
-            "Power Sources": [
-                ("dc_source", "DC Source"),
-                ("ac_source", "AC Source"),
-                ("battery", "Battery"),
-                ("current_source", "Current Source"),
-            ],
-            "Semiconductors": [
-                ("diode", "Diode"),
-                ("led", "LED"),
-                ("bjt", "BJT Transistor"),
-                ("mosfet", "MOSFET"),
-                ("scr", "SCR"),
-            ],
-            "Integrated Circuits": [
-                ("opamp", "Op-Amp"),
-                ("timer_555", "555 Timer"),
-                ("comparator", "Comparator"),
-                ("multiplexer", "Multiplexer"),
-            ],
-            "Logic Gates": [
-                ("and_gate", "AND Gate"),
-                ("or_gate", "OR Gate"),
-                ("not_gate", "NOT Gate"),
-                ("nand_gate", "NAND Gate"),
-            ],
-            "Measurement": [
-                ("ammeter", "Ammeter"),
-                ("voltmeter", "Voltmeter"),
-                ("wattmeter", "Wattmeter"),
-            ],
-            "Test Equipment": [
-                ("oscilloscope", "Oscilloscope"),
-                ("function_generator", "Function Generator"),
-                ("multimeter_digital", "Digital Multimeter"),
-                ("spectrum_analyzer", "Spectrum Analyzer"),
-                ("power_supply_bench", "Bench Power Supply"),
-                ("clamp_meter", "Clamp Meter"),
-                ("logic_analyzer", "Logic Analyzer"),
-                ("lcr_meter", "LCR Meter"),
-            ],
-        }
-        
-        self.tree.clear()
-        self.category_items.clear()
-        
-        for category, items in components_by_category.items():
-            cat_item = QTreeWidgetItem([category])
-            cat_item.setData(0, Qt.UserRole, "category")
-            self.tree.addTopLevelItem(cat_item)
-            self.category_items[category] = cat_item
+        self.tree.setUpdatesEnabled(False)  # One layout after the bulk insert
+        try:
+            self.tree.clear()
+            self.category_items.clear()
+            self._filter_text = ""
+            self._search_index.clear()
             
-            for comp_id, comp_name in items:
+            prev_category = None
+            for category, comp_id, comp_name in _FALLBACK_COMPONENTS:
+                # Entries are grouped, so a new category starts a new top-level item
+                if category != prev_category:
+                    cat_item = QTreeWidgetItem([category])
+                    cat_item.setData(0, Qt.UserRole, "category")
+                    self.tree.addTopLevelItem(cat_item)
+                    self.category_items[category] = cat_item
+                    prev_category = category
+                
                 comp_item = QTreeWidgetItem([comp_name])
                 comp_item.setData(0, Qt.UserRole, "component")
                 comp_item.setData(0, Qt.UserRole + 1, comp_id)
                 comp_item.setData(0, Qt.UserRole + 2, comp_name)
+                comp_item.setData(0, Qt.UserRole + 3, QByteArray(comp_id.encode('utf-8')))
+                comp_item.setData(0, Qt.UserRole + 4, QByteArray(comp_name.encode('utf-8')))
                 cat_item.addChild(comp_item)
+                self._search_index.append((comp_name.lower(), comp_item, category))
                 
                 # Cache for compatibility
                 self.component_cache[comp_id] = {
@@ -285,29 +332,87 @@ class BackendComponentLibraryPanel(QWidget):
                     'name': comp_name,
                     'category': category
                 }
-        
-        self.tree.expandAll()
+            
+            self._build_word_index()
+            self.tree.expandAll()
+        finally:
+            self.tree.setUpdatesEnabled(True)
         logger.info("✓ Fallback library loaded")
     
+    def _apply_search(self):
+        """Filter the tree by the search box text once typing has paused"""
+        self._filter_components(self.search_box.text())
+    
+    def _build_word_index(self):
+        """Index every word of every component name for prefix lookups"""
+        self._word_index = sorted(
+            (word, row)
+            for row, (name, _, _) in enumerate(self._search_index)
+            for word in _WORD_SEPARATORS.split(name) if word
+        )
+        self._shown_rows = set(range(len(self._search_index)))
+    
+    def _matching_rows(self, text_lower: str) -> Set[int]:
+        """Rows of _search_index whose name matches a non-empty lowercased query"""
+        if len(text_lower) >= self._MIN_SUBSTRING_QUERY or _WORD_SEPARATORS.search(text_lower):
+            # Longer queries match anywhere in the name
+            return {row for row, (name, _, _) in enumerate(self._search_index) if text_lower in name}
+        
+        # Short queries match the start of a word; the words sharing a prefix
+        # are adjacent in the sorted index, so bisect to the first one
+        words = self._word_index
+        rows = set()
+        i = bisect_left(words, (text_lower,))
+        while i < len(words) and words[i][0].startswith(text_lower):
+            rows.add(words[i][1])
+            i += 1
+        return rows
+    
     def _filter_components(self, text: str):
         """Filter components based on search text"""
         text_lower = text.lower()
+        if text_lower == self._filter_text:
+            return
+        self._filter_text = text_lower
+        
+        index = self._search_index
+        rows = self._matching_rows(text_lower) if text_lower else set(range(len(index)))
         
-        for cat_name, cat_item in self.category_items.items():
-            any_child_visible = False
+        # Hide/show everything first and lay the tree out once afterwards
+        self.tree.setUpdatesEnabled(False)
+        try:
+            if text_lower:
+                # Filter a collapsed tree so Qt does not re-lay out expanded
+                # branches; only small result sets are expanded again
+                self.tree.collapseAll()
             
-            for i in range(cat_item.childCount()):
-                child = cat_item.child(i)
-                child_name = child.text(0).lower()
-                
-                # Match by name
-                matches = text_lower in child_name
-                child.setHidden(not matches)
-                
-                if matches:
-                    any_child_visible = True
+            # Only rows whose visibility changes are touched
+            for row in self._shown_rows - rows:
+                index[row][1].setHidden(True)
+            for row in rows - self._shown_rows:
+                index[row][1].setHidden(False)
+            self._shown_rows = rows
+            
+            matched_categories = {index[row][2] for row in rows}
+            expand = bool(text_lower) and len(rows) <= self._AUTO_EXPAND_LIMIT
+            for cat_name, cat_item in self.category_items.items():
+                any_child_visible = cat_name in matched_categories or not text_lower
+                cat_item.setHidden(not any_child_visible)
+                if any_child_visible and expand:
+                    self.tree.expandItem(cat_item)
             
-            cat_item.setHidden(not any_child_visible)
+            if not text_lower:
+                self.tree.expandAll()
+        finally:
+            self.tree.setUpdatesEnabled(True)
+    
+    def _component_tooltip(self, item: QTreeWidgetItem) -> Optional[str]:
+        """Description shown when hovering a component row"""
+        if item.data(0, Qt.UserRole) != "component":
+            return None
+        comp_name = item.data(0, Qt.UserRole + 2)
+        comp = self.component_cache.get(item.data(0, Qt.UserRole + 1), {})
+        return comp.get('description', f'Component: {comp_name}')
     
     def _on_item_double_clicked(self, item: QTreeWidgetItem, column: int):
         """Handle double-click on component item"""
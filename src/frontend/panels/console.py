@@ -2,14 +2,16 @@
 Console Panel - log viewer with filtering, export, and simulation tracking
 """
 from enum import Enum
+from collections import deque
 from datetime import datetime
-from typing import List
+from typing import Deque, Optional
+import re
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, 
     QComboBox, QPushButton, QLabel, QFileDialog, QProgressBar
 )
-from PySide6.QtCore import Qt, Signal
-from PySide6.QtGui import QColor, QFont, QIcon
+from PySide6.QtCore import Qt, Signal, QTimer
+from PySide6.QtGui import QBrush, QColor, QFont, QIcon
 
 
 class LogLevel(Enum):
@@ -23,6 +25,37 @@ class LogLevel(Enum):
     SIM_PROGRESS = "SIM_PROG" # Simulation progress
 
 
+_MAX_MESSAGES = 10000  # History and list rows kept; older messages are dropped
+_VIEW_REFRESH_MS = 50  # Scroll/progress updates are applied at most this often
+_EXPORT_BUFFER = 1 << 20  # Write buffer for log exports
+
+# Percentage in a progress message ("Step 3: 45%", "45.5 %"); fraction ignored
+_PROGRESS_RE = re.compile(r"(\d+)(?:\.\d*)?\s*%")
+
+# Text brush for log levels - enhanced with simulation colors; built once and
+# shared, since setForeground() takes a QBrush
+_LEVEL_BRUSHES = {
+    LogLevel.DEBUG: QBrush(QColor("#808080")),
+    LogLevel.INFO: QBrush(QColor("#000000")),
+    LogLevel.WARNING: QBrush(QColor("#ff8800")),
+    LogLevel.ERROR: QBrush(QColor("#ff0000")),
+    LogLevel.SIM_START: QBrush(QColor("#2e7d32")),   # Green - simulation started
+    LogLevel.SIM_END: QBrush(QColor("#1565c0")),     # Blue - simulation ended
+    LogLevel.SIM_PROGRESS: QBrush(QColor("#0097a7")), # Cyan - progress update
+}
+
+# Icon shown in front of each message, by level
+_ICON_MAP = {
+    LogLevel.DEBUG: "🔧",
+    LogLevel.INFO: "ℹ",
+    LogLevel.WARNING: "⚠",
+    LogLevel.ERROR: "✕",
+    LogLevel.SIM_START: "▶",
+    LogLevel.SIM_END: "✓",
+    LogLevel.SIM_PROGRESS: "→",
+}
+
+
 class ConsolePanel(QWidget):
     """Console for displaying simulation logs and messages with export"""
     
@@ -77,35 +110,38 @@ class ConsolePanel(QWidget):
         self.log_list.setFont(QFont("Courier", 9))
         layout.addWidget(self.log_list)
         
-        # Color map for log levels - enhanced with simulation colors
-        self.colors = {
-            LogLevel.DEBUG: QColor("#808080"),
-            LogLevel.INFO: QColor("#000000"),
-            LogLevel.WARNING: QColor("#ff8800"),
-            LogLevel.ERROR: QColor("#ff0000"),
-            LogLevel.SIM_START: QColor("#2e7d32"),   # Green - simulation started
-            LogLevel.SIM_END: QColor("#1565c0"),     # Blue - simulation ended
-            LogLevel.SIM_PROGRESS: QColor("#0097a7"), # Cyan - progress update
-        }
-        
         # Store all messages with timestamps
-        self.all_messages: List[tuple] = []  # (timestamp, message, level)
+        # (timestamp, message, level, display_text), newest last
+        self.all_messages: Deque[tuple] = deque(maxlen=_MAX_MESSAGES)
         self.current_filter = "All"
         self.is_simulating = False
         
+        # Message bursts only record what to show; scrolling to the newest row
+        # and the progress value are applied together once per interval
+        self._pending_progress: Optional[int] = None
+        self._view_timer = QTimer(self)
+        self._view_timer.setSingleShot(True)
+        self._view_timer.setInterval(_VIEW_REFRESH_MS)
+        self._view_timer.timeout.connect(self._flush_view_update)
+        
         # Connect signal
         self.log_message.connect(self.log)
     
     def log(self, message: str, level: LogLevel = LogLevel.INFO):
         """Log a message"""
         timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]  # Include milliseconds
-        self.all_messages.append((timestamp, message, level))
+        # Format message with icons for different levels, once; filter
+        # changes reuse the stored text
+        icon = _ICON_MAP.get(level, "•")
+        display_text = f"[{timestamp}] {icon} [{level.value}] {message}"
+        self.all_messages.append((timestamp, message, level, display_text))
         
         # Update simulation status
         if level == LogLevel.SIM_START:
             self.is_simulating = True
             self.status_label.setText("Status: ▶ Simulating...")
             self.status_label.setStyleSheet("color: #f57c00; font-weight: bold;")
+            self._pending_progress = None
             self.progress_bar.setValue(0)
             self.progress_bar.setVisible(True)
         elif level == LogLevel.SIM_END:
@@ -114,33 +150,32 @@ class ConsolePanel(QWidget):
             self.status_label.setStyleSheet("color: #2e7d32; font-weight: bold;")
             self.progress_bar.setVisible(False)
         elif level == LogLevel.SIM_PROGRESS and self.is_simulating:
-            # Try to extract progress percentage from message
-            try:
-                if "%" in message:
-                    progress = int(''.join(filter(str.isdigit, message.split("%")[0].split()[-1])))
-                    self.progress_bar.setValue(min(progress, 100))
-            except:
-                pass
+            # Extract progress percentage from message, if any
+            match = _PROGRESS_RE.search(message)
+            if match:
+                self._pending_progress = min(int(match.group(1)), 100)
+                self._request_view_update()
         
         if self._should_show(level):
-            # Format message with icons for different levels
-            icon_map = {
-                LogLevel.DEBUG: "🔧",
-                LogLevel.INFO: "ℹ",
-                LogLevel.WARNING: "⚠",
-                LogLevel.ERROR: "✕",
-                LogLevel.SIM_START: "▶",
-                LogLevel.SIM_END: "✓",
-                LogLevel.SIM_PROGRESS: "→",
-            }
-            icon = icon_map.get(level, "•")
-            display_text = f"[{timestamp}] {icon} [{level.value}] {message}"
-            
             item = QListWidgetItem(display_text)
-            item.setForeground(self.colors[level])
+            item.setForeground(_LEVEL_BRUSHES[level])
             item.setData(Qt.UserRole, (timestamp, message, level))
             self.log_list.addItem(item)
-            self.log_list.scrollToBottom()
+            if self.log_list.count() > _MAX_MESSAGES:
+                self.log_list.takeItem(0)
+            self._request_view_update()
+    
+    def _request_view_update(self):
+        """Queue a scroll to the newest row and progress update for the next refresh"""
+        if not self._view_timer.isActive():
+            self._view_timer.start()
+    
+    def _flush_view_update(self):
+        """Apply the queued progress value and scroll to the newest row"""
+        if self._pending_progress is not None:
+            self.progress_bar.setValue(self._pending_progress)
+            self._pending_progress = None
+        self.log_list.scrollToBottom()
     
     def _should_show(self, level: LogLevel) -> bool:
         """Check if message should be shown based on current filter"""
@@ -153,25 +188,17 @@ class ConsolePanel(QWidget):
         self.current_filter = filter_text
         self.log_list.clear()
         
-        # Icon map for different levels
-        icon_map = {
-            LogLevel.DEBUG: "🔧",
-            LogLevel.INFO: "ℹ",
-            LogLevel.WARNING: "⚠",
-            LogLevel.ERROR: "✕",
-            LogLevel.SIM_START: "▶",
-            LogLevel.SIM_END: "✓",
-            LogLevel.SIM_PROGRESS: "→",
-        }
-        
-        for timestamp, message, level in self.all_messages:
-            if self._should_show(level):
-                icon = icon_map.get(level, "•")
-                display_text = f"[{timestamp}] {icon} [{level.value}] {message}"
-                item = QListWidgetItem(display_text)
-                item.setForeground(self.colors[level])
-                item.setData(Qt.UserRole, (timestamp, message, level))
-                self.log_list.addItem(item)
+        # Refill without a relayout per added row
+        self.log_list.setUpdatesEnabled(False)
+        try:
+            for timestamp, message, level, display_text in self.all_messages:
+                if self._should_show(level):
+                    item = QListWidgetItem(display_text)
+                    item.setForeground(_LEVEL_BRUSHES[level])
+                    item.setData(Qt.UserRole, (timestamp, message, level))
+                    self.log_list.addItem(item)
+        finally:
+            self.log_list.setUpdatesEnabled(True)
     
     def _clear_console(self):
         """Clear console"""
@@ -202,33 +229,39 @@ class ConsolePanel(QWidget):
     
     def _export_text(self, filename: str):
         """Export logs as plain text"""
-        with open(filename, 'w') as f:
-            for timestamp, message, level in self.all_messages:
-                f.write(f"[{timestamp}] [{level.value}] {message}\n")
+        with open(filename, 'w', buffering=_EXPORT_BUFFER) as f:
+            f.writelines(
+                f"[{timestamp}] [{level.value}] {message}\n"
+                for timestamp, message, level, _ in self.all_messages
+            )
     
     def _export_csv(self, filename: str):
         """Export logs as CSV"""
         import csv
         
-        with open(filename, 'w', newline='') as f:
+        with open(filename, 'w', newline='', buffering=_EXPORT_BUFFER) as f:
             writer = csv.writer(f)
             writer.writerow(['Timestamp', 'Level', 'Message'])
-            
-            for timestamp, message, level in self.all_messages:
-                writer.writerow([timestamp, level.value, message])
+            writer.writerows(
+                (timestamp, level.value, message)
+                for timestamp, message, level, _ in self.all_messages
+            )
     
     def _export_json(self, filename: str):
         """Export logs as JSON"""
         import json
         
-        data = [
-            {
-                'timestamp': timestamp,
-                'level': level.value,
-                'message': message
-            }
-            for timestamp, message, level in self.all_messages
-        ]
-        
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Stream one entry at a time instead of building the whole list;
+        # the output matches json.dump(entries, f, indent=2)
+        with open(filename, 'w', buffering=_EXPORT_BUFFER) as f:
+            f.write("[")
+            separator = "\n  "
+            for timestamp, message, level, _ in self.all_messages:
+                entry = json.dumps({
+                    'timestamp': timestamp,
+                    'level': level.value,
+                    'message': message
+                }, indent=2)
+                f.write(separator + entry.replace("\n", "\n  "))
+                separator = ",\n  "
+            f.write("]" if not self.all_messages else "\n]")
@@ -1182,6 +1182,7 @@ class MainWindow(QMainWindow):
             if not hasattr(component, "properties"):
                 component.properties = {}
             component.properties[property_name] = value
+            self.circuit_canvas._track("comp", comp_id)
             
             self.circuit_canvas.circuit_changed.emit()
             self.console.log(f"Property changed: {comp_id} -> {property_name} = {value}", LogLevel.INFO)
@@ -1206,8 +1207,7 @@ class MainWindow(QMainWindow):
             # Check for isolated components
             isolated = []
             for comp_id, comp in self.circuit_canvas.components.items():
-                nodes = sum(1 for nid, cid in self.circuit_canvas.node_to_component.items() if cid == comp_id)
-                if nodes == 0:
+                if not self.circuit_canvas.get_component_nodes(comp_id):
                     isolated.append(comp.name)
             if isolated:
                 self.console.log(f"⚠ Isolated components: {', '.join(isolated)}", LogLevel.WARNING)
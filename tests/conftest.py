@@ -0,0 +1,13 @@
+"""Shared fixtures for the test suite"""
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """The running QApplication, created offscreen on first use"""
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,702 @@
+"""Test suite for circuit canvas data structures"""
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import json
+
+import numpy as np
+import pytest
+from PySide6.QtCore import QPoint, QRect, Qt
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication
+from frontend.panels import _canvas_kernels as kernels
+from frontend.panels import circuit_canvas
+from frontend.panels.circuit_canvas import CanvasComponent, CanvasMode, CircuitCanvas, Node
+
+
+@pytest.fixture
+def canvas(qapp):
+    """Canvas widget with a running QApplication"""
+    widget = CircuitCanvas()
+    widget.resize(800, 600)
+    yield widget
+    widget.deleteLater()
+
+
+class TestCanvasComponent:
+    """Test canvas component model"""
+
+    def test_spec_round_trip(self):
+        """Test that to_dict/from_dict rebuild an equal, independent component"""
+        comp = CanvasComponent(
+            x=100, y=80, comp_id="comp_0", comp_type="Passive", name="Resistor",
+            params={"resistance": 1000}, rotation=90,
+        )
+
+        spec = comp.to_dict()
+        clone = CanvasComponent.from_dict(spec)
+
+        assert clone == comp
+        assert clone.params is not comp.params
+        assert all(isinstance(v, (str, int, float, dict, type(None))) for v in spec.values())
+
+    def test_spec_keeps_base_size_after_resize(self):
+        """Test that a resized component rebuilds with its original base size"""
+        comp = CanvasComponent(x=0, y=0, comp_id="comp_0", comp_type="Passive", name="Resistor")
+        comp.width, comp.height = 90, 60
+
+        clone = CanvasComponent.from_dict(comp.to_dict())
+
+        assert (clone.base_width, clone.base_height) == (60, 40)
+        assert (clone.width, clone.height) == (90, 60)
+
+    def test_ports_follow_position_and_rotation(self):
+        """Test that cached port offsets track moves, rotation and resizing"""
+        comp = CanvasComponent(x=100, y=50, comp_id="comp_0", comp_type="Passive", name="Resistor")
+        assert comp.get_ports() == [(70, 50), (130, 50)]
+
+        comp.x = 200
+        assert comp.get_ports() == [(170, 50), (230, 50)]
+
+        comp.rotation = 90
+        assert comp.get_ports() == [(200, 20), (200, 80)]
+
+        comp.rotation = 0
+        comp.width = 100
+        assert comp.get_ports() == [(150, 50), (250, 50)]
+
+    def test_port_layout_resolved_from_type(self):
+        """Test that the port layout is chosen by component type and name"""
+        ground = CanvasComponent(x=0, y=0, comp_id="g", comp_type="Ground", name="GND")
+        bjt = CanvasComponent(x=0, y=0, comp_id="q", comp_type="Active", name="NPN BJT",
+                              width=60, height=60, rotation=180)
+
+        assert ground.get_ports() == [(0, 20)]
+        assert bjt.get_ports() == [(0, 20), (-25, 0), (0, -20)]
+
+    def test_symbol_drawer_resolved_from_name(self):
+        """Test that the symbol drawer keeps the name matching order and aliases"""
+        def symbol(name):
+            return CanvasComponent(x=0, y=0, comp_id="c", comp_type="Passive", name=name)._symbol
+
+        assert symbol("Resistor") == ("_draw_resistor", "scaled")
+        assert symbol("Zener Diode") == ("_draw_diode", "scaled")
+        assert symbol("Stepper") == ("_draw_motor", "scaled")
+        assert symbol("AC Motor") == ("_draw_motor", "scaled")
+        assert symbol("Thermistor") == ("_draw_resistor", "scaled")
+        assert symbol("NAND Gate") == ("_draw_logic_gate", "named")
+        assert symbol("Widget") == ("_draw_generic_component", "name_first")
+        assert symbol("TRIAC (Triode for AC)") == ("_draw_triac", "plain")
+        assert symbol("Function Generator") == ("_draw_function_generator", "plain")
+        for _, method, _ in circuit_canvas._SYMBOL_RULES:
+            assert callable(getattr(CircuitCanvas, method))
+
+    def test_kind_is_lowercased_once(self):
+        """Test that the lowercased name is cached and excluded from equality"""
+        comp = CanvasComponent(x=0, y=0, comp_id="g", comp_type="Ground", name="Earth GROUND")
+
+        assert comp._kind == "earth ground"
+        assert "_kind" not in comp.to_dict()
+        assert CanvasComponent.from_dict(comp.to_dict()) == comp
+
+    def test_shadowed_symbol_rule_is_rejected(self):
+        """Test that a rule hidden behind an earlier, shorter pattern fails validation"""
+        rules = (
+            (("resistor",), "_draw_resistor", "scaled"),
+            (("variable resistor",), "_draw_variable_resistor", "plain"),
+        )
+
+        with pytest.raises(ValueError, match="variable resistor"):
+            circuit_canvas._check_symbol_rules(rules)
+        circuit_canvas._check_symbol_rules(rules[::-1])
+
+
+class TestLibraryProperties:
+    """Test cached library property lookup"""
+
+    def test_library_parsed_once_and_copied(self, canvas, tmp_path, monkeypatch):
+        """Test that a library file is read once and lookups return independent copies"""
+        lib = {"components": [
+            {"id": "generic", "name": "Generic", "properties": {"tolerance": 5}},
+            {"id": "r1", "name": "Precision", "properties": {"tolerance": 1}},
+        ]}
+        (tmp_path / "resistors.json").write_text(json.dumps(lib))
+        monkeypatch.setattr(circuit_canvas, "_LIBRARY_DIR", tmp_path)
+        circuit_canvas._load_library_index.cache_clear()
+
+        props = canvas._load_library_properties("Resistor", "precision")
+        props["tolerance"] = 10
+        (tmp_path / "resistors.json").unlink()
+
+        assert canvas._load_library_properties("Resistor", "Precision") == {"tolerance": 1}
+        assert canvas._load_library_properties("Resistor", "missing") == {}
+        circuit_canvas._load_library_index.cache_clear()
+
+
+class TestCanvasHitTesting:
+    """Test node/component lookup by position"""
+
+    def test_component_lookup_follows_moves(self, canvas):
+        """Test that hit testing tracks a component and its nodes after a move"""
+        comp_id = canvas.add_component("Passive", "Resistor", 100, 100)
+        canvas.move_component(comp_id, 200, 0)
+        comp = canvas.components[comp_id]
+
+        assert canvas.get_component_at(100, 100) is None
+        assert canvas.get_component_at(comp.x + 5, comp.y - 5) == comp_id
+
+        node_ids = canvas._comp_to_nodes[comp_id]
+        for (px, py), node_id in zip(comp.get_ports(), node_ids):
+            assert canvas._node_belongs_to_component(node_id, comp_id)
+            assert canvas.get_node_at(px, py) == node_id
+
+    def test_overlapping_components_resolve_to_earliest(self, canvas):
+        """Test that overlapping hits return the first placed component"""
+        first = canvas.add_component("Passive", "Resistor", 100, 100)
+        canvas.add_component("Passive", "Resistor", 120, 100)
+
+        assert canvas.get_component_at(110, 100) == first
+
+    def test_node_lookup(self, canvas):
+        """Test that the nearest node within tolerance is found"""
+        comp_id = canvas.add_component("Passive", "Resistor", 100, 100)
+        node_ids = [nid for nid, cid in canvas.node_to_component.items() if cid == comp_id]
+        comp = canvas.components[comp_id]
+
+        for (px, py), node_id in zip(comp.get_ports(), node_ids):
+            assert canvas.get_node_at(px + 2, py - 3) == node_id
+        assert canvas.get_node_at(100, 300) is None
+
+    def test_node_squared_distance(self):
+        """Test that distance_to wraps the squared distance"""
+        node = Node(3, 4, "node_0")
+
+        assert node.distance_sq_to(0, 0) == 25
+        assert node.distance_to(0, 0) == 5
+
+    def test_component_nodes_in_port_order(self, canvas):
+        """Test that a component's nodes are listed in port order and survive undo"""
+        comp_id = canvas.add_component("Passive", "Resistor", 100, 100)
+        node_ids = canvas.get_component_nodes(comp_id)
+        canvas.save_state()
+        canvas._on_delete(comp_id)
+
+        canvas.undo()
+
+        ports = canvas.components[comp_id].get_ports()
+        assert canvas.get_component_nodes(comp_id) == node_ids
+        assert [(canvas.nodes[n].x, canvas.nodes[n].y) for n in node_ids] == ports
+        assert canvas.get_component_nodes("missing") == []
+
+    def test_resize_moves_component_nodes(self, canvas):
+        """Test that component nodes are re-placed on the ports after resizing"""
+        comp_id = canvas.add_component("Passive", "Resistor", 100, 100)
+
+        canvas._on_resize(comp_id, 2.0)
+
+        node_ids = canvas._comp_to_nodes[comp_id]
+        ports = canvas.components[comp_id].get_ports()
+        assert [(canvas.nodes[n].x, canvas.nodes[n].y) for n in node_ids] == ports
+        assert canvas.get_node_at(*ports[1]) == node_ids[1]
+
+    def test_deleted_component_is_not_hit(self, canvas):
+        """Test that deleted components and their nodes disappear from lookups"""
+        comp_id = canvas.add_component("Passive", "Capacitor", 100, 100)
+        canvas._on_delete(comp_id)
+
+        assert canvas.get_component_at(100, 100) is None
+        assert canvas.get_node_at(70, 100) is None
+
+    def test_delete_removes_attached_wires(self, canvas):
+        """Test that deleting a component drops its wires but keeps unrelated ones"""
+        a = canvas.add_component("Passive", "Resistor", 100, 100)
+        b = canvas.add_component("Passive", "Resistor", 300, 100)
+        c = canvas.add_component("Passive", "Resistor", 500, 100)
+        doomed = canvas.add_wire(canvas._comp_to_nodes[a][1], canvas._comp_to_nodes[b][0])
+        kept = canvas.add_wire(canvas._comp_to_nodes[b][1], canvas._comp_to_nodes[c][0])
+
+        canvas._on_delete(a)
+
+        assert doomed not in canvas.wires
+        assert kept in canvas.wires
+        assert doomed not in canvas._node_to_wires[canvas._comp_to_nodes[b][0]]
+
+    def test_delete_key_removes_selection_in_one_batch(self, canvas):
+        """Test that deleting a multi-selection notifies once and clears shared wires"""
+        a = canvas.add_component("Passive", "Resistor", 100, 100)
+        b = canvas.add_component("Passive", "Resistor", 300, 100)
+        c = canvas.add_component("Passive", "Resistor", 500, 100)
+        canvas.add_wire(canvas._comp_to_nodes[a][1], canvas._comp_to_nodes[b][0])
+        canvas.select_component(None)
+        canvas.selected_components = [a, b]
+        emitted = []
+        canvas.circuit_changed.connect(lambda: emitted.append(True))
+
+        QTest.keyClick(canvas, Qt.Key_Delete)
+
+        assert list(canvas.components) == [c]
+        assert not canvas.wires
+        assert canvas.selected_components == []
+        assert len(emitted) == 1
+
+    def test_wire_lookup_follows_node_moves(self, canvas):
+        """Test that wire hit testing uses current endpoints and drops deleted wires"""
+        a = canvas.add_component("Passive", "Resistor", 100, 100)
+        b = canvas.add_component("Passive", "Resistor", 300, 100)
+        wire_id = canvas.add_wire(canvas._comp_to_nodes[a][1], canvas._comp_to_nodes[b][0])
+
+        # Wire runs from (130, 100) to (270, 100)
+        assert canvas.get_wire_at(200, 103) == wire_id
+        assert canvas.get_wire_at(200, 120) is None
+
+        canvas.move_component(b, 0, 200)
+        assert canvas.get_wire_at(200, 100) is None
+        assert canvas.get_wire_at(200, 200) == wire_id
+
+        canvas._on_delete(a)
+        assert canvas.get_wire_at(200, 200) is None
+
+    def test_wide_tolerance_node_lookup(self, canvas):
+        """Test the vectorized search used for tolerances wider than a cell"""
+        first = canvas.add_component("Passive", "Resistor", 100, 100)
+        second = canvas.add_component("Passive", "Capacitor", 400, 100)
+        canvas._on_delete(first)
+        node_ids = [nid for nid, cid in canvas.node_to_component.items() if cid == second]
+
+        # Left port of the capacitor sits at x=370
+        assert canvas.get_node_at(330, 100, tolerance=60) == node_ids[0]
+        assert canvas.get_node_at(100, 100, tolerance=60) is None
+
+    def test_marquee_selects_component_centers(self, canvas):
+        """Test that releasing a marquee selects components centered inside it"""
+        outside = canvas.add_component("Passive", "Resistor", 100, 100)
+        inside = [
+            canvas.add_component("Passive", "Resistor", 280, 300),
+            canvas.add_component("Passive", "Resistor", 340, 260),
+        ]
+        canvas.set_mode(CanvasMode.MARQUEE)
+        canvas.marquee_mode = True
+        canvas.marquee_rect = QRect(QPoint(250, 250), QPoint(350, 350))
+
+        QTest.mouseRelease(canvas, Qt.LeftButton, pos=QPoint(350, 350))
+
+        assert sorted(canvas.selected_components) == inside
+        assert canvas.selected_component in inside
+        assert all(canvas.components[c].selected for c in inside)
+        assert not canvas.components[outside].selected
+
+    def test_marquee_keeps_placement_order(self, canvas):
+        """Test that marquee selection follows placement order when slots are reused"""
+        newer = canvas.add_component("Passive", "Resistor", 340, 260)
+        older = canvas.add_component("Passive", "Resistor", 280, 300)
+        # As if older had been placed first and newer later took a freed lower slot
+        arrays = canvas._comp_arrays
+        seq = arrays.view("seq")
+        seq[arrays.slot[older]], seq[arrays.slot[newer]] = 0, 1
+
+        canvas.set_mode(CanvasMode.MARQUEE)
+        canvas.marquee_mode = True
+        canvas.marquee_rect = QRect(QPoint(250, 250), QPoint(350, 350))
+        QTest.mouseRelease(canvas, Qt.LeftButton, pos=QPoint(350, 350))
+
+        assert canvas.selected_components == [older, newer]
+        assert canvas.selected_component == newer
+
+
+class TestCanvasAlignment:
+    """Test aligning multiple components"""
+
+    def test_align_left_and_middle(self, canvas):
+        """Test that alignment moves components and their nodes"""
+        ids = [
+            canvas.add_component("Passive", "Resistor", 100, 100),
+            canvas.add_component("Passive", "Resistor", 300, 200),
+            canvas.add_component("Passive", "Resistor", 200, 360),
+        ]
+        canvas.selected_components = ids
+
+        canvas.align_components("left")
+        canvas.align_components("middle")
+
+        assert [(canvas.components[c].x, canvas.components[c].y) for c in ids] == [(100, 220)] * 3
+        left_node = canvas.nodes[canvas._comp_to_nodes[ids[1]][0]]
+        assert (left_node.x, left_node.y) == (70, 220)
+
+
+
+class TestCanvasGrid:
+    """Test grid snapping"""
+
+    def test_snap_tracks_grid_size(self, canvas):
+        """Test that snapping matches divide-and-round for the current grid"""
+        for grid in (20, 16):
+            canvas.grid_size = grid
+            assert all(canvas._snap(v) == round(v / grid) * grid for v in range(-500, 500))
+
+
+class TestCanvasUndo:
+    """Test snapshot-based undo/redo"""
+
+    def test_undo_restores_deleted_component_nodes_and_wires(self, canvas):
+        """Test that undoing a delete brings back the component, its nodes and wires"""
+        first = canvas.add_component("Passive", "Resistor", 100, 100)
+        second = canvas.add_component("Passive", "Resistor", 300, 100)
+        wire_id = canvas.add_wire(canvas._comp_to_nodes[first][1], canvas._comp_to_nodes[second][0])
+        first_nodes = list(canvas._comp_to_nodes[first])
+
+        canvas.save_state()
+        canvas._on_delete(first)
+        assert first not in canvas.components
+
+        canvas.undo()
+
+        assert canvas.components[first].x == 100
+        assert canvas._comp_to_nodes[first] == first_nodes
+        assert wire_id in canvas.wires
+        assert canvas.get_component_at(100, 100) == first
+
+        canvas.redo()
+
+        assert first not in canvas.components
+        assert canvas.get_node_at(70, 100) is None
+
+    def test_history_stores_only_changes(self, canvas, monkeypatch):
+        """Test that undo levels hold the touched items and saving never walks the circuit"""
+        for i in range(20):
+            canvas.add_component("Passive", "Resistor", 60 + 80 * (i % 8), 60 + 80 * (i // 8))
+        specs = []
+        to_dict = CanvasComponent.to_dict
+        monkeypatch.setattr(CanvasComponent, "to_dict", lambda comp: specs.append(comp) or to_dict(comp))
+
+        canvas.save_state()
+        canvas.rotate_component("comp_0")
+        canvas.save_state()
+        canvas.undo()
+
+        assert len(canvas.undo_stack) == 1 and len(canvas.redo_stack) == 1
+        assert list(canvas.undo_stack[-1]) == [("comp", "comp_0")]
+        assert len(specs) <= 2
+
+    def test_undo_redo_round_trip_edits(self, canvas):
+        """Test that one level covers cut, paste, resize, wiring and rotation"""
+        def circuit_state():
+            keys = ([("comp", c) for c in canvas.components] + [("node", n) for n in canvas.nodes]
+                    + [("wire", w) for w in canvas.wires])
+            return {key: canvas._item_spec(key) for key in keys}
+
+        first = canvas.add_component("Passive", "Resistor", 100, 100)
+        second = canvas.add_component("Passive", "Capacitor", 300, 100)
+        canvas.add_wire(canvas._comp_to_nodes[first][1], canvas._comp_to_nodes[second][0])
+        before = circuit_state()
+        levels = len(canvas.undo_stack)  # add_wire saved one of its own
+
+        canvas.save_state()
+        canvas._on_resize(second, 1.5)
+        canvas.rotate_component(second)
+        canvas.copy(first)
+        canvas.paste(offset_x=0, offset_y=200)
+        pasted = f"comp_{len(canvas.components) - 1}"
+        canvas.cut(first)
+        canvas.add_wire(canvas._comp_to_nodes[pasted][0], canvas._comp_to_nodes[second][1])
+        after = circuit_state()
+
+        while len(canvas.undo_stack) > levels:
+            canvas.undo()
+        assert circuit_state() == before
+        assert canvas._specs == before
+        assert canvas.get_component_at(100, 100) == first
+
+        while canvas.redo_stack:
+            canvas.redo()
+        assert circuit_state() == after
+        assert canvas._specs == after
+        assert first not in canvas.components
+
+    def test_undo_restores_cleared_canvas(self, canvas):
+        """Test that a wholesale clear is recorded item by item and can be undone"""
+        first = canvas.add_component("Passive", "Resistor", 100, 100)
+        second = canvas.add_component("Passive", "Resistor", 300, 100)
+        wire_id = canvas.add_wire(canvas._comp_to_nodes[first][1], canvas._comp_to_nodes[second][0])
+
+        canvas.save_state()
+        canvas.clear_canvas()
+        assert not canvas._specs
+
+        canvas.undo()
+
+        assert set(canvas.components) == {first, second}
+        assert wire_id in canvas.wires
+        assert canvas.get_node_at(130, 100) == canvas._comp_to_nodes[first][1]
+
+    def test_history_drops_oldest_past_limit(self, canvas):
+        """Test that the undo history is capped at max_undo_levels"""
+        canvas.max_undo_levels = 3
+        comp_id = canvas.add_component("Passive", "Resistor", 100, 100)
+
+        for _ in range(6):
+            canvas.save_state()
+            canvas.rotate_component(comp_id)
+
+        assert len(canvas.undo_stack) == 3
+        while canvas.undo_stack:
+            canvas.undo()
+        assert canvas.components[comp_id].rotation == 270
+
+
+class TestCanvasClipboard:
+    """Test clipboard paste"""
+
+    def test_paste_emits_once(self, canvas):
+        """Test that pasting a multi-component clipboard notifies once"""
+        first = canvas.add_component("Passive", "Resistor", 100, 100)
+        second = canvas.add_component("Passive", "Capacitor", 200, 100)
+        canvas.clipboard = {"components": [canvas.components[first].to_dict(), canvas.components[second].to_dict()]}
+        emitted = []
+        canvas.circuit_changed.connect(lambda: emitted.append(True))
+
+        canvas._on_paste()
+
+        assert len(emitted) == 1
+        assert len(canvas.components) == 4
+        assert all(len(canvas._comp_to_nodes[c]) == 2 for c in canvas.components)
+
+    def test_clipboard_is_not_aliased(self, canvas):
+        """Test that editing a copied component doesn't change what gets pasted"""
+        comp_id = canvas.add_component("Passive", "Resistor", 100, 100)
+        canvas.components[comp_id].params["resistance"] = 1000
+        canvas.copy(comp_id)
+
+        canvas.components[comp_id].params["resistance"] = 5
+        canvas.move_component(comp_id, 200, 0)
+        canvas.paste(offset_x=0, offset_y=40)
+
+        pasted = canvas.components["comp_1"]
+        assert (pasted.x, pasted.y) == (100, 140)
+        assert pasted.params == {"resistance": 1000}
+        assert not pasted.selected
+
+
+class TestCanvasRepaint:
+    """Test partial repaint regions"""
+
+    def test_drag_dirty_rect_covers_attached_wires(self, canvas):
+        """Test that a dragged component invalidates the far end of its wires"""
+        left = canvas.add_component("Passive", "Resistor", 100, 100)
+        right = canvas.add_component("Passive", "Resistor", 500, 300)
+        left_node = [n for n, c in canvas.node_to_component.items() if c == left][1]
+        right_node = [n for n, c in canvas.node_to_component.items() if c == right][0]
+        canvas.add_wire(left_node, right_node)
+
+        rect = canvas._component_dirty_rect(left)
+        far = canvas.nodes[right_node]
+
+        assert rect.contains(int(far.x), int(far.y))
+        assert not canvas._component_dirty_rect(right).isEmpty()
+
+    def test_partial_paint_renders(self, canvas):
+        """Test that painting a sub-rect of the canvas succeeds"""
+        canvas.add_component("Passive", "Resistor", 100, 100)
+
+        pixmap = canvas.grab(QRect(50, 50, 120, 120))
+
+        assert not pixmap.isNull()
+
+    def test_visible_components_keep_placement_order(self, canvas):
+        """Test that culled drawing keeps z-order when array slots are reused"""
+        first = canvas.add_component("Passive", "Resistor", 100, 100)
+        second = canvas.add_component("Passive", "Resistor", 120, 100)
+        canvas._on_delete(second)
+        third = canvas.add_component("Passive", "Resistor", 110, 100)
+
+        visible = canvas._components_in_rect(QRect(90, 90, 40, 20))
+
+        assert visible == [first, third]
+        assert canvas._components_in_rect(QRect(600, 600, 10, 10)) == []
+
+    def test_edits_repaint_only_affected_area(self, canvas, monkeypatch):
+        """Test that rotate and delete invalidate the component area, not the canvas"""
+        left = canvas.add_component("Passive", "Resistor", 100, 100)
+        right = canvas.add_component("Passive", "Resistor", 500, 300)
+        left_node = [n for n, c in canvas.node_to_component.items() if c == left][1]
+        right_node = [n for n, c in canvas.node_to_component.items() if c == right][0]
+        canvas.add_wire(left_node, right_node)
+        far = canvas.nodes[right_node]
+        updates = []
+        monkeypatch.setattr(canvas, "_request_repaint", lambda *args: updates.append(args))
+
+        canvas.rotate_component(left, 90)
+        canvas._on_delete(left)
+
+        rotated, deleted = (args[0] for args in updates)
+        assert rotated.contains(100, 100) and not rotated.contains(500, 300)
+        assert deleted.contains(int(far.x), int(far.y))
+
+    def test_undo_repaints_only_changed_area(self, canvas, monkeypatch):
+        """Test that undo/redo invalidate the old and new spots of what changed"""
+        moved = canvas.add_component("Passive", "Resistor", 100, 100)
+        canvas.add_component("Passive", "Resistor", 500, 400)
+        canvas.select_component(None)
+        canvas.save_state()
+        canvas.move_component(moved, 200, 0)
+        updates = []
+        monkeypatch.setattr(canvas, "update", lambda *args: updates.append(args))
+
+        canvas.undo()
+        canvas.redo()
+
+        for (dirty,) in updates:
+            assert dirty.contains(100, 100) and dirty.contains(300, 100)
+            assert not dirty.contains(500, 400)
+        assert len(updates) == 2
+
+    def test_symbols_rendered_once_per_look(self, canvas):
+        """Test that identical components share one cached symbol pixmap"""
+        first = canvas.add_component("Passive", "Resistor", 100, 100)
+        canvas.add_component("Passive", "Resistor", 300, 100)
+        canvas.select_component(None)
+
+        canvas.grab()
+        canvas.grab()
+        assert len(canvas._symbol_cache) == 1
+
+        canvas.components[first].selected = True
+        canvas.grab()
+        assert len(canvas._symbol_cache) == 2
+
+    def test_selection_label_laid_out_once(self, canvas):
+        """Test that the selected-name label is prepared once and reused"""
+        canvas.add_component("Passive", "Precision Resistor (Thin Film)", 150, 150)
+
+        canvas.grab()
+        label = canvas._name_labels["Precision Resistor (Thin Film)"]
+        canvas.grab()
+
+        assert canvas._name_labels == {"Precision Resistor (Thin Film)": label}
+
+    def test_batched_wires_and_nodes_render(self, canvas):
+        """Test that batched wire/node drawing paints wires and the wire start highlight"""
+        left = canvas.add_component("Passive", "Resistor", 100, 100)
+        right = canvas.add_component("Passive", "Resistor", 300, 100)
+        left_node = [n for n, c in canvas.node_to_component.items() if c == left][1]
+        right_node = [n for n, c in canvas.node_to_component.items() if c == right][0]
+        canvas.add_wire(left_node, right_node)
+        canvas.wire_mode_start_node = left_node
+        start = canvas.nodes[left_node]
+
+        image = canvas.grab().toImage()
+
+        assert image.pixelColor(200, 100).name() == "#000000"
+        assert image.pixelColor(int(start.x), int(start.y)).name() == "#ffff00"
+
+    def test_wire_lines_track_topology(self, canvas):
+        """Test that cached wire segments follow moves and go away with the wire"""
+        left = canvas.add_component("Passive", "Resistor", 100, 100)
+        right = canvas.add_component("Passive", "Resistor", 300, 100)
+        wire_id = canvas.add_wire(canvas.get_component_nodes(left)[1], canvas.get_component_nodes(right)[0])
+
+        canvas.move_component(right, 0, 100)
+        end = canvas.nodes[canvas.get_component_nodes(right)[0]]
+        line = canvas._wire_lines[wire_id]
+        assert (line.x2(), line.y2()) == (int(end.x), int(end.y))
+
+        canvas.delete_components([right])
+        assert wire_id not in canvas._wire_lines
+
+    def test_resistor_path_follows_scale(self, canvas):
+        """Test that the shared zigzag path is stroked at the component's size"""
+        comp_id = canvas.add_component("Passive", "Resistor", 200, 200)
+        canvas.select_component(None)
+        canvas._on_resize(comp_id, 2.0)
+
+        image = canvas.grab().toImage()
+
+        # Leads end at +-30 * scale, with scale 2 here
+        assert image.pixelColor(147, 200).name() != "#f5f5f5"
+        assert image.pixelColor(253, 200).name() != "#f5f5f5"
+
+    def test_repaint_requests_are_coalesced(self, canvas):
+        """Test that queued repaint rects merge into one flush"""
+        canvas._request_repaint(QRect(0, 0, 10, 10))
+        canvas._request_repaint(QRect(100, 100, 10, 10))
+
+        assert canvas._repaint_pending
+        assert canvas._pending_rect == QRect(0, 0, 110, 110)
+
+        QApplication.processEvents()
+
+        assert not canvas._repaint_pending
+        assert canvas._pending_rect.isEmpty()
+
+    def test_repaints_are_throttled_to_frame_rate(self, canvas, monkeypatch):
+        """Test that a request right after a flush waits out the rest of the frame"""
+        delays = []
+        monkeypatch.setattr(circuit_canvas.QTimer, "singleShot", lambda ms, slot: delays.append(ms))
+
+        canvas._request_repaint(QRect(0, 0, 10, 10))
+        canvas._flush_repaint()
+        canvas._request_repaint(QRect(0, 0, 10, 10))
+
+        assert delays[0] == 0
+        assert 0 < delays[1] <= canvas._FRAME_INTERVAL_MS
+
+    def test_grid_tiles_align_to_widget_origin(self, canvas):
+        """Test that a partial repaint puts grid lines at multiples of grid_size"""
+        image = canvas.grab(QRect(30, 30, 50, 50)).toImage()
+        line = canvas._GRID_PEN.color().rgb()
+        background = canvas._BACKGROUND_COLOR.rgb()
+
+        # Widget x=40 maps to image x=10; x=50 (image 20) is between lines
+        assert image.pixelColor(10, 5).rgb() == line
+        assert image.pixelColor(20, 5).rgb() == background
+
+        canvas.grid_size = 25
+        assert canvas._grid_pixmap is None
+
+    def test_wire_width_updates_shared_pen(self, canvas):
+        """Test that changing the wire width reuses and resizes the wire pen"""
+        pen = canvas._wire_pen
+
+        canvas.set_wire_width(5)
+
+        assert canvas._wire_pen is pen
+        assert pen.width() == 5
+
+
+class TestCanvasKernels:
+    """Test hit-testing kernels (numba or NumPy fallback)"""
+
+    def test_nearest_node_skips_holes(self):
+        """Test that the closest point wins and +inf holes never match"""
+        xs = np.array([np.inf, 10.0, 12.0, 50.0])
+        ys = np.array([np.inf, 0.0, 1.0, 0.0])
+
+        assert kernels.nearest_node(xs, ys, 13.0, 1.0, 25.0) == 2
+        assert kernels.nearest_node(xs, ys, 30.0, 0.0, 25.0) == -1
+        assert kernels._nearest_node_numpy(xs, ys, 13.0, 1.0, 25.0) == 2
+
+    def test_points_in_rect(self):
+        """Test that points on or inside the rect edges are reported"""
+        xs = np.array([0.0, 5.0, 10.0, 11.0])
+        ys = np.array([0.0, 5.0, 10.0, 5.0])
+        out = np.empty(4, dtype=np.int64)
+
+        count = kernels.points_in_rect(xs, ys, 0.0, 0.0, 10.0, 10.0, out)
+
+        assert list(out[:count]) == [0, 1, 2]
+
+    def test_boxes_in_rect_skips_holes(self):
+        """Test that overlapping boxes are reported and +inf holes never are"""
+        lefts = np.array([0.0, np.inf, 20.0, 8.0])
+        tops = np.array([0.0, np.inf, 20.0, -5.0])
+        rights = np.array([5.0, np.inf, 30.0, 12.0])
+        bottoms = np.array([5.0, np.inf, 30.0, 2.0])
+        out = np.empty(4, dtype=np.int64)
+
+        for boxes_in_rect in (kernels.boxes_in_rect, kernels._boxes_in_rect_numpy, kernels._boxes_in_rect_loop):
+            count = boxes_in_rect(lefts, tops, rights, bottoms, 4.0, 0.0, 10.0, 10.0, out)
+            assert list(out[:count]) == [0, 3]
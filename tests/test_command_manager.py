@@ -0,0 +1,245 @@
+"""Test suite for the undo/redo command manager"""
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pytest
+from frontend.core import command_manager
+from frontend.core.command_manager import Command, CommandManager, CommandType
+
+
+class RecordingCommand(Command):
+    """Command that records execute/undo calls into a shared log"""
+
+    def __init__(self, log, name, cmd_type=CommandType.ADD_COMPONENT):
+        super().__init__(cmd_type, {"name": name})
+        self.log = log
+
+    def execute(self):
+        self.log.append(("do", self.data["name"]))
+
+    def undo(self):
+        self.log.append(("undo", self.data["name"]))
+
+
+class TestCommandManager:
+    """Test undo/redo stack behaviour"""
+
+    def test_execute_and_undo(self):
+        """Test executing and undoing a command"""
+        log = []
+        manager = CommandManager()
+
+        assert manager.execute_command(RecordingCommand(log, "a"))
+        assert manager.can_undo()
+        assert manager.undo()
+        assert log == [("do", "a"), ("undo", "a")]
+        assert manager.can_redo()
+
+    def test_undo_stack_is_bounded(self):
+        """Test that the oldest commands are evicted past the limit"""
+        log = []
+        manager = CommandManager(max_undo_stack=3)
+
+        for name in "abcde":
+            manager.execute_command(RecordingCommand(log, name))
+
+        assert len(manager.undo_stack) == 3
+        assert [c.data["name"] for c in manager.undo_stack] == ["c", "d", "e"]
+
+    def test_new_command_clears_redo(self):
+        """Test that executing a command discards the redo history"""
+        log = []
+        manager = CommandManager()
+        manager.execute_command(RecordingCommand(log, "a"))
+        manager.undo()
+
+        manager.execute_command(RecordingCommand(log, "b"))
+
+        assert not manager.can_redo()
+
+    def test_descriptions_use_command_type_string(self):
+        """Test that undo/redo descriptions show the command type value"""
+        log = []
+        manager = CommandManager()
+        manager.execute_command(RecordingCommand(log, "a", CommandType.MOVE_COMPONENT))
+
+        assert manager.get_undo_description() == "Undo: move_component"
+        manager.undo()
+        assert manager.get_redo_description() == "Redo: move_component"
+        assert CommandType.MOVE_COMPONENT == "move_component"
+
+    def test_failed_undo_keeps_command_on_stack(self):
+        """Test that a failing undo leaves both stacks unchanged"""
+
+        class FailingUndo(RecordingCommand):
+            def undo(self):
+                raise RuntimeError("boom")
+
+        log = []
+        manager = CommandManager()
+        manager.execute_command(RecordingCommand(log, "a"))
+        failing = FailingUndo(log, "b")
+        manager.execute_command(failing)
+
+        assert not manager.undo()
+        assert manager.undo_stack[-1] is failing
+        assert len(manager.undo_stack) == 2
+        assert not manager.can_redo()
+
+    def test_create_specialized_command(self):
+        """Test that Command.create builds a slotted per-type command"""
+        cmd = Command.create(
+            CommandType.MOVE_COMPONENT,
+            component_id="comp_0", old_pos=(0, 0), new_pos=(20, 40),
+        )
+
+        assert type(cmd).__name__ == "MoveComponentCommand"
+        assert isinstance(cmd, Command)
+        assert cmd.cmd_type is CommandType.MOVE_COMPONENT
+        assert cmd.component_id == "comp_0"
+        assert cmd.data == {"component_id": "comp_0", "old_pos": (0, 0), "new_pos": (20, 40)}
+        assert not hasattr(cmd, "__dict__")
+        assert type(cmd).__slots__ == ("component_id", "old_pos", "new_pos")
+        assert cmd == Command.create(
+            CommandType.MOVE_COMPONENT,
+            component_id="comp_0", old_pos=(0, 0), new_pos=(20, 40),
+        )
+        assert getattr(command_manager, type(cmd).__name__) is type(cmd)
+
+    def test_plain_command_keeps_its_fields(self):
+        """Test that the base Command still stores a type and data payload"""
+        cmd = Command(CommandType.ADD_COMPONENT, {"a": 1})
+
+        assert cmd.cmd_type is CommandType.ADD_COMPONENT
+        assert cmd.data == {"a": 1}
+        assert not hasattr(cmd, "__dict__")
+
+    def test_create_macro_and_unknown_types(self):
+        """Test that MACRO is registered and unknown types fail clearly"""
+        inner = [Command.create(CommandType.ROTATE_COMPONENT, component_id="comp_0", degrees=90)]
+        macro = Command.create(CommandType.MACRO, commands=inner)
+
+        assert isinstance(macro, command_manager.MacroCommand)
+        assert macro.data == {"count": 1}
+        with pytest.raises(ValueError, match="not_a_type"):
+            Command.create("not_a_type")
+
+    def test_invalid_field_name_is_rejected(self):
+        """Test that a bad COMMAND_FIELDS entry fails before the class is built"""
+        with pytest.raises(ValueError, match="'class'"):
+            command_manager._make_command_class(CommandType.MACRO, ("component_id", "class"))
+        with pytest.raises(ValueError, match="'old-pos'"):
+            command_manager._make_command_class(CommandType.MACRO, ("old-pos",))
+
+    def test_spilled_history_is_paged_back_in_order(self):
+        """Test that history spilled to disk undoes newest-first and stays bounded"""
+        manager = CommandManager(max_undo_stack=8, spill_to_disk=True)
+
+        for i in range(20):
+            manager.execute_command(Command.create(
+                CommandType.ROTATE_COMPONENT, component_id=f"comp_{i}", degrees=90,
+            ))
+
+        assert len(manager.undo_stack) <= 4
+        assert manager.undo_depth() == 8
+
+        undone = []
+        while manager.undo():
+            undone.append(manager.redo_stack[-1].component_id)
+
+        assert undone == [f"comp_{i}" for i in range(19, 11, -1)]
+        assert not manager.can_undo()
+
+    def test_spilling_is_opt_in(self):
+        """Test that a default manager keeps all history in memory"""
+        manager = CommandManager(max_undo_stack=8)
+
+        for i in range(20):
+            manager.execute_command(Command.create(
+                CommandType.ROTATE_COMPONENT, component_id=f"comp_{i}", degrees=90,
+            ))
+
+        assert len(manager.undo_stack) == 8
+        assert manager._spill_file is None
+
+    def test_description_does_not_page_in_history(self):
+        """Test that describing a spilled undo leaves the stacks and file alone"""
+        manager = CommandManager(max_undo_stack=8, spill_to_disk=True)
+        for i in range(5):
+            manager.execute_command(Command.create(
+                CommandType.ROTATE_COMPONENT, component_id=f"comp_{i}", degrees=90,
+            ))
+        manager.undo_stack.clear()  # As if every in-memory entry had been undone
+        spilled = list(manager._spilled)
+
+        assert manager.get_undo_description() == "Undo: rotate_component"
+        assert manager._spilled == spilled and not manager.undo_stack
+
+        spill_file = manager._spill_file
+        manager.close()
+        assert spill_file.closed and manager._spill_file is None
+        assert not manager.can_undo()
+
+    def test_unpicklable_history_is_tried_once(self):
+        """Test that spilling stops after the first pickling failure"""
+        attempts = []
+
+        class LiveCommand(RecordingCommand):
+            def __reduce__(self):
+                attempts.append(self.data["name"])
+                raise TypeError("holds a live object")
+
+        log = []
+        manager = CommandManager(max_undo_stack=8, spill_to_disk=True)
+
+        for i in range(12):
+            manager.execute_command(LiveCommand(log, f"c{i}"))
+
+        assert attempts == ["c0"]
+        assert not manager.spill_to_disk
+        assert len(manager.undo_stack) == 8
+
+    def test_manager_has_no_instance_dict(self):
+        """Test that CommandManager state lives in slots"""
+        manager = CommandManager()
+
+        assert not hasattr(manager, "__dict__")
+        with pytest.raises(AttributeError):
+            manager.unknown_attribute = 1
+
+    def test_recording_disabled_context(self):
+        """Test that commands are ignored inside recording_disabled"""
+        log = []
+        manager = CommandManager()
+
+        with manager.recording_disabled():
+            assert not manager.is_recording
+            assert not manager.execute_command(RecordingCommand(log, "a"))
+
+        assert manager.is_recording
+        assert manager.execute_command(RecordingCommand(log, "b"))
+        assert log == [("do", "b")]
+        assert len(manager.undo_stack) == 1
+
+    def test_macro_undoes_as_one_step(self):
+        """Test that commands executed inside a macro undo together"""
+        log = []
+        manager = CommandManager()
+
+        manager.begin_macro()
+        manager.execute_command(RecordingCommand(log, "a", CommandType.DELETE_COMPONENT))
+        manager.execute_command(RecordingCommand(log, "b", CommandType.DELETE_WIRE))
+        assert manager.end_macro()
+
+        assert len(manager.undo_stack) == 1
+        assert manager.get_undo_description() == "Undo: macro"
+
+        assert manager.undo()
+        assert log == [("do", "a"), ("do", "b"), ("undo", "b"), ("undo", "a")]
+        assert not manager.can_undo()
+
+        assert manager.redo()
+        assert log[-2:] == [("do", "a"), ("do", "b")]
@@ -0,0 +1,153 @@
+"""Test suite for the component library panel"""
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+from PySide6.QtCore import QEvent, Qt
+from PySide6.QtGui import QHelpEvent
+from frontend.panels.component_library_direct import BackendComponentLibraryPanel
+
+
+@pytest.fixture
+def panel(qapp):
+    """Library panel showing the static fallback components"""
+    widget = BackendComponentLibraryPanel()
+    widget._populate_fallback_components()
+    yield widget
+    widget.deleteLater()
+
+
+def visible_names(panel):
+    """Names of the component rows not hidden by the filter"""
+    names = []
+    for cat_item in panel.category_items.values():
+        for i in range(cat_item.childCount()):
+            child = cat_item.child(i)
+            if not child.isHidden() and not cat_item.isHidden():
+                names.append(child.text(0))
+    return names
+
+
+class TestFallbackLibrary:
+    """Test the static library used without a backend"""
+
+    def test_fallback_grouped_by_category(self, panel):
+        """Test that each category appears once, in order, holding its components"""
+        categories = list(panel.category_items)
+
+        assert categories[0] == "Passive Components" and categories[-1] == "Test Equipment"
+        assert panel.tree.topLevelItemCount() == len(categories) == 7
+        gates = panel.category_items["Logic Gates"]
+        assert [gates.child(i).text(0) for i in range(gates.childCount())] == [
+            "AND Gate", "OR Gate", "NOT Gate", "NAND Gate"]
+        assert panel.component_cache["lcr_meter"]["category"] == "Test Equipment"
+
+    def test_failed_load_reenables_updates(self, panel, monkeypatch):
+        """Test that the tree repaints again even if the bulk insert raises"""
+        def fail():
+            raise RuntimeError("broken index")
+
+        monkeypatch.setattr(panel, "_build_word_index", fail)
+
+        with pytest.raises(RuntimeError):
+            panel._populate_fallback_components()
+        assert panel.tree.updatesEnabled()
+
+    def test_tree_uses_uniform_rows(self, panel):
+        """Test that the tree skips per-row sizing, animation and double-click expand"""
+        assert panel.tree.uniformRowHeights()
+        assert not panel.tree.isAnimated()
+        assert not panel.tree.expandsOnDoubleClick()
+
+
+class TestLibrarySearch:
+    """Test search box filtering"""
+
+    def test_typing_is_filtered_once(self, panel, monkeypatch):
+        """Test that a burst of keystrokes filters the tree once, after the pause"""
+        calls = []
+        original = panel._filter_components
+        monkeypatch.setattr(panel, "_filter_components", lambda text: (calls.append(text), original(text)))
+
+        for text in ("v", "vo", "vol", "volt"):
+            panel.search_box.setText(text)
+        assert calls == []
+
+        panel._filter_timer.timeout.emit()
+
+        assert calls == ["volt"]
+        assert visible_names(panel) == ["Voltmeter"]
+
+    def test_empty_search_shows_everything(self, panel):
+        """Test that clearing the search unhides every row and category"""
+        total = len(visible_names(panel))
+        panel._filter_components("gate")
+        assert len(visible_names(panel)) == 4
+
+        panel._filter_components("")
+
+        assert len(visible_names(panel)) == total
+        assert not any(cat.isHidden() for cat in panel.category_items.values())
+
+    def test_only_small_results_are_expanded(self, panel, monkeypatch):
+        """Test that matching categories are expanded only for small result sets"""
+        categories = panel.category_items
+        monkeypatch.setattr(panel, "_AUTO_EXPAND_LIMIT", 4)
+
+        panel._filter_components("gate")
+        assert categories["Logic Gates"].isExpanded()
+        assert not categories["Passive Components"].isExpanded()
+
+        panel._filter_components("meter")
+        assert len(visible_names(panel)) > panel._AUTO_EXPAND_LIMIT
+        assert not any(cat.isExpanded() for cat in categories.values())
+
+        panel._filter_components("")
+        assert all(cat.isExpanded() for cat in categories.values())
+
+    def test_short_queries_match_word_prefixes(self, panel):
+        """Test that short queries match word starts and longer ones any substring"""
+        panel._filter_components("mu")
+        assert sorted(visible_names(panel)) == ["Digital Multimeter", "Multiplexer"]
+
+        panel._filter_components("am")
+        assert sorted(visible_names(panel)) == ["Ammeter", "Op-Amp"]
+
+        panel._filter_components("plex")
+        assert visible_names(panel) == ["Multiplexer"]
+
+        panel._filter_components("ter")
+        assert "Voltmeter" in visible_names(panel)
+
+    def test_tooltip_resolved_on_hover(self, panel):
+        """Test that component tooltips are looked up when requested, not stored"""
+        gates = panel.category_items["Logic Gates"]
+        item = gates.child(0)
+        panel.component_cache["and_gate"]["description"] = "Logical AND"
+
+        assert item.toolTip(0) == ""
+        assert panel._component_tooltip(item) == "Logical AND"
+        assert panel._component_tooltip(panel.category_items["Measurement"].child(0)) == "Component: Ammeter"
+        assert panel._component_tooltip(gates) is None
+
+    def test_drag_payload_encoded_at_load(self, panel):
+        """Test that each component row carries its encoded drag payload"""
+        item = panel.category_items["Logic Gates"].child(0)
+
+        assert bytes(item.data(0, Qt.UserRole + 3)) == b"and_gate"
+        assert bytes(item.data(0, Qt.UserRole + 4)) == b"AND Gate"
+
+    def test_tooltip_event_is_handled_without_text(self, panel):
+        """Test that a tooltip request over a category row is consumed consistently"""
+        panel.tree.resize(300, 400)
+        gates = panel.category_items["Logic Gates"]
+        pos = panel.tree.visualItemRect(gates).center()
+        event = QHelpEvent(QEvent.ToolTip, pos, panel.tree.viewport().mapToGlobal(pos))
+
+        assert panel.tree.viewportEvent(event)
+        assert event.isAccepted()
@@ -0,0 +1,129 @@
+"""Test suite for the console panel"""
+import os
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import json
+from collections import deque
+
+import pytest
+from frontend.panels import console as console_module
+from frontend.panels.console import ConsolePanel, LogLevel
+
+
+@pytest.fixture
+def console(qapp):
+    """Console panel with a running QApplication"""
+    widget = ConsolePanel()
+    yield widget
+    widget.deleteLater()
+
+
+def shown_lines(console):
+    """Text of the rows currently in the log list"""
+    return [console.log_list.item(i).text() for i in range(console.log_list.count())]
+
+
+class TestConsoleFilter:
+    """Test log level filtering"""
+
+    def test_filter_rebuilds_matching_rows(self, console):
+        """Test that changing the filter lists only that level, in log order"""
+        console.filter_combo.setCurrentText("All")
+        console.log("first", LogLevel.INFO)
+        console.log("broken", LogLevel.ERROR)
+        console.log("second", LogLevel.INFO)
+
+        console.filter_combo.setCurrentText("Info")
+
+        lines = shown_lines(console)
+        assert len(lines) == 2
+        assert lines[0].endswith("[INFO] first") and lines[1].endswith("[INFO] second")
+        assert console.log_list.updatesEnabled()
+        assert console.log_list.item(0).foreground().color().name() == "#000000"
+
+
+class TestConsoleHistory:
+    """Test stored history and export"""
+
+    def test_display_text_formatted_once(self, console, monkeypatch):
+        """Test that filter changes reuse the text formatted at log time"""
+        console.log("hello", LogLevel.WARNING)
+        timestamp, message, level, display_text = console.all_messages[-1]
+        assert display_text == f"[{timestamp}] ⚠ [WARNING] hello"
+
+        monkeypatch.setattr(console, "all_messages", [(timestamp, message, level, "cached")])
+        console.filter_combo.setCurrentText("Warning")
+
+        assert shown_lines(console) == ["cached"]
+
+    def test_history_is_bounded(self, console, monkeypatch):
+        """Test that the oldest messages and rows are dropped past the limit"""
+        monkeypatch.setattr(console_module, "_MAX_MESSAGES", 3)
+        console.all_messages = deque(maxlen=3)
+        console.filter_combo.setCurrentText("All")
+
+        for i in range(5):
+            console.log(f"msg {i}", LogLevel.INFO)
+
+        assert [m[1] for m in console.all_messages] == ["msg 2", "msg 3", "msg 4"]
+        assert [line[-5:] for line in shown_lines(console)] == ["msg 2", "msg 3", "msg 4"]
+
+    def test_export_writes_raw_fields(self, console, tmp_path):
+        """Test that exports carry timestamp, level and message only"""
+        console.log("one", LogLevel.INFO)
+        console.log("two", LogLevel.ERROR)
+
+        console._export_json(str(tmp_path / "log.json"))
+        console._export_csv(str(tmp_path / "log.csv"))
+
+        data = json.loads((tmp_path / "log.json").read_text())
+        assert [(d["level"], d["message"]) for d in data] == [("INFO", "one"), ("ERROR", "two")]
+        assert (tmp_path / "log.json").read_text() == json.dumps(data, indent=2)
+        rows = (tmp_path / "log.csv").read_text().splitlines()
+        assert rows[0] == "Timestamp,Level,Message"
+        assert rows[2].endswith(",ERROR,two")
+
+    def test_empty_json_export(self, console, tmp_path):
+        """Test that an empty history exports as an empty JSON array"""
+        console._export_json(str(tmp_path / "log.json"))
+
+        assert (tmp_path / "log.json").read_text() == "[]"
+
+
+class TestSimulationStatus:
+    """Test simulation status tracking"""
+
+    def test_progress_read_from_message(self, console):
+        """Test that progress messages set the bar from their percentage"""
+        console.log("Simulation started", LogLevel.SIM_START)
+
+        console.log("Transient step 3: 45.5 % done", LogLevel.SIM_PROGRESS)
+        console._flush_view_update()
+        assert console.progress_bar.value() == 45
+
+        console.log("Progress 250%", LogLevel.SIM_PROGRESS)
+        console.log("no percentage here", LogLevel.SIM_PROGRESS)
+        console._flush_view_update()
+        assert console.progress_bar.value() == 100
+
+    def test_burst_updates_view_once(self, console, monkeypatch):
+        """Test that a burst of messages scrolls and sets progress once, with the last value"""
+        scrolls = []
+        monkeypatch.setattr(console.log_list, "scrollToBottom", lambda: scrolls.append(True))
+        console.filter_combo.setCurrentText("All")
+        console.log("Simulation started", LogLevel.SIM_START)
+
+        for pct in range(0, 101, 10):
+            console.log(f"{pct}%", LogLevel.SIM_PROGRESS)
+        assert console._view_timer.isActive()
+        assert console.progress_bar.value() == 0 and not scrolls
+
+        console._view_timer.timeout.emit()
+
+        assert console.progress_bar.value() == 100
+        assert scrolls == [True]